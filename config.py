@@ -28,6 +28,13 @@ MOUSE_SENSITIVITY = 0.12    # Sensibilidade do mouse (deg/pixel)
 PUSH_COOLDOWN = 0.18        # Intervalo entre empurrões (segundos)
 GRID_SIZE = 1.0             # Tamanho da grade do mundo
 
+# Fontes da UI, em ordem de prioridade por glifo (nome do sistema ou
+# caminho de arquivo); a fonte padrão do pygame é o último recurso
+UI_FONTS = (
+    'dejavusans', 'segoeui', 'arial', 'segoeuisymbol',
+    'notosans', 'notosanssymbols2', 'freesans',
+)
+
 # -----------------------------
 # Estados do Jogo
 # -----------------------------
@@ -40,22 +47,38 @@ GAME_STATE_FINAL_VICTORY = 3
 # Configurações de Renderização
 # -----------------------------
 TARGET_FPS = 120            # FPS alvo
-MAX_FRAME_TIME = 0.033      # Tempo máximo de frame (cap)
+IDLE_FPS = 30               # FPS em telas paradas (menu, vitória)
+MAX_FRAME_TIME = 0.25       # Tempo máximo de frame no acumulador (cap)
+
+# Simulação em passo fixo (independente do FPS)
+SIMULATION_HZ = 120         # Passos de física por segundo
+SIM_DT = 1.0 / SIMULATION_HZ
+MAX_SIM_STEPS = 8           # Máximo de passos por frame (evita espiral de lentidão)
+
+# Culling
+CHUNK_SIZE = 8              # Lado dos chunks do nível (células) para frustum culling
 
 # Configurações de grama
 GRASS_DENSITY = 8           # Folhas por unidade quadrada
-GRASS_AREA = 20             # Área de cobertura da grama
 GRASS_MIN_HEIGHT = 0.05     # Altura mínima das folhas
 GRASS_MAX_HEIGHT = 0.15     # Altura máxima das folhas
 GRASS_BLADE_WIDTH = 0.02    # Largura das folhas
+# LOD por chunk: (distância máxima até a câmera, fração das folhas desenhadas);
+# chunks além da última distância não são desenhados
+GRASS_LOD = ((12.0, 1.0), (24.0, 0.5), (40.0, 0.25))
 
 # -----------------------------
 # Cores do Céu
 # -----------------------------
 SKY_COLOR = (0.52, 0.75, 0.92, 1.0)  # Azul céu realista
 
+# Nuvens
+CLOUD_COUNT = 15            # Nuvens no céu (desenhadas em um único lote)
+CLOUD_WIND_SPEED = 0.8      # Velocidade base do vento
+
 # -----------------------------
 # Sistema de Partículas
 # -----------------------------
 PARTICLE_LIFETIME = 2.0     # Tempo de vida das partículas (segundos)
 PARTICLE_COUNT = 8          # Número de partículas por efeito
+PARTICLE_CAPACITY = 4096    # Partículas vivas no pool (as mais antigas são recicladas)
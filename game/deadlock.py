@@ -0,0 +1,197 @@
+"""
+game/deadlock.py
+================
+Detecção de deadlocks (situações sem solução) do Sokoban.
+
+CASAS MORTAS (ESTÁTICO):
+-----------------------
+Células a partir das quais uma caixa nunca chega a nenhum objetivo,
+mesmo sem outras caixas no caminho (ex.: cantos sem objetivo).
+- BFS reversa "puxando" a caixa a partir de cada objetivo sobre o grid
+  de paredes: a caixa em C veio de C-d se C-d e C-2d (jogador) são livres
+- Células livres da região que a BFS não alcança são mortas
+- Resultado em cache por nível (paredes + objetivos): recarregar o nível
+  (reload_current_level) não recalcula nada
+
+FREEZE DEADLOCK (DINÂMICO):
+--------------------------
+Caixa travada nos dois eixos (horizontal e vertical) fora de um objetivo.
+Um eixo está travado se:
+- Há parede em um dos lados
+- Os dois lados são casas mortas
+- Há uma caixa vizinha nesse eixo que também está travada
+  (a caixa atual é tratada como parede durante a verificação)
+
+POSIÇÕES:
+--------
+Usa as mesmas tuplas (x, 0, z) de Level.walls/boxes/objectives.
+"""
+
+from collections import deque
+
+
+# Limite do mundo usado por Level.can_push_box
+WORLD_LIMIT = 100
+
+# Direções cardinais (dir_x, dir_z)
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# Cache de casas mortas: (paredes, objetivos) -> frozenset
+_dead_squares_cache = {}
+
+
+def _is_open(position, walls):
+    """Verifica se posição não é parede e está dentro do mundo"""
+    return (position not in walls and
+            abs(position[0]) < WORLD_LIMIT and abs(position[2]) < WORLD_LIMIT)
+
+
+def compute_dead_squares(walls, objectives):
+    """
+    Calcula as casas mortas de um nível (sem cache).
+    
+    Args:
+        walls: Conjunto de paredes (x, 0, z)
+        objectives: Lista de objetivos (x, 0, z)
+    
+    Returns:
+        frozenset: Posições (x, 0, z) mortas
+    """
+    walls = walls if isinstance(walls, (set, frozenset)) else set(walls)
+    
+    # Região livre conectada aos objetivos
+    region = set()
+    queue = deque()
+    for goal in objectives:
+        if goal not in region and _is_open(goal, walls):
+            region.add(goal)
+            queue.append(goal)
+    
+    while queue:
+        x, y, z = queue.popleft()
+        for dx, dz in DIRECTIONS:
+            nxt = (x + dx, y, z + dz)
+            if nxt not in region and _is_open(nxt, walls):
+                region.add(nxt)
+                queue.append(nxt)
+    
+    # BFS reversa: puxa a caixa a partir de cada objetivo
+    live = {goal for goal in objectives if goal in region}
+    queue = deque(live)
+    
+    while queue:
+        x, y, z = queue.popleft()
+        for dx, dz in DIRECTIONS:
+            prev = (x - dx, y, z - dz)
+            behind = (x - 2 * dx, y, z - 2 * dz)
+            if prev not in live and prev in region and behind in region:
+                live.add(prev)
+                queue.append(prev)
+    
+    return frozenset(region - live)
+
+
+def get_dead_squares(walls, objectives):
+    """
+    Retorna casas mortas usando cache por nível.
+    
+    Args:
+        walls: Lista ou conjunto de paredes (x, 0, z)
+        objectives: Lista de objetivos (x, 0, z)
+    
+    Returns:
+        frozenset: Posições (x, 0, z) mortas
+    """
+    key = (frozenset(walls), frozenset(objectives))
+    dead = _dead_squares_cache.get(key)
+    if dead is None:
+        dead = compute_dead_squares(key[0], objectives)
+        _dead_squares_cache[key] = dead
+    return dead
+
+
+def _is_frozen(position, boxes, walls, dead_squares, visited, frozen):
+    """
+    Verifica recursivamente se uma caixa está travada nos dois eixos.
+    
+    Args:
+        position: Posição da caixa
+        boxes: Conjunto/dict de posições de caixas
+        walls: Conjunto de paredes
+        dead_squares: Conjunto de casas mortas
+        visited: Caixas já em verificação (tratadas como parede)
+        frozen: Lista que acumula as caixas travadas encontradas
+    
+    Returns:
+        bool: True se a caixa está travada
+    """
+    visited.add(position)
+    x, y, z = position
+    
+    for dx, dz in ((1, 0), (0, 1)):
+        before = (x - dx, y, z - dz)
+        after = (x + dx, y, z + dz)
+        
+        if (before in walls or after in walls or
+                before in visited or after in visited):
+            continue
+        if before in dead_squares and after in dead_squares:
+            continue
+        if before in boxes and _is_frozen(before, boxes, walls, dead_squares, visited, frozen):
+            continue
+        if after in boxes and _is_frozen(after, boxes, walls, dead_squares, visited, frozen):
+            continue
+        
+        # Eixo livre: a caixa ainda pode se mover
+        return False
+    
+    frozen.append(position)
+    return True
+
+
+def find_freeze_deadlock(position, boxes, walls, objectives, dead_squares):
+    """
+    Procura um freeze deadlock envolvendo a caixa em `position`.
+    
+    Args:
+        position: Posição (x, 0, z) da caixa recém-empurrada
+        boxes: Conjunto/dict de posições de caixas
+        walls: Conjunto de paredes
+        objectives: Conjunto de objetivos
+        dead_squares: Conjunto de casas mortas
+    
+    Returns:
+        list: Caixas travadas do deadlock (vazia se não há deadlock)
+    """
+    frozen = []
+    if not _is_frozen(position, boxes, walls, dead_squares, set(), frozen):
+        return []
+    
+    # Caixas travadas todas em objetivos não são deadlock
+    if all(box in objectives for box in frozen):
+        return []
+    return frozen
+
+
+def find_deadlocked_boxes(boxes, walls, objectives, dead_squares):
+    """
+    Retorna todas as caixas em deadlock (casa morta ou freeze).
+    
+    Args:
+        boxes: Conjunto/dict de posições de caixas
+        walls: Conjunto de paredes
+        objectives: Conjunto de objetivos
+        dead_squares: Conjunto de casas mortas
+    
+    Returns:
+        set: Posições das caixas em deadlock
+    """
+    deadlocked = set()
+    for box in boxes:
+        if box in deadlocked or box in objectives:
+            continue
+        if box in dead_squares:
+            deadlocked.add(box)
+            continue
+        deadlocked.update(find_freeze_deadlock(box, boxes, walls, objectives, dead_squares))
+    return deadlocked
@@ -0,0 +1,141 @@
+"""
+game/journal.py
+===============
+Journal compacto de empurrões para desfazer/refazer (undo/redo).
+
+FORMATO:
+-------
+Cada empurrão ocupa uma entrada com:
+- 1 byte de direção (índice em DIRECTIONS)
+- Posição do jogador no momento do empurrão, quantizada em 1/64 de
+  unidade e codificada como delta em relação à entrada anterior
+  (dois int16: dx, dz)
+
+Nenhuma cópia de `Level.boxes` é guardada: a caixa empurrada é a que está
+na frente da célula do jogador, na direção registrada.
+
+CURSOR:
+------
+- cursor = número de entradas aplicadas (o resto é a fila de redo)
+- Desfazer e refazer andam uma entrada por vez em O(1), mantendo a
+  posição absoluta do cursor (a soma dos deltas nunca é refeita)
+- Gravar um novo empurrão no meio do histórico descarta a fila de redo
+"""
+
+from array import array
+
+
+# Direções cardinais (dir_x, dir_z), mesma ordem de game/deadlock.py
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+# Subdivisões por unidade do grid na quantização da posição
+POSITION_SCALE = 64
+
+
+def _quantize(value):
+    """
+    Quantiza coordenada sem trocar a célula do grid.
+    
+    Args:
+        value: Coordenada contínua do jogador
+    
+    Returns:
+        int: Coordenada em 1/POSITION_SCALE de unidade
+    """
+    cell = int(round(value)) * POSITION_SCALE
+    half = POSITION_SCALE // 2 - 1
+    return max(cell - half, min(cell + half, int(round(value * POSITION_SCALE))))
+
+
+class MoveJournal:
+    """Histórico de empurrões com cursor de undo/redo"""
+    
+    def __init__(self):
+        """Inicializa journal vazio"""
+        self.directions = bytearray()
+        self.deltas_x = array('h')
+        self.deltas_z = array('h')
+        self.cursor = 0
+        
+        # Posição quantizada da entrada cursor - 1 (origem se cursor == 0)
+        self._qx = 0
+        self._qz = 0
+    
+    def __len__(self):
+        return len(self.directions)
+    
+    def clear(self):
+        """Descarta todo o histórico"""
+        self.__init__()
+    
+    def can_undo(self):
+        """Verifica se há empurrão para desfazer"""
+        return self.cursor > 0
+    
+    def can_redo(self):
+        """Verifica se há empurrão para refazer"""
+        return self.cursor < len(self.directions)
+    
+    def record(self, player_x, player_z, direction_x, direction_z):
+        """
+        Grava um empurrão na posição do cursor.
+        
+        Args:
+            player_x, player_z: Posição do jogador ao empurrar
+            direction_x, direction_z: Direção do empurrão
+        """
+        if self.cursor < len(self.directions):
+            # Novo ramo: descarta a fila de redo
+            del self.directions[self.cursor:]
+            del self.deltas_x[self.cursor:]
+            del self.deltas_z[self.cursor:]
+        
+        qx = _quantize(player_x)
+        qz = _quantize(player_z)
+        
+        self.directions.append(DIRECTION_INDEX[(direction_x, direction_z)])
+        self.deltas_x.append(qx - self._qx)
+        self.deltas_z.append(qz - self._qz)
+        
+        self._qx = qx
+        self._qz = qz
+        self.cursor += 1
+    
+    def _entry(self):
+        """Entrada cursor - 1 como (x, z, dir_x, dir_z)"""
+        dir_x, dir_z = DIRECTIONS[self.directions[self.cursor - 1]]
+        return (self._qx / POSITION_SCALE, self._qz / POSITION_SCALE, dir_x, dir_z)
+    
+    def undo(self):
+        """
+        Recua o cursor uma entrada.
+        
+        Returns:
+            tuple: (player_x, player_z, dir_x, dir_z) do empurrão desfeito,
+                   ou None se não há histórico
+        """
+        if self.cursor == 0:
+            return None
+        
+        entry = self._entry()
+        self.cursor -= 1
+        self._qx -= self.deltas_x[self.cursor]
+        self._qz -= self.deltas_z[self.cursor]
+        return entry
+    
+    def redo(self):
+        """
+        Avança o cursor uma entrada.
+        
+        Returns:
+            tuple: (player_x, player_z, dir_x, dir_z) do empurrão refeito,
+                   ou None se a fila de redo está vazia
+        """
+        if self.cursor >= len(self.directions):
+            return None
+        
+        self._qx += self.deltas_x[self.cursor]
+        self._qz += self.deltas_z[self.cursor]
+        self.cursor += 1
+        return self._entry()
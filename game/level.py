@@ -11,9 +11,15 @@ RESPONSABILIDADES:
 3. Lógica de empurrar caixas (push mechanics)
 4. Detecção de colisões caixa-parede e caixa-caixa
 5. Verificação de condições de vitória
-6. Sistema de partículas para feedback visual
+6. Sistema de partículas para feedback visual (pool em game/particles.py)
 7. Estatísticas (movimentos, caixas no objetivo)
 
+EVENTOS:
+-------
+O módulo não depende de pygame nem de OpenGL. Sons e efeitos são
+notificados através do callback `on_event(nome)` ('push', 'blocked',
+'box_on_target'), conectado pelo front end ao gerenciador de som.
+
 MECÂNICA DE EMPURRAR:
 --------------------
 - Verifica posição do jogador e direção olhada
@@ -27,12 +33,51 @@ SISTEMA DE GRID:
 - Posições discretas (inteiros) para lógica
 - Posições contínuas (floats) para renderização
 - Conversão através de Physics.grid_round()
+
+ÍNDICE DE OCUPAÇÃO:
+------------------
+- walls/boxes/objectives continuam como listas (compatibilidade)
+- wall_set, objective_set e box_index indexam as mesmas tuplas (x, 0, z)
+  por hash, tornando os testes de ocupação O(1)
+- box_index mapeia posição -> índice em boxes e é atualizado a cada empurrão
+- collision_grid (broadphase da física) também é atualizado incrementalmente
+- static_version muda a cada load_level: o renderer só remonta a malha
+  das paredes (graphics/level_mesh.py) quando o valor muda
+
+CONTADORES DE PROGRESSO:
+-----------------------
+- boxes_on_target e box_on_target (flag por caixa) são mantidos a cada
+  empurrão, tornando check_victory e get_progress_stats leituras O(1)
+- progress_version muda apenas quando as estatísticas mudam; ouvintes
+  registrados com add_progress_listener são notificados nesse momento
+
+DEADLOCKS:
+---------
+- dead_squares: casas mortas do nível (cache por nível em game/deadlock.py)
+- deadlocked_boxes: caixas em casa morta ou em freeze deadlock,
+  recalculadas após cada empurrão (usadas para pintar a caixa de vermelho)
+
+HASH DE ESTADO:
+--------------
+- box_hash: hash de Zobrist das caixas, atualizado por XOR em cada
+  movimento de caixa (desfazer o movimento restaura o valor)
+- state_hash(): box_hash combinado com a região normalizada do jogador
+
+DESFAZER/REFAZER:
+----------------
+- journal (game/journal.py) grava cada empurrão como direção + posição
+  delta-codificada do jogador, sem copiar `boxes`
+- undo()/redo() aplicam uma entrada em O(1) via _move_box, que mantém
+  índice, contadores, broadphase e hash sincronizados
+- rewind() desfaz tudo (reinício sem recarregar o nível; refazível)
 """
 
 from .levels_data import LEVELS, get_level, get_level_count
-from .physics import Physics
-from utils.sound import get_sound_manager
-from graphics.clouds import CloudSystem
+from .physics import Physics, CollisionGrid
+from .deadlock import get_dead_squares, find_deadlocked_boxes
+from .zobrist import ZOBRIST, normalized_player_cell
+from .journal import MoveJournal
+from .particles import ParticlePool
 
 
 class Level:
@@ -45,9 +90,32 @@ class Level:
         self.boxes = []
         self.objectives = []
         self.spawn_position = (0.0, 0.0, 0.0)
+        self.static_version = 0  # Muda quando a geometria estática (paredes) muda
+        
+        # Índice de ocupação (mesmas tuplas das listas)
+        self.wall_set = set()
+        self.objective_set = set()
+        self.box_index = {}  # (x, 0, z) -> índice em self.boxes
+        self.collision_grid = CollisionGrid()  # Broadphase de paredes + caixas
+        
+        # Contadores incrementais de progresso
+        self.boxes_on_target = 0
+        self.box_on_target = []  # Flag por caixa (mesma ordem de self.boxes)
+        self.progress_version = 0
+        self.progress_listeners = []
+        self._stats = None
+        
+        # Deadlocks (casas mortas estáticas + caixas travadas)
+        self.dead_squares = frozenset()
+        self.deadlocked_boxes = set()
+        
+        # Hash de Zobrist das caixas (incremental)
+        self.box_hash = 0
+        self._region_cache = (None, None, None)  # (box_hash, célula, normalizada)
         self.move_count = 0
-        self.particles = []  # Lista de (x, y, z, start_time)
-        self.clouds = None  # Sistema de nuvens
+        self.journal = MoveJournal()  # Histórico de empurrões (undo/redo)
+        self.particles = ParticlePool()  # Efeitos de caixa no objetivo
+        self.on_event = None  # Callback de eventos (sons/efeitos)
         
         # Dados do nível atual
         self.level_name = ""
@@ -59,7 +127,7 @@ class Level:
         
         Args:
             level_index (int): Índice do nível (0-based)
-            
+        
         Returns:
             bool: True se carregou com sucesso
         """
@@ -75,6 +143,9 @@ class Level:
         self.boxes = level_data['caixas'][:]
         self.objectives = level_data['objetivos'][:]
         self.spawn_position = level_data['spawn']
+        self.static_version += 1
+        self._build_occupancy_index()
+        self.dead_squares = get_dead_squares(self.walls, self.objectives)
         
         # Validação: Verifica se spawn não está dentro de parede
         spawn_grid = (
@@ -82,7 +153,7 @@ class Level:
             int(round(self.spawn_position[1])),
             int(round(self.spawn_position[2]))
         )
-        if spawn_grid in self.walls:
+        if spawn_grid in self.wall_set:
             # Ajusta spawn automaticamente movendo 2 unidades para frente
             self.spawn_position = (
                 self.spawn_position[0],
@@ -96,15 +167,128 @@ class Level:
         
         # Reseta estado
         self.move_count = 0
-        self.particles = []
-        
-        # Inicializa sistema de nuvens (distribuídas em 360°)
-        if self.clouds:
-            self.clouds.cleanup()  # Limpa nuvens antigas
-        self.clouds = CloudSystem(num_clouds=15, wind_speed=0.8)
+        self.journal.clear()
+        self.particles.clear()
+        self._reset_progress()
+        self._refresh_deadlocks()
         
         return True
     
+    def _build_occupancy_index(self):
+        """Reconstrói os índices de ocupação a partir das listas"""
+        self.wall_set = set(self.walls)
+        self.objective_set = set(self.objectives)
+        self.box_index = {box: i for i, box in enumerate(self.boxes)}
+        self.collision_grid = CollisionGrid(self.walls + self.boxes)
+        self.box_hash = ZOBRIST.hash_boxes(self.boxes)
+    
+    def _move_box(self, box_pos, dest_pos):
+        """
+        Move uma caixa mantendo lista e índice sincronizados.
+        
+        Args:
+            box_pos: Posição atual da caixa
+            dest_pos: Nova posição da caixa
+        
+        Returns:
+            int: Índice da caixa em self.boxes
+        """
+        idx = self.box_index.pop(box_pos)
+        self.boxes[idx] = dest_pos
+        self.box_index[dest_pos] = idx
+        self.collision_grid.move(box_pos, dest_pos)
+        self.box_hash ^= ZOBRIST.box_key(box_pos) ^ ZOBRIST.box_key(dest_pos)
+        
+        # Atualiza contador de caixas nos objetivos
+        on_target = dest_pos in self.objective_set
+        if on_target != self.box_on_target[idx]:
+            self.box_on_target[idx] = on_target
+            self.boxes_on_target += 1 if on_target else -1
+        
+        return idx
+    
+    def _reset_progress(self):
+        """Recalcula flags e contadores de progresso do zero"""
+        self.box_on_target = [box in self.objective_set for box in self.boxes]
+        self.boxes_on_target = sum(self.box_on_target)
+        self._notify_progress()
+    
+    def _notify_progress(self):
+        """Atualiza estatísticas em cache e notifica ouvintes"""
+        total_boxes = len(self.objectives)
+        completion = (self.boxes_on_target / total_boxes * 100) if total_boxes > 0 else 0
+        
+        self._stats = {
+            'boxes_on_target': self.boxes_on_target,
+            'total_boxes': total_boxes,
+            'move_count': self.move_count,
+            'completion_percent': completion
+        }
+        self.progress_version += 1
+        
+        for listener in self.progress_listeners:
+            listener(self._stats)
+    
+    def _refresh_deadlocks(self):
+        """Recalcula o conjunto de caixas em deadlock"""
+        self.deadlocked_boxes = find_deadlocked_boxes(
+            self.box_index, self.wall_set, self.objective_set, self.dead_squares
+        )
+    
+    def is_box_deadlocked(self, box_position):
+        """Verifica se a caixa está em deadlock (nível sem solução)"""
+        return box_position in self.deadlocked_boxes
+    
+    def add_progress_listener(self, callback):
+        """
+        Registra callback chamado quando as estatísticas mudam.
+        
+        Args:
+            callback: Função que recebe o dict de get_progress_stats()
+        """
+        self.progress_listeners.append(callback)
+    
+    def state_hash(self, player_x, player_z):
+        """
+        Hash de Zobrist do estado (caixas + região normalizada do jogador).
+        
+        Args:
+            player_x, player_z: Posição do jogador
+        
+        Returns:
+            int: Hash de 64 bits
+        """
+        cell = (Physics.grid_round(player_x), 0, Physics.grid_round(player_z))
+        cached_hash, cached_cell, normalized = self._region_cache
+        
+        if cached_hash != self.box_hash or cached_cell != cell:
+            normalized = normalized_player_cell(cell, self.wall_set, self.box_index)
+            self._region_cache = (self.box_hash, cell, normalized)
+        
+        return self.box_hash ^ ZOBRIST.player_key(normalized)
+    
+    def is_wall(self, position):
+        """Verifica se há parede na posição (x, 0, z)"""
+        return position in self.wall_set
+    
+    def has_box(self, position):
+        """Verifica se há caixa na posição (x, 0, z)"""
+        return position in self.box_index
+    
+    def is_objective(self, position):
+        """Verifica se há objetivo na posição (x, 0, z)"""
+        return position in self.objective_set
+    
+    def _emit(self, event):
+        """
+        Notifica um evento de jogo ao callback registrado.
+        
+        Args:
+            event (str): Nome do evento ('push', 'blocked', 'box_on_target')
+        """
+        if self.on_event:
+            self.on_event(event)
+    
     def reload_current_level(self):
         """Recarrega o nível atual (reset)"""
         return self.load_level(self.current_level_index)
@@ -130,10 +314,7 @@ class Level:
         if len(self.boxes) != len(self.objectives):
             return False
         
-        # Conta caixas nos objetivos corretos
-        boxes_on_targets = sum(1 for box in self.boxes if box in self.objectives)
-        
-        return boxes_on_targets == len(self.objectives)
+        return self.boxes_on_target == len(self.objectives)
     
     def can_push_box(self, player_x, player_z, direction_x, direction_z):
         """
@@ -142,7 +323,7 @@ class Level:
         Args:
             player_x, player_z: Posição do jogador
             direction_x, direction_z: Direção do empurrão
-            
+        
         Returns:
             tuple: (pode_empurrar, box_position, destination) ou (False, None, None)
         """
@@ -153,14 +334,14 @@ class Level:
         box_pos = (px + direction_x, 0, pz + direction_z)
         
         # Verifica se há uma caixa
-        if box_pos not in self.boxes:
+        if box_pos not in self.box_index:
             return False, None, None
         
         # Posição de destino da caixa
         dest_pos = (box_pos[0] + direction_x, 0, box_pos[2] + direction_z)
         
         # Verifica se destino está livre
-        if dest_pos in self.boxes or dest_pos in self.walls:
+        if dest_pos in self.box_index or dest_pos in self.wall_set:
             return False, box_pos, dest_pos
         
         # Verifica limites do mundo
@@ -177,7 +358,7 @@ class Level:
             player_x, player_z: Posição do jogador
             direction_x, direction_z: Direção do empurrão
             current_time: Tempo atual para partículas
-            
+        
         Returns:
             bool: True se empurrou com sucesso
         """
@@ -187,24 +368,107 @@ class Level:
         
         if not can_push:
             # Som de bloqueio
-            get_sound_manager().play('blocked')
+            self._emit('blocked')
             return False
         
         # Move a caixa
-        idx = self.boxes.index(box_pos)
-        self.boxes[idx] = dest_pos
+        self._move_box(box_pos, dest_pos)
+        self.journal.record(player_x, player_z, direction_x, direction_z)
         self.move_count += 1
+        self._notify_progress()
+        self._refresh_deadlocks()
         
         # Som de empurrar
-        get_sound_manager().play('push')
+        self._emit('push')
         
         # Cria partículas e som se atingiu objetivo
-        if dest_pos in self.objectives:
-            self.particles.append((dest_pos[0], dest_pos[1], dest_pos[2], current_time))
-            get_sound_manager().play('box_on_target')
+        if dest_pos in self.objective_set:
+            self.particles.spawn(dest_pos[0], dest_pos[1], dest_pos[2], current_time)
+            self._emit('box_on_target')
         
         return True
     
+    def _journal_box(self, entry):
+        """
+        Posições da caixa de uma entrada do journal.
+        
+        Args:
+            entry: Tupla (player_x, player_z, dir_x, dir_z)
+        
+        Returns:
+            tuple: (posição antes do empurrão, posição depois)
+        """
+        player_x, player_z, dir_x, dir_z = entry
+        box_pos = (Physics.grid_round(player_x) + dir_x, 0,
+                   Physics.grid_round(player_z) + dir_z)
+        return box_pos, (box_pos[0] + dir_x, 0, box_pos[2] + dir_z)
+    
+    def _undo_step(self):
+        """Desfaz um empurrão sem notificar (retorna a entrada ou None)"""
+        entry = self.journal.undo()
+        if entry is not None:
+            box_pos, dest_pos = self._journal_box(entry)
+            self._move_box(dest_pos, box_pos)
+            self.move_count -= 1
+        return entry
+    
+    def _after_history_change(self, event):
+        """Atualiza progresso/deadlocks após undo, redo ou rewind"""
+        self._notify_progress()
+        self._refresh_deadlocks()
+        self._emit(event)
+    
+    def undo(self):
+        """
+        Desfaz o último empurrão.
+        
+        Returns:
+            tuple: (player_x, player_z) onde o jogador estava ao empurrar,
+                   ou None se não há o que desfazer
+        """
+        entry = self._undo_step()
+        if entry is None:
+            return None
+        
+        self._after_history_change('undo')
+        return entry[0], entry[1]
+    
+    def redo(self):
+        """
+        Refaz o próximo empurrão desfeito.
+        
+        Returns:
+            tuple: (player_x, player_z) do empurrão refeito,
+                   ou None se não há o que refazer
+        """
+        entry = self.journal.redo()
+        if entry is None:
+            return None
+        
+        box_pos, dest_pos = self._journal_box(entry)
+        self._move_box(box_pos, dest_pos)
+        self.move_count += 1
+        
+        self._after_history_change('redo')
+        return entry[0], entry[1]
+    
+    def rewind(self):
+        """
+        Desfaz todos os empurrões (reinício refazível com redo).
+        
+        Returns:
+            bool: True se havia algo para desfazer
+        """
+        if not self.journal.can_undo():
+            return False
+        
+        while self._undo_step() is not None:
+            pass
+        self.particles.clear()
+        
+        self._after_history_change('undo')
+        return True
+    
     def get_box_status(self, box_position, player_x, player_z):
         """
         Retorna status de uma caixa para renderização.
@@ -212,12 +476,12 @@ class Level:
         Args:
             box_position: Posição da caixa
             player_x, player_z: Posição do jogador
-            
+        
         Returns:
             str: 'on_target', 'pushable', 'blocked', ou 'normal'
         """
         # Caixa no objetivo
-        if box_position in self.objectives:
+        if box_position in self.objective_set:
             return 'on_target'
         
         # Verifica se está na frente do jogador
@@ -230,31 +494,23 @@ class Level:
     
     def update_particles(self, current_time, max_lifetime=2.0):
         """
-        Atualiza lista de partículas, removendo as antigas.
+        Atualiza o pool de partículas, matando as antigas.
         
         Args:
             current_time: Tempo atual
             max_lifetime: Tempo máximo de vida das partículas
         """
-        self.particles = [
-            p for p in self.particles 
-            if (current_time - p[3]) < max_lifetime
-        ]
+        self.particles.update(current_time, max_lifetime)
     
     def get_progress_stats(self):
         """
         Retorna estatísticas de progresso do nível.
         
+        O dict é mantido em cache e só é recriado quando os contadores mudam.
+        
         Returns:
             dict: {'boxes_on_target', 'total_boxes', 'move_count', 'completion_percent'}
         """
-        boxes_on_target = sum(1 for box in self.boxes if box in self.objectives)
-        total_boxes = len(self.objectives)
-        completion = (boxes_on_target / total_boxes * 100) if total_boxes > 0 else 0
-        
-        return {
-            'boxes_on_target': boxes_on_target,
-            'total_boxes': total_boxes,
-            'move_count': self.move_count,
-            'completion_percent': completion
-        }
+        if self._stats is None:
+            self._notify_progress()
+        return self._stats
@@ -0,0 +1,131 @@
+"""
+game/particles.py
+=================
+Pool de partículas com armazenamento em arrays numpy.
+
+POR QUE:
+-------
+Antes, Level.particles era uma lista de efeitos (x, y, z, start_time)
+refeita a cada frame, e cada partícula era calculada em Python na hora
+de desenhar. Agora cada partícula ocupa uma posição fixa em arrays de
+capacidade fixa: criar, envelhecer e matar são operações vetorizadas,
+sem alocação por frame.
+
+ARMAZENAMENTO:
+-------------
+- origins: Array (capacidade, 3) com o ponto de origem do efeito
+- angles: Ângulo inicial da partícula na espiral
+- start_times: Instante de criação
+- alive: Máscara de partículas vivas
+
+Com o pool cheio, spawn recicla as partículas mais antigas.
+
+MOVIMENTO:
+---------
+A posição é função analítica do tempo de vida (espiral que se abre e
+sobe/desce), calculada para todas as partículas vivas em positions().
+O módulo não depende de pygame nem de OpenGL.
+"""
+
+import math
+import numpy as np
+from config import PARTICLE_COUNT, PARTICLE_CAPACITY, PARTICLE_LIFETIME
+
+
+class ParticlePool:
+    """Partículas de capacidade fixa em arrays numpy"""
+    
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        """
+        Aloca o pool vazio.
+        
+        Args:
+            capacity: Número máximo de partículas vivas
+        """
+        self.capacity = capacity
+        self.origins = np.zeros((capacity, 3))
+        self.angles = np.zeros(capacity)
+        self.start_times = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0  # Partículas vivas
+    
+    def __len__(self):
+        """Número de partículas vivas"""
+        return self.count
+    
+    def __bool__(self):
+        """True se há alguma partícula viva"""
+        return self.count > 0
+    
+    def spawn(self, x, y, z, current_time, count=PARTICLE_COUNT):
+        """
+        Cria um efeito de `count` partículas em espiral a partir de (x, y, z).
+        
+        Args:
+            x, y, z: Origem do efeito
+            current_time: Instante de criação
+            count: Número de partículas do efeito
+        """
+        count = min(count, self.capacity)
+        slots = np.flatnonzero(~self.alive)[:count]
+        
+        # Pool cheio: recicla as partículas mais antigas
+        if len(slots) < count:
+            alive = np.flatnonzero(self.alive)
+            oldest = alive[np.argsort(self.start_times[alive], kind='stable')]
+            slots = np.concatenate([slots, oldest[:count - len(slots)]])
+        
+        self.origins[slots] = (x, y, z)
+        self.angles[slots] = np.arange(count) / count * 2 * math.pi
+        self.start_times[slots] = current_time
+        self.alive[slots] = True
+        self.count = int(self.alive.sum())
+    
+    def update(self, current_time, max_lifetime=PARTICLE_LIFETIME):
+        """
+        Mata as partículas que passaram do tempo de vida.
+        
+        Args:
+            current_time: Tempo atual
+            max_lifetime: Tempo máximo de vida
+        """
+        if not self.count:
+            return
+        self.alive &= (current_time - self.start_times) < max_lifetime
+        self.count = int(self.alive.sum())
+    
+    def clear(self):
+        """Mata todas as partículas"""
+        self.alive[:] = False
+        self.count = 0
+    
+    def positions(self, current_time, max_lifetime=PARTICLE_LIFETIME):
+        """
+        Posições das partículas vivas no instante dado.
+        
+        Args:
+            current_time: Tempo atual
+            max_lifetime: Partículas com essa idade ou mais são ignoradas
+        
+        Returns:
+            np.ndarray: Array (N, 3)
+        """
+        if not self.count:
+            return np.zeros((0, 3))
+        
+        index = np.flatnonzero(self.alive)
+        elapsed = current_time - self.start_times[index]
+        visible = elapsed < max_lifetime
+        index = index[visible]
+        elapsed = elapsed[visible]
+        
+        # Espiral que se abre com o tempo
+        angle = self.angles[index] + elapsed * 3
+        offset = elapsed * 2.0
+        origins = self.origins[index]
+        
+        result = np.empty((len(index), 3))
+        result[:, 0] = origins[:, 0] + np.cos(angle) * offset
+        result[:, 1] = origins[:, 1] - 0.2 + np.sin(elapsed * 5) * 0.3 + 0.3
+        result[:, 2] = origins[:, 2] + np.sin(angle) * offset
+        return result
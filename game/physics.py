@@ -15,6 +15,8 @@ DETECÇÃO DE COLISÕES:
 2. Colisão circular jogador-obstáculos
 3. Sliding collision (deslizar ao tocar paredes)
 4. Verificação de múltiplos obstáculos
+5. Broadphase em grid uniforme (CollisionGrid): só testa as células
+   cobertas pelo círculo do jogador (4 a 9), independente do tamanho do nível
 
 DIREÇÕES CARDINAIS:
 ------------------
@@ -30,7 +32,87 @@ FÍSICA DE MOVIMENTO:
 """
 
 import math
-from config import PLAYER_RADIUS
+from config import PLAYER_RADIUS, GRID_SIZE
+
+
+class CollisionGrid:
+    """
+    Broadphase de grid uniforme para obstáculos AABB (paredes e caixas).
+    Cada obstáculo é guardado no balde da célula do seu centro; consultas
+    visitam apenas as células que o círculo do jogador pode tocar.
+    """
+    
+    def __init__(self, positions=(), cell_size=GRID_SIZE, half=0.5):
+        """
+        Cria o grid de colisão.
+        
+        Args:
+            positions: Posições iniciais (x, y, z) dos obstáculos
+            cell_size: Tamanho da célula do grid
+            half: Metade do tamanho das AABBs dos obstáculos
+        """
+        self.cell_size = cell_size
+        self.half = half
+        self.cells = {}  # (ix, iz) -> lista de (x, z)
+        
+        for (x, y, z) in positions:
+            self.add(x, z)
+    
+    def _cell(self, x, z):
+        """Retorna célula (ix, iz) que contém o ponto"""
+        return (
+            Physics.grid_round(x / self.cell_size),
+            Physics.grid_round(z / self.cell_size)
+        )
+    
+    def add(self, x, z):
+        """Adiciona obstáculo centrado em (x, z)"""
+        self.cells.setdefault(self._cell(x, z), []).append((x, z))
+    
+    def remove(self, x, z):
+        """Remove obstáculo centrado em (x, z)"""
+        key = self._cell(x, z)
+        bucket = self.cells[key]
+        bucket.remove((x, z))
+        if not bucket:
+            del self.cells[key]
+    
+    def move(self, old_position, new_position):
+        """
+        Atualiza incrementalmente um obstáculo que se moveu (ex.: caixa).
+        
+        Args:
+            old_position: Posição antiga (x, y, z)
+            new_position: Posição nova (x, y, z)
+        """
+        self.remove(old_position[0], old_position[2])
+        self.add(new_position[0], new_position[2])
+    
+    def collides(self, px, pz, radius=PLAYER_RADIUS):
+        """
+        Verifica colisão do jogador com os obstáculos próximos.
+        
+        Args:
+            px, pz: Posição do jogador
+            radius: Raio de colisão do jogador
+            
+        Returns:
+            bool: True se houver colisão
+        """
+        reach = radius + self.half
+        min_x, min_z = self._cell(px - reach, pz - reach)
+        max_x, max_z = self._cell(px + reach, pz + reach)
+        cells = self.cells
+        
+        for ix in range(min_x, max_x + 1):
+            for iz in range(min_z, max_z + 1):
+                bucket = cells.get((ix, iz))
+                if not bucket:
+                    continue
+                for (cx, cz) in bucket:
+                    if Physics.aabb_collides_point(px, pz, cx, cz, self.half, radius):
+                        return True
+        return False
 
 
 class Physics:
@@ -121,6 +203,20 @@ class Physics:
         
         return True
     
+    @staticmethod
+    def can_move_to_grid(px, pz, grid):
+        """
+        Verifica se jogador pode mover para a posição usando o broadphase.
+        
+        Args:
+            px, pz: Posição desejada
+            grid: CollisionGrid com paredes e caixas
+            
+        Returns:
+            bool: True se pode mover
+        """
+        return not grid.collides(px, pz)
+    
     @staticmethod
     def get_cardinal_direction(yaw_degrees):
         """
@@ -148,7 +244,7 @@ class Physics:
     
     @staticmethod
     def smooth_move(current_x, current_z, target_x, target_z, 
-                    walls, boxes, dt, speed):
+                    walls, boxes, dt, speed, grid=None):
         """
         Move jogador suavemente com sliding em paredes.
         MELHORADO: Previne travamento em cantos.
@@ -159,10 +255,16 @@ class Physics:
             walls, boxes: Listas de obstáculos
             dt: Delta time
             speed: Velocidade de movimento
+            grid: CollisionGrid opcional (substitui walls/boxes)
             
         Returns:
             tuple: (new_x, new_z, moved)
         """
+        if grid is not None:
+            can_move = lambda x, z: Physics.can_move_to_grid(x, z, grid)
+        else:
+            can_move = lambda x, z: Physics.can_move_to(x, z, walls, boxes)
+        
         # Calcula nova posição
         dx = target_x - current_x
         dz = target_z - current_z
@@ -182,7 +284,7 @@ class Physics:
         moved = False
         
         # Tenta mover para posição desejada (movimento completo)
-        if Physics.can_move_to(new_x, new_z, walls, boxes):
+        if can_move(new_x, new_z):
             current_x = new_x
             current_z = new_z
             moved = True
@@ -192,13 +294,13 @@ class Physics:
             
             # Tenta mover só em X com velocidade reduzida
             test_x = current_x + (dx * dt * 0.7)  # 70% da velocidade
-            if Physics.can_move_to(test_x, current_z, walls, boxes):
+            if can_move(test_x, current_z):
                 current_x = test_x
                 moved = True
             
             # Tenta mover só em Z com velocidade reduzida
             test_z = current_z + (dz * dt * 0.7)
-            if Physics.can_move_to(current_x, test_z, walls, boxes):
+            if can_move(current_x, test_z):
                 current_z = test_z
                 moved = True
         
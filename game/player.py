@@ -25,12 +25,18 @@ CARACTERÍSTICAS:
 - Detecção de colisões com paredes e caixas
 - Sons de passos adaptativos (mais rápidos ao correr)
 - Teleporte de emergência para spawn
+
+INTERPOLAÇÃO:
+------------
+A simulação roda em passo fixo (SIMULATION_HZ). store_previous() guarda
+o estado do passo anterior e get_view(alpha) interpola posição e câmera
+entre os dois passos para o renderer; teleportes (set_position,
+reset_camera) não interpolam.
 """
 
 import math
 from config import *
 from .physics import Physics
-from utils.sound import get_sound_manager
 
 
 class Player:
@@ -46,12 +52,20 @@ class Player:
         self.camera_pitch = 0.0  # Rotação vertical (X)
         self.camera_yaw = 0.0    # Rotação horizontal (Y)
         
+        # Estado do passo anterior (interpolação de renderização)
+        self.prev_x = 0.0
+        self.prev_y = 0.0
+        self.prev_z = 0.0
+        self.prev_pitch = 0.0
+        self.prev_yaw = 0.0
+        
         # Estado
         self.is_running = False
         
         # Controle de som de passos
         self.last_step_time = 0.0
         self.step_interval = 0.35  # Intervalo entre sons de passo (segundos)
+        self.on_event = None  # Callback de eventos (som de passos)
     
     def set_position(self, x, y, z):
         """
@@ -63,6 +77,40 @@ class Player:
         self.x = x
         self.y = y
         self.z = z
+        
+        # Teleporte: sem interpolação a partir da posição antiga
+        self.prev_x = x
+        self.prev_y = y
+        self.prev_z = z
+    
+    def store_previous(self):
+        """Guarda posição e câmera atuais como estado do passo anterior"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_z = self.z
+        self.prev_pitch = self.camera_pitch
+        self.prev_yaw = self.camera_yaw
+    
+    def get_view(self, alpha=1.0):
+        """
+        Posição e câmera interpoladas entre o passo anterior e o atual.
+        
+        Args:
+            alpha: Fração do passo (0 = anterior, 1 = atual)
+            
+        Returns:
+            tuple: (x, y, z, pitch, yaw)
+        """
+        if alpha >= 1.0:
+            return (self.x, self.y, self.z, self.camera_pitch, self.camera_yaw)
+        
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha,
+            self.prev_z + (self.z - self.prev_z) * alpha,
+            self.prev_pitch + (self.camera_pitch - self.prev_pitch) * alpha,
+            self.prev_yaw + (self.camera_yaw - self.prev_yaw) * alpha
+        )
     
     def get_position(self):
         """Retorna posição atual"""
@@ -115,7 +163,8 @@ class Player:
         """
         return Physics.get_cardinal_direction(self.camera_yaw)
     
-    def move(self, input_forward, input_strafe, dt, walls, boxes, run=False, current_time=0.0):
+    def move(self, input_forward, input_strafe, dt, walls, boxes, run=False, current_time=0.0,
+             grid=None):
         """
         Move o jogador baseado em input.
         
@@ -127,6 +176,7 @@ class Player:
             boxes: Lista de caixas
             run: Se está correndo
             current_time: Tempo atual para som de passos
+            grid: CollisionGrid opcional (broadphase de paredes e caixas)
             
         Returns:
             bool: True se moveu
@@ -161,7 +211,7 @@ class Player:
         new_x, new_z, moved = Physics.smooth_move(
             self.x, self.z,
             self.x + move_x * dt, self.z + move_z * dt,
-            walls, boxes, dt, speed
+            walls, boxes, dt, speed, grid
         )
         
         self.x = new_x
@@ -169,7 +219,8 @@ class Player:
         
         # Som de passos se moveu
         if moved and current_time - self.last_step_time >= self.step_interval * step_multiplier:
-            get_sound_manager().play('step')
+            if self.on_event:
+                self.on_event('step')
             self.last_step_time = current_time
         
         return moved
@@ -178,3 +229,5 @@ class Player:
         """Reseta rotação da câmera"""
         self.camera_pitch = 0.0
         self.camera_yaw = 0.0
+        self.prev_pitch = 0.0
+        self.prev_yaw = 0.0
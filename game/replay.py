@@ -0,0 +1,267 @@
+"""
+game/replay.py
+==============
+Gravação e reprodução determinística do input por frame.
+
+FORMATO DO ARQUIVO (little-endian):
+----------------------------------
+Cabeçalho (24 bytes):
+- magic 'BXRP' (4 bytes), versão (uint16), índice do nível (uint16)
+- número de frames (uint32)
+- checksum do estado final (uint64), 0 se ainda não finalizado
+- reservado (uint32)
+
+Frame (14 bytes):
+- dx, dy do mouse (int16)
+- teclas (uint16, bitmask na ordem de BUTTONS)
+- dt (float64, bits exatos do dt usado na gravação)
+
+DETERMINISMO:
+------------
+A simulação (game/sim.py) só depende dos comandos e dos dt, então
+reproduzir os mesmos frames gera um estado bit a bit idêntico. O
+checksum do estado final (posição/câmera do jogador + hash de Zobrist
+das caixas) é gravado ao fechar o arquivo e conferido na reprodução.
+
+USO:
+---
+    python main.py --record rota.bxr --level 5   # grava jogando
+    python main.py --replay rota.bxr             # reproduz com janela (FPS)
+    python -m game.replay rota.bxr               # reproduz headless
+"""
+
+import struct
+import time
+from .sim import Simulation, InputCommand
+
+
+MAGIC = b'BXRP'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHIQI')
+FRAME = struct.Struct('<hhHd')
+
+# Campos booleanos de InputCommand, na ordem dos bits
+BUTTONS = ('forward', 'back', 'left', 'right', 'run', 'push',
+           'undo', 'redo', 'restart', 'teleport')
+
+MASK_64 = (1 << 64) - 1
+
+
+def _clamp16(value):
+    """Limita deltas do mouse ao intervalo de int16"""
+    return max(-32768, min(32767, int(value)))
+
+
+def pack_buttons(command):
+    """
+    Converte os campos booleanos de um comando em bitmask.
+    
+    Args:
+        command: InputCommand
+    
+    Returns:
+        int: Bitmask (bit i = BUTTONS[i])
+    """
+    bits = 0
+    for i, name in enumerate(BUTTONS):
+        if getattr(command, name):
+            bits |= 1 << i
+    return bits
+
+
+def unpack_command(dx, dy, bits):
+    """
+    Reconstrói um InputCommand a partir de um frame.
+    
+    Args:
+        dx, dy: Movimento do mouse
+        bits: Bitmask de teclas
+    
+    Returns:
+        InputCommand: Comando equivalente ao gravado
+    """
+    flags = {name: bool(bits & (1 << i)) for i, name in enumerate(BUTTONS)}
+    return InputCommand(dx=dx, dy=dy, **flags)
+
+
+def state_checksum(sim):
+    """
+    Checksum de 64 bits do estado da simulação.
+    
+    Args:
+        sim: Objeto Simulation
+    
+    Returns:
+        int: Combinação dos bits exatos de posição/câmera e do box_hash
+    """
+    player = sim.player
+    packed = struct.pack('<4d', player.x, player.z,
+                         player.camera_yaw, player.camera_pitch)
+    
+    # FNV-1a sobre palavras de 64 bits, partindo do hash das caixas
+    value = sim.level.box_hash ^ sim.level.move_count
+    for (word,) in struct.iter_unpack('<Q', packed):
+        value = ((value ^ word) * 0x100000001B3) & MASK_64
+    return value
+
+
+class InputRecorder:
+    """Grava o stream de input de uma partida em arquivo binário"""
+    
+    def __init__(self, path, level_index):
+        """
+        Abre arquivo de gravação.
+        
+        Args:
+            path: Caminho do arquivo
+            level_index (int): Nível em que a gravação começa
+        """
+        self.path = path
+        self.level_index = level_index
+        self.frame_count = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, level_index, 0, 0, 0))
+    
+    def record(self, command, dt):
+        """
+        Grava um frame.
+        
+        Args:
+            command: InputCommand passado para Simulation.step
+            dt: Delta time usado no passo
+        """
+        self.file.write(FRAME.pack(
+            _clamp16(command.dx), _clamp16(command.dy),
+            pack_buttons(command), dt
+        ))
+        self.frame_count += 1
+    
+    def close(self, sim=None):
+        """
+        Finaliza cabeçalho (número de frames e checksum) e fecha o arquivo.
+        
+        Args:
+            sim: Simulation ao fim da gravação (para o checksum)
+        """
+        if self.file is None:
+            return
+        
+        checksum = state_checksum(sim) if sim is not None else 0
+        self.file.seek(0)
+        self.file.write(HEADER.pack(
+            MAGIC, VERSION, self.level_index, self.frame_count, checksum, 0
+        ))
+        self.file.close()
+        self.file = None
+
+
+class InputReplay:
+    """Stream de input carregado de um arquivo de gravação"""
+    
+    def __init__(self, path):
+        """
+        Carrega gravação.
+        
+        Args:
+            path: Caminho do arquivo
+        
+        Raises:
+            ValueError: Se o arquivo não é uma gravação válida
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        if len(data) < HEADER.size:
+            raise ValueError(f"Gravação inválida: {path}")
+        
+        magic, version, level_index, frame_count, checksum, _ = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Formato de gravação não suportado: {path}")
+        
+        self.level_index = level_index
+        self.checksum = checksum
+        
+        # Gravações interrompidas (sem cabeçalho final) usam os frames do arquivo
+        available = (len(data) - HEADER.size) // FRAME.size
+        count = frame_count if 0 < frame_count <= available else available
+        
+        self.frames = [
+            (unpack_command(dx, dy, bits), dt)
+            for dx, dy, bits, dt in FRAME.iter_unpack(
+                data[HEADER.size:HEADER.size + count * FRAME.size]
+            )
+        ]
+        self.position = 0
+    
+    def __len__(self):
+        return len(self.frames)
+    
+    def done(self):
+        """Verifica se todos os frames foram consumidos"""
+        return self.position >= len(self.frames)
+    
+    def next_frame(self):
+        """
+        Retorna o próximo frame.
+        
+        Returns:
+            tuple: (InputCommand, dt) ou None ao fim da gravação
+        """
+        if self.position >= len(self.frames):
+            return None
+        frame = self.frames[self.position]
+        self.position += 1
+        return frame
+    
+    def verify(self, sim):
+        """
+        Confere o estado final com o checksum gravado.
+        
+        Args:
+            sim: Simulation após reproduzir todos os frames
+        
+        Returns:
+            bool: True se idêntico (ou se a gravação não tem checksum)
+        """
+        return self.checksum == 0 or state_checksum(sim) == self.checksum
+
+
+def run_headless(path):
+    """
+    Reproduz uma gravação sem janela e mede a simulação.
+    
+    Args:
+        path: Caminho do arquivo
+    
+    Returns:
+        bool: True se o estado final confere com a gravação
+    """
+    replay = InputReplay(path)
+    sim = Simulation()
+    if not sim.load_level(replay.level_index):
+        print(f"[ERRO] Nível {replay.level_index + 1} não existe")
+        return False
+    
+    start = time.perf_counter()
+    frame = replay.next_frame()
+    while frame is not None:
+        sim.step(*frame)
+        frame = replay.next_frame()
+    elapsed = time.perf_counter() - start
+    
+    ok = replay.verify(sim)
+    rate = len(replay) / elapsed if elapsed > 0 else 0.0
+    print(f"Nível {replay.level_index + 1}: {len(replay)} frames, "
+          f"{sim.time:.2f} s simulados, {elapsed * 1000:.1f} ms ({rate:.0f} passos/s)")
+    print(f"Checksum: {state_checksum(sim):016x} "
+          f"[{'OK' if ok else 'DIVERGIU'}]")
+    return ok
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 2:
+        print("Uso: python -m game.replay <arquivo>")
+        sys.exit(2)
+    sys.exit(0 if run_headless(sys.argv[1]) else 1)
@@ -0,0 +1,251 @@
+"""
+game/sim.py
+===========
+Núcleo de simulação headless do jogo.
+Avança o estado de Player, Level e Physics a partir de comandos de input,
+sem depender de pygame, GLUT ou mixer.
+
+ARQUITETURA:
+-----------
+- InputCommand: Snapshot imutável do input de um passo de simulação
+- Simulation: Dono do estado do jogo (jogador, nível, relógio, vitória)
+- Front ends (main.Game, bots, benchmarks) traduzem seus inputs para
+  InputCommand e consomem os eventos gerados a cada passo
+
+EVENTOS:
+-------
+Cada passo retorna a lista de eventos ocorridos, com os mesmos nomes dos
+sons do jogo ('step', 'push', 'blocked', 'box_on_target', 'victory',
+'undo', 'redo').
+O front end decide o que fazer com eles (tocar sons, trocar de estado).
+
+DETERMINISMO:
+------------
+- O relógio da simulação é a soma dos dt recebidos (não usa relógio real)
+- O front end chama step() com dt fixo (SIM_DT); a renderização
+  interpola o jogador entre passos (Player.get_view)
+- Mesmos comandos + mesmos dt = mesmo estado final
+- Ações de tecla única (reiniciar, teleporte, undo/redo) também viajam
+  no InputCommand, então gravações (game/replay.py) reproduzem tudo
+
+HISTÓRICO:
+---------
+undo()/redo() usam o journal do Level e devolvem o jogador à posição
+em que estava ao empurrar; restart() volta ao início sem recarregar o
+nível (os empurrões desfeitos continuam disponíveis para redo).
+"""
+
+from collections import namedtuple
+from config import PUSH_COOLDOWN, PARTICLE_LIFETIME
+from .level import Level
+from .player import Player
+
+
+InputCommand = namedtuple(
+    'InputCommand',
+    ['dx', 'dy', 'forward', 'back', 'left', 'right', 'run', 'push',
+     'undo', 'redo', 'restart', 'teleport']
+)
+InputCommand.__new__.__defaults__ = (0, 0) + (False,) * 10
+InputCommand.__doc__ = """
+Input de um passo de simulação.
+
+Campos:
+    dx, dy: Movimento do mouse (pixels)
+    forward, back, left, right: Estado de W, S, A, D
+    run: SHIFT pressionado
+    push: ESPAÇO pressionado
+    undo, redo, restart, teleport: Ações de tecla única (Z, Y, R, T)
+        disparadas neste passo
+"""
+
+IDLE_INPUT = InputCommand()
+
+
+class Simulation:
+    """Simulação headless de um nível do jogo"""
+    
+    def __init__(self, level=None, player=None):
+        """
+        Inicializa a simulação.
+        
+        Args:
+            level: Objeto Level (cria um novo se None)
+            player: Objeto Player (cria um novo se None)
+        """
+        self.level = level if level is not None else Level()
+        self.player = player if player is not None else Player()
+        
+        # Relógio próprio (soma dos dt)
+        self.time = 0.0
+        self.frame = 0
+        
+        self.last_push_time = -PUSH_COOLDOWN
+        self.victory = False
+        
+        # Eventos do passo atual + ouvintes externos
+        self.events = []
+        self.listeners = []
+        
+        self.level.on_event = self._emit
+        self.player.on_event = self._emit
+    
+    def _emit(self, event):
+        """Registra evento do passo atual e notifica ouvintes"""
+        self.events.append(event)
+        for listener in self.listeners:
+            listener(event)
+    
+    def add_listener(self, callback):
+        """
+        Registra callback chamado a cada evento da simulação.
+        
+        Args:
+            callback: Função que recebe o nome do evento
+        """
+        self.listeners.append(callback)
+    
+    def load_level(self, level_index):
+        """
+        Carrega um nível e posiciona o jogador no spawn.
+        
+        Args:
+            level_index (int): Índice do nível (0-based)
+        
+        Returns:
+            bool: True se carregou com sucesso
+        """
+        if not self.level.load_level(level_index):
+            return False
+        
+        self.victory = False
+        self.reset_player()
+        return True
+    
+    def reload_level(self):
+        """Recarrega o nível atual (reset)"""
+        return self.load_level(self.level.current_level_index)
+    
+    def restart(self):
+        """Desfaz todos os empurrões e leva o jogador ao spawn"""
+        self.level.rewind()
+        self.victory = False
+        self.reset_player()
+    
+    def _apply_history(self, position):
+        """Reposiciona o jogador após undo/redo e reavalia vitória"""
+        if position is None:
+            return False
+        
+        self.player.set_position(position[0], self.player.y, position[1])
+        was_victory = self.victory
+        self.victory = self.level.check_victory()
+        if self.victory and not was_victory:
+            self._emit('victory')
+        return True
+    
+    def undo(self):
+        """
+        Desfaz o último empurrão.
+        
+        Returns:
+            bool: True se desfez
+        """
+        return self._apply_history(self.level.undo())
+    
+    def redo(self):
+        """
+        Refaz o último empurrão desfeito.
+        
+        Returns:
+            bool: True se refez
+        """
+        return self._apply_history(self.level.redo())
+    
+    def reset_player(self):
+        """Leva o jogador de volta ao spawn com a câmera resetada"""
+        self.player.set_position(*self.level.spawn_position)
+        self.player.reset_camera()
+    
+    def step(self, command, dt):
+        """
+        Avança a simulação em um passo.
+        
+        Args:
+            command: InputCommand do passo
+            dt: Delta time (segundos)
+        
+        Returns:
+            list: Eventos ocorridos neste passo
+        """
+        self.events = []
+        self.time += dt
+        self.frame += 1
+        
+        player = self.player
+        level = self.level
+        
+        # Estado anterior para interpolação da renderização
+        player.store_previous()
+        
+        # Ações de tecla única (antes do movimento, como no front end)
+        if command.restart:
+            self.restart()
+        if command.teleport:
+            self.reset_player()
+        if command.undo:
+            self.undo()
+        if command.redo:
+            self.redo()
+        
+        # Mouse look
+        player.update_camera_rotation(command.dx, command.dy)
+        
+        # Input de movimento
+        input_forward = 0.0
+        input_strafe = 0.0
+        
+        if command.forward:
+            input_forward += 1.0
+        if command.back:
+            input_forward -= 1.0
+        if command.right:
+            input_strafe += 1.0
+        if command.left:
+            input_strafe -= 1.0
+        
+        # Movimento
+        player.move(
+            input_forward, input_strafe, dt,
+            level.walls, level.boxes,
+            command.run, self.time,
+            grid=level.collision_grid
+        )
+        
+        # Empurrar caixa
+        if command.push and not self.victory:
+            if (self.time - self.last_push_time) >= PUSH_COOLDOWN:
+                dir_x, dir_z = player.get_facing_direction()
+                
+                if level.push_box(player.x, player.z, dir_x, dir_z, self.time):
+                    self.last_push_time = self.time
+                    
+                    # Verifica vitória
+                    if level.check_victory():
+                        self.victory = True
+                        self._emit('victory')
+        
+        # Atualiza partículas
+        level.update_particles(self.time, PARTICLE_LIFETIME)
+        
+        return self.events
+    
+    def advance(self, dt):
+        """
+        Avança apenas relógio e partículas (ex.: tela de vitória).
+        
+        Args:
+            dt: Delta time (segundos)
+        """
+        self.time += dt
+        self.level.update_particles(self.time, PARTICLE_LIFETIME)
@@ -0,0 +1,512 @@
+"""
+game/solver.py
+==============
+Solver de Sokoban sobre as regras de empurrão do Level.
+Encontra a sequência ótima de empurrões para resolver um nível.
+
+ALGORITMO:
+---------
+A* sobre o espaço de empurrões (custo = número de empurrões):
+- Cada nó é uma configuração de caixas + região alcançável pelo jogador
+- Sucessores: todo empurrão legal de qualquer caixa cuja face traseira
+  seja alcançável pelo jogador sem mover outras caixas
+- Heurística admissível: matching de custo mínimo entre caixas e
+  objetivos, usando a distância em empurrões de cada célula a cada
+  objetivo (ignorando as outras caixas)
+- Podas de deadlock (game/deadlock.py): casas mortas pré-calculadas
+  por nível e freeze deadlocks verificados após cada empurrão
+
+CODIFICAÇÃO COMPACTA DE ESTADO:
+------------------------------
+- Células andáveis do nível são numeradas (0..N-1)
+- Caixas: bitmask inteiro (bit i = caixa na célula i)
+- Jogador: normalizado para a menor célula da sua região alcançável,
+  de modo que posições equivalentes do jogador viram um único estado
+- Tabela de transposição indexada pelo hash de Zobrist (game/zobrist.py)
+  do estado, atualizado por XOR a cada empurrão
+
+LEGALIDADE:
+----------
+Um empurrão segue exatamente Level.can_push_box: o destino não pode ter
+parede nem caixa e precisa estar dentro dos limites do mundo (|x|, |z| < 100).
+Além disso, o jogador precisa conseguir andar até a célula atrás da caixa.
+
+USO:
+---
+    solver = SokobanSolver.from_level(level)
+    pushes = solver.solve()   # lista de Push(box, direction) ou None
+    
+    python -m game.solver     # valida todos os níveis de levels_data
+"""
+
+import heapq
+import time
+from collections import deque, namedtuple
+from .physics import Physics
+from .deadlock import get_dead_squares, find_freeze_deadlock
+from .zobrist import ZOBRIST
+
+
+# Limite do mundo usado por Level.can_push_box
+WORLD_LIMIT = 100
+
+# Direções cardinais (dir_x, dir_z)
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# Empurrão: caixa na posição (x, 0, z) empurrada na direção (dir_x, dir_z)
+Push = namedtuple('Push', ['box', 'direction'])
+
+INFINITY = float('inf')
+
+
+class SokobanSolver:
+    """Solver A* de Sokoban para um nível"""
+    
+    def __init__(self, walls, boxes, objectives, spawn):
+        """
+        Prepara o grid de células e as tabelas de distância.
+        
+        Args:
+            walls: Lista de paredes (x, y, z)
+            boxes: Lista de caixas (x, y, z)
+            objectives: Lista de objetivos (x, y, z)
+            spawn: Posição inicial do jogador (x, y, z)
+        """
+        self.wall_set = {(int(x), 0, int(z)) for (x, _, z) in walls}
+        self.goal_set = {(int(x), 0, int(z)) for (x, _, z) in objectives}
+        self.wall_cells = {(x, z) for (x, _, z) in self.wall_set}
+        self.start_boxes = [(int(x), int(z)) for (x, _, z) in boxes]
+        self.goal_cells = [(int(x), int(z)) for (x, _, z) in objectives]
+        self.spawn_cell = (Physics.grid_round(spawn[0]), Physics.grid_round(spawn[2]))
+        
+        # Estatísticas da última busca
+        self.nodes_expanded = 0
+        self.elapsed = 0.0
+        
+        self._build_cells()
+        self._build_distance_table()
+    
+    @classmethod
+    def from_level(cls, level):
+        """
+        Cria solver a partir do estado atual de um Level.
+        
+        Args:
+            level: Objeto Level já carregado
+        
+        Returns:
+            SokobanSolver: Solver para o estado atual das caixas
+        """
+        return cls(level.walls, level.boxes, level.objectives, level.spawn_position)
+    
+    def _is_open(self, cell):
+        """Verifica se célula não é parede e está dentro do mundo"""
+        return (cell not in self.wall_cells and
+                abs(cell[0]) < WORLD_LIMIT and abs(cell[1]) < WORLD_LIMIT)
+    
+    def _build_cells(self):
+        """
+        Numera as células andáveis (flood fill a partir do spawn e das caixas)
+        e monta a tabela de vizinhos por direção.
+        As células são numeradas em ordem de posição, então a menor célula
+        de uma região é também a menor posição (mesma normalização de
+        Level.state_hash).
+        """
+        self.cells = []
+        self.index = {}
+        
+        queue = deque()
+        for cell in [self.spawn_cell] + self.start_boxes:
+            if self._is_open(cell) and cell not in self.index:
+                self.index[cell] = len(self.cells)
+                self.cells.append(cell)
+                queue.append(cell)
+        
+        while queue:
+            x, z = queue.popleft()
+            for dx, dz in DIRECTIONS:
+                nxt = (x + dx, z + dz)
+                if nxt not in self.index and self._is_open(nxt):
+                    self.index[nxt] = len(self.cells)
+                    self.cells.append(nxt)
+                    queue.append(nxt)
+        
+        self.cells.sort()
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.positions = [(x, 0, z) for (x, z) in self.cells]
+        
+        # Chaves de Zobrist por célula
+        self.box_keys = [ZOBRIST.box_key(pos) for pos in self.positions]
+        self.player_keys = [ZOBRIST.player_key(pos) for pos in self.positions]
+        
+        # neighbors[i][d] = índice da célula vizinha na direção d ou -1
+        self.neighbors = []
+        for (x, z) in self.cells:
+            self.neighbors.append(tuple(
+                self.index.get((x + dx, z + dz), -1) for dx, dz in DIRECTIONS
+            ))
+    
+    def _build_distance_table(self):
+        """
+        Calcula, para cada célula e cada objetivo, a menor distância em
+        empurrões até aquele objetivo, via BFS reversa (puxando a caixa a
+        partir do objetivo). Células sem caminho para nenhum objetivo são
+        mortas: uma caixa ali nunca chega a um objetivo.
+        """
+        goals = [self.index[g] for g in self.goal_cells if g in self.index]
+        per_goal = []
+        
+        for goal in goals:
+            dist = [INFINITY] * len(self.cells)
+            dist[goal] = 0
+            queue = deque([goal])
+            
+            while queue:
+                i = queue.popleft()
+                for d in range(4):
+                    # Caixa veio da célula anterior, empurrada pelo jogador duas atrás
+                    prev = self.neighbors[i][(d + 2) % 4]
+                    if prev < 0 or dist[prev] != INFINITY:
+                        continue
+                    if self.neighbors[prev][(d + 2) % 4] < 0:
+                        continue
+                    dist[prev] = dist[i] + 1
+                    queue.append(prev)
+            
+            per_goal.append(dist)
+        
+        # goal_distance[i] = distâncias da célula i a cada objetivo
+        self.goal_distance = [tuple(dist[i] for dist in per_goal)
+                              for i in range(len(self.cells))]
+        
+        # Casas mortas compartilhadas com o Level (cache por nível)
+        self.dead_squares = get_dead_squares(self.wall_set, sorted(self.goal_set))
+        self.dead = [pos in self.dead_squares for pos in self.positions]
+        
+        self._h_cache = {}
+    
+    def _reachable(self, player, box_mask):
+        """
+        Calcula região alcançável pelo jogador sem empurrar caixas.
+        
+        Args:
+            player: Índice da célula do jogador
+            box_mask: Bitmask das caixas
+        
+        Returns:
+            tuple: (conjunto de células alcançáveis, célula normalizada)
+        """
+        seen = {player}
+        stack = [player]
+        neighbors = self.neighbors
+        while stack:
+            i = stack.pop()
+            for j in neighbors[i]:
+                if j >= 0 and j not in seen and not (box_mask >> j) & 1:
+                    seen.add(j)
+                    stack.append(j)
+        return seen, min(seen)
+    
+    def _heuristic(self, box_mask):
+        """
+        Custo mínimo de atribuir cada caixa a um objetivo distinto.
+        Consistente: um empurrão muda o custo em no máximo uma unidade.
+        """
+        cached = self._h_cache.get(box_mask)
+        if cached is not None:
+            return cached
+        
+        rows = []
+        mask = box_mask
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            rows.append(self.goal_distance[low.bit_length() - 1])
+        
+        h = self._assignment_cost(rows)
+        self._h_cache[box_mask] = h
+        return h
+    
+    @staticmethod
+    def _assignment_cost(rows):
+        """
+        Custo mínimo de atribuição (algoritmo húngaro, O(n²·m)).
+        
+        Args:
+            rows: Uma linha por caixa com a distância a cada objetivo
+        
+        Returns:
+            float: Custo total ou INFINITY se não há atribuição completa
+        """
+        n = len(rows)
+        m = len(rows[0]) if rows else 0
+        if n > m:
+            return INFINITY
+        
+        # Custo "impossível" grande o bastante para nunca ser escolhido
+        big = 1 << 30
+        u = [0] * (n + 1)
+        v = [0] * (m + 1)
+        match = [0] * (m + 1)  # match[j] = linha atribuída à coluna j
+        way = [0] * (m + 1)
+        
+        for i in range(1, n + 1):
+            match[0] = i
+            j0 = 0
+            min_v = [INFINITY] * (m + 1)
+            used = [False] * (m + 1)
+            while True:
+                used[j0] = True
+                i0 = match[j0]
+                row = rows[i0 - 1]
+                delta = INFINITY
+                j1 = 0
+                for j in range(1, m + 1):
+                    if used[j]:
+                        continue
+                    cost = row[j - 1]
+                    if cost == INFINITY:
+                        cost = big
+                    cur = cost - u[i0] - v[j]
+                    if cur < min_v[j]:
+                        min_v[j] = cur
+                        way[j] = j0
+                    if min_v[j] < delta:
+                        delta = min_v[j]
+                        j1 = j
+                for j in range(m + 1):
+                    if used[j]:
+                        u[match[j]] += delta
+                        v[j] -= delta
+                    else:
+                        min_v[j] -= delta
+                j0 = j1
+                if match[j0] == 0:
+                    break
+            while j0:
+                j1 = way[j0]
+                match[j0] = match[j1]
+                j0 = j1
+        
+        total = 0
+        for j in range(1, m + 1):
+            if match[j]:
+                cost = rows[match[j] - 1][j - 1]
+                if cost == INFINITY:
+                    return INFINITY
+                total += cost
+        return total
+    
+    def solve(self, max_nodes=2000000):
+        """
+        Resolve o nível com A*.
+        
+        Args:
+            max_nodes: Limite de nós expandidos (proteção contra explosão)
+        
+        Returns:
+            list: Lista de Push na ordem de execução, ou None se não há solução
+        """
+        start_time = time.perf_counter()
+        self.nodes_expanded = 0
+        pushes = self._search(max_nodes)
+        self.elapsed = time.perf_counter() - start_time
+        return pushes
+    
+    def _search(self, max_nodes):
+        """Laço principal do A* (ver solve)"""
+        # Mesma condição de Level.check_victory
+        if len(self.start_boxes) != len(self.goal_cells):
+            return None
+        if self.spawn_cell not in self.index:
+            return None
+        
+        box_mask = 0
+        for cell in self.start_boxes:
+            i = self.index.get(cell)
+            if i is None:
+                return None
+            box_mask |= 1 << i
+        
+        goal_mask = 0
+        for cell in self.goal_cells:
+            i = self.index.get(cell)
+            if i is not None:
+                goal_mask |= 1 << i
+        
+        h = self._heuristic(box_mask)
+        if h == INFINITY:
+            return None
+        
+        box_hash = 0
+        for cell in self.start_boxes:
+            box_hash ^= self.box_keys[self.index[cell]]
+        
+        # Nó: (f, -g, contador, box_mask, box_hash, jogador, g, pai, empurrão)
+        # A normalização do jogador é feita só quando o nó é expandido.
+        counter = 0
+        open_heap = [(h, 0, counter, box_mask, box_hash,
+                      self.index[self.spawn_cell], 0, None, None)]
+        seen_g = {}
+        parents = {}  # Tabela de transposição: hash -> (pai, empurrão)
+        
+        neighbors = self.neighbors
+        dead = self.dead
+        cells = self.cells
+        box_keys = self.box_keys
+        player_keys = self.player_keys
+        
+        while open_heap:
+            _, _, _, box_mask, box_hash, player, g, parent, push = heapq.heappop(open_heap)
+            reach, norm = self._reachable(player, box_mask)
+            key = box_hash ^ player_keys[norm]
+            if key in parents:
+                continue
+            parents[key] = (parent, push)
+            
+            if box_mask == goal_mask:
+                return self._reconstruct(parents, key)
+            
+            self.nodes_expanded += 1
+            if self.nodes_expanded > max_nodes:
+                return None
+            
+            new_g = g + 1
+            mask = box_mask
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                box = low.bit_length() - 1
+                box_neighbors = neighbors[box]
+                
+                for d in range(4):
+                    dest = box_neighbors[d]
+                    if dest < 0 or (box_mask >> dest) & 1 or dead[dest]:
+                        continue
+                    if box_neighbors[(d + 2) % 4] not in reach:
+                        continue
+                    
+                    # Após o empurrão o jogador ocupa a antiga célula da caixa
+                    new_mask = box_mask ^ low ^ (1 << dest)
+                    new_hash = box_hash ^ box_keys[box] ^ box_keys[dest]
+                    seen_key = new_hash ^ player_keys[box]
+                    if seen_g.get(seen_key, INFINITY) <= new_g:
+                        continue
+                    seen_g[seen_key] = new_g
+                    
+                    if self._is_frozen(dest, new_mask):
+                        continue
+                    
+                    h = self._heuristic(new_mask)
+                    if h == INFINITY:
+                        continue
+                    
+                    bx, bz = cells[box]
+                    counter += 1
+                    heapq.heappush(open_heap, (
+                        new_g + h, -new_g, counter, new_mask, new_hash, box, new_g,
+                        key, Push((bx, 0, bz), DIRECTIONS[d])
+                    ))
+        
+        return None
+    
+    def _is_frozen(self, dest, box_mask):
+        """
+        Verifica se a caixa recém-empurrada criou um freeze deadlock.
+        
+        Args:
+            dest: Índice da célula da caixa empurrada
+            box_mask: Bitmask das caixas após o empurrão
+            
+        Returns:
+            bool: True se há deadlock
+        """
+        # Sem vizinho bloqueante em algum eixo não há como travar
+        blocked_axes = 0
+        for axis in ((0, 2), (1, 3)):
+            for d in axis:
+                n = self.neighbors[dest][d]
+                if n < 0 or (box_mask >> n) & 1:
+                    blocked_axes += 1
+                    break
+        if blocked_axes < 2:
+            return False
+        
+        boxes = set()
+        mask = box_mask
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            boxes.add(self.positions[low.bit_length() - 1])
+        
+        return bool(find_freeze_deadlock(
+            self.positions[dest], boxes, self.wall_set, self.goal_set, self.dead_squares
+        ))
+    
+    @staticmethod
+    def _reconstruct(parents, key):
+        """Reconstrói a lista de empurrões a partir do estado final"""
+        pushes = []
+        parent, push = parents[key]
+        while parent is not None:
+            pushes.append(push)
+            parent, push = parents[parent]
+        pushes.reverse()
+        return pushes
+
+
+def replay_pushes(level, pushes):
+    """
+    Aplica uma sequência de empurrões usando as regras do próprio Level.
+    
+    Args:
+        level: Objeto Level carregado (estado é modificado)
+        pushes: Lista de Push
+    
+    Returns:
+        bool: True se todos os empurrões foram aceitos e o nível foi vencido
+    """
+    for box, (dir_x, dir_z) in pushes:
+        player_x = box[0] - dir_x
+        player_z = box[2] - dir_z
+        if not level.push_box(player_x, player_z, dir_x, dir_z, 0.0):
+            return False
+    return level.check_victory()
+
+
+def validate_levels():
+    """
+    Resolve e valida todos os níveis de levels_data.
+    
+    Returns:
+        bool: True se todos os níveis têm solução válida
+    """
+    from .level import Level
+    from .levels_data import get_level_count
+    
+    all_ok = True
+    total_time = 0.0
+    
+    for index in range(get_level_count()):
+        level = Level()
+        level.load_level(index)
+        solver = SokobanSolver.from_level(level)
+        pushes = solver.solve()
+        total_time += solver.elapsed
+        
+        ok = pushes is not None and replay_pushes(level, pushes)
+        all_ok = all_ok and ok
+        
+        status = "OK" if ok else "FALHOU"
+        pushes_txt = len(pushes) if pushes is not None else '-'
+        print(f"[{status}] Nível {index + 1} ({level.level_name}): "
+              f"{pushes_txt} empurrões, {solver.nodes_expanded} nós, "
+              f"{solver.elapsed * 1000:.1f} ms")
+    
+    print(f"Tempo total: {total_time * 1000:.1f} ms")
+    return all_ok
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if validate_levels() else 1)
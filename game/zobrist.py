@@ -0,0 +1,143 @@
+"""
+game/zobrist.py
+===============
+Hash de Zobrist para configurações de nível (caixas + região do jogador).
+
+TÉCNICA:
+-------
+- Cada célula recebe duas chaves aleatórias de 64 bits: uma para "caixa
+  nesta célula" e outra para "jogador normalizado nesta célula"
+- O hash de um estado é o XOR das chaves das caixas com a chave do jogador
+- Mover uma caixa de A para B: hash ^= box_key(A) ^ box_key(B)
+  (XOR é a própria inversa: desfazer o movimento restaura o hash)
+
+CHAVES DETERMINÍSTICAS:
+----------------------
+As chaves são derivadas da posição via splitmix64 (sem tabela aleatória
+pré-alocada), então não dependem da ordem de acesso nem do tamanho do
+nível e são iguais entre execuções. Ficam em cache após o primeiro uso.
+
+USOS:
+----
+- Tabelas de transposição do solver (game/solver.py)
+- Cache de posições resolvidas e detecção de duplicatas em replays
+"""
+
+from collections import deque
+
+
+MASK_64 = (1 << 64) - 1
+
+# Direções cardinais (dir_x, dir_z)
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+def _splitmix64(value):
+    """Mistura um inteiro em 64 bits pseudo-aleatórios (splitmix64)"""
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+class ZobristTable:
+    """Chaves de Zobrist por célula (caixa e jogador)"""
+    
+    def __init__(self, seed=0x5EED):
+        """
+        Inicializa a tabela.
+        
+        Args:
+            seed: Semente das chaves (tabelas com sementes iguais coincidem)
+        """
+        self.seed = seed
+        self._box_keys = {}
+        self._player_keys = {}
+    
+    def _key(self, x, z, kind):
+        """Gera chave para célula (x, z) e tipo (0 = caixa, 1 = jogador)"""
+        packed = ((x & 0xFFFFFF) << 40) | ((z & 0xFFFFFF) << 16) | (kind << 8)
+        return _splitmix64(packed ^ _splitmix64(self.seed))
+    
+    def box_key(self, position):
+        """
+        Chave de uma caixa na posição (x, 0, z).
+        
+        Args:
+            position: Tupla (x, y, z)
+        
+        Returns:
+            int: Chave de 64 bits
+        """
+        key = self._box_keys.get(position)
+        if key is None:
+            key = self._key(int(position[0]), int(position[2]), 0)
+            self._box_keys[position] = key
+        return key
+    
+    def player_key(self, position):
+        """
+        Chave do jogador normalizado na posição (x, 0, z).
+        
+        Args:
+            position: Tupla (x, y, z)
+        
+        Returns:
+            int: Chave de 64 bits
+        """
+        key = self._player_keys.get(position)
+        if key is None:
+            key = self._key(int(position[0]), int(position[2]), 1)
+            self._player_keys[position] = key
+        return key
+    
+    def hash_boxes(self, boxes):
+        """
+        Hash de um conjunto de caixas.
+        
+        Args:
+            boxes: Iterável de posições (x, 0, z)
+        
+        Returns:
+            int: XOR das chaves das caixas
+        """
+        value = 0
+        for box in boxes:
+            value ^= self.box_key(box)
+        return value
+
+
+# Tabela global compartilhada (Level, solver, análise de replays)
+ZOBRIST = ZobristTable()
+
+
+def normalized_player_cell(player_cell, walls, boxes):
+    """
+    Normaliza posição do jogador para a menor célula da sua região.
+    Posições do jogador que alcançam as mesmas células sem empurrar
+    caixas são equivalentes e viram a mesma célula.
+    
+    Args:
+        player_cell: Posição (x, 0, z) do jogador no grid
+        walls: Conjunto de paredes
+        boxes: Conjunto/dict de caixas
+    
+    Returns:
+        tuple: Menor posição (x, 0, z) alcançável
+    """
+    seen = {player_cell}
+    queue = deque([player_cell])
+    
+    while queue:
+        x, y, z = queue.popleft()
+        for dx, dz in DIRECTIONS:
+            nxt = (x + dx, y, z + dz)
+            if nxt in seen or nxt in walls or nxt in boxes:
+                continue
+            # Proteção para regiões abertas (sem paredes ao redor)
+            if abs(nxt[0]) >= 100 or abs(nxt[2]) >= 100:
+                continue
+            seen.add(nxt)
+            queue.append(nxt)
+    
+    return min(seen)
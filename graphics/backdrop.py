@@ -0,0 +1,88 @@
+"""
+graphics/backdrop.py
+====================
+Fundo 3D das telas paradas (menu, vitória) capturado uma vez em textura.
+
+POR QUE:
+-------
+O menu redesenhava a cena de demonstração inteira a cada frame, e a
+tela de vitória o nível inteiro (paredes, caixas, partículas) atrás de
+um overlay que não muda, a até TARGET_FPS frames por segundo.
+
+COMO:
+----
+Depois de desenhar a cena uma vez, capture() copia o back buffer para
+uma textura (glCopyTexSubImage2D, sem depender de framebuffer objects).
+Enquanto a chave da cena (tela, nível, tamanho da janela) for a mesma,
+draw() enfileira a textura como uma imagem opaca (sem blend) na passada
+2D, antes dos textos da tela. Partes animadas (partículas da vitória)
+fazem a cena ser desenhada normalmente até pararem.
+"""
+
+from OpenGL.GL import *
+from .overlay import Overlay
+from .state import GLState
+
+
+class Backdrop:
+    """Cópia da tela reutilizada como fundo enquanto a cena não muda"""
+    
+    def __init__(self):
+        """Cria o fundo vazio (textura alocada na primeira captura)"""
+        self.texture_id = None
+        self.width = 0
+        self.height = 0
+        self.key = None
+    
+    def valid(self, key):
+        """
+        Verifica se a cópia atual é da cena pedida.
+        
+        Args:
+            key: Chave da cena (tela, nível, tamanho da janela...)
+        
+        Returns:
+            bool: True se a cópia pode ser reutilizada
+        """
+        return self.key is not None and self.key == key
+    
+    def capture(self, key, width, height):
+        """
+        Copia o back buffer (cena recém-desenhada) para a textura.
+        
+        Args:
+            key: Chave da cena capturada
+            width, height: Tamanho da janela
+        """
+        if self.texture_id is None:
+            self.texture_id = glGenTextures(1)
+        GLState.bind_texture(self.texture_id)
+        
+        if (width, height) != (self.width, self.height):
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0,
+                         GL_RGBA, GL_UNSIGNED_BYTE, None)
+            self.width = width
+            self.height = height
+        
+        glCopyTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, 0, 0, width, height)
+        self.key = key
+    
+    def draw(self):
+        """Enfileira a cópia cobrindo a tela inteira"""
+        Overlay.image(self.texture_id, 0, 0, self.width, self.height, blend=None)
+    
+    def invalidate(self):
+        """A cena mudou: a próxima tela parada captura de novo"""
+        self.key = None
+    
+    def release(self):
+        """Libera a textura da GPU"""
+        if self.texture_id is not None:
+            glDeleteTextures([self.texture_id])
+            GLState.forget_texture(self.texture_id)
+            self.texture_id = None
+        self.width = 0
+        self.height = 0
+        self.key = None
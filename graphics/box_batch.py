@@ -0,0 +1,197 @@
+"""
+graphics/box_batch.py
+=====================
+Caixas e sombras desenhadas em lote a partir de buffers dinâmicos.
+
+POR QUE:
+-------
+Antes, cada caixa custava apply_box_material + apply_wall_material
+(8 chamadas de material), push/translate/pop, 24 glVertex e uma sombra
+que ligava/desligava blend e iluminação. Agora todas as caixas vivem em
+um VBO e todas as sombras em outro.
+
+LOTES POR STATUS:
+----------------
+O pipeline fixo não tem instancing, e o material da caixa usa ambiente =
+metade do difuso e brilho por status, o que GL_COLOR_MATERIAL não
+reproduz. Os vértices são então ordenados por status no buffer e cada
+status vira um intervalo desenhado com seu material: no máximo 4
+glDrawArrays para todas as caixas, 1 para todas as sombras.
+
+ATUALIZAÇÃO:
+-----------
+Os buffers só são reescritos quando a assinatura muda: posição de
+alguma caixa (Level.box_hash) ou status visual de alguma caixa.
+Status None marca caixa oculta (occlusion culling): ela fica fora dos
+dois buffers.
+"""
+
+import numpy as np
+from OpenGL.GL import *
+from .buffers import VertexBuffer
+from .materials import Materials
+from .state import GLState
+
+
+# Status -> (cor RGBA, brilho); ordem dos intervalos no buffer
+BOX_STATUS_MATERIALS = {
+    'normal': ((0.72, 0.48, 0.16, 1.0), 32.0),     # Marrom
+    'pushable': ((0.2, 0.9, 0.2, 1.0), 32.0),      # Verde
+    'blocked': ((0.9, 0.2, 0.2, 1.0), 32.0),       # Vermelho
+    'on_target': ((1.0, 0.84, 0.0, 1.0), 64.0),    # Dourado
+}
+STATUS_ORDER = tuple(BOX_STATUS_MATERIALS)
+
+# Faces da caixa (cubo unitário de Primitives.draw_unit_cube, sem a base
+# que fica encostada no chão): normal + 4 cantos
+_BOX_FACES = (
+    ((0, 0, 1), ((-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1))),
+    ((0, 0, -1), ((-1, -1, -1), (-1, 1, -1), (1, 1, -1), (1, -1, -1))),
+    ((-1, 0, 0), ((-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1))),
+    ((1, 0, 0), ((1, -1, -1), (1, 1, -1), (1, 1, 1), (1, -1, 1))),
+    ((0, 1, 0), ((-1, 1, -1), (-1, 1, 1), (1, 1, 1), (1, 1, -1))),
+)
+
+_BOX_TEMPLATE = np.array(
+    [list(np.multiply(corner, 0.5)) + list(normal)
+     for normal, corners in _BOX_FACES for corner in corners],
+    dtype=np.float32
+)
+
+# Sombra: quad preto de meio lado 0.4 e alpha 0.3, logo acima do chão
+SHADOW_SIZE = 0.4
+SHADOW_ALPHA = 0.3
+SHADOW_HEIGHT = -0.99
+_SHADOW_TEMPLATE = np.array(
+    [(-SHADOW_SIZE, 0.0, -SHADOW_SIZE), (SHADOW_SIZE, 0.0, -SHADOW_SIZE),
+     (SHADOW_SIZE, 0.0, SHADOW_SIZE), (-SHADOW_SIZE, 0.0, SHADOW_SIZE)],
+    dtype=np.float32
+)
+
+
+def build_box_vertices(centers):
+    """
+    Monta os vértices (posição + normal) de caixas.
+    
+    Args:
+        centers: Array (N, 3) com os centros das caixas
+    
+    Returns:
+        np.ndarray: Array (20 * N, 6)
+    """
+    data = np.repeat(_BOX_TEMPLATE[None, :, :], len(centers), axis=0)
+    data[:, :, 0:3] += centers[:, None, :]
+    return data.reshape(-1, 6)
+
+
+def build_shadow_vertices(boxes):
+    """
+    Monta os vértices das sombras das caixas.
+    
+    Args:
+        boxes: Lista de posições (x, y, z) das caixas
+    
+    Returns:
+        np.ndarray: Array (4 * N, 3)
+    """
+    positions = np.array(boxes, dtype=np.float32).reshape(-1, 3)
+    positions[:, 1] = SHADOW_HEIGHT
+    return (positions[:, None, :] + _SHADOW_TEMPLATE[None, :, :]).reshape(-1, 3)
+
+
+class BoxBatch:
+    """Caixas e sombras em buffers dinâmicos, reescritos só quando mudam"""
+    
+    def __init__(self):
+        """Inicializa lote vazio"""
+        self.box_buffer = None
+        self.shadow_buffer = None
+        self.ranges = []  # (status, primeiro vértice, número de vértices)
+        self.key = None
+        self.shadow_key = None
+    
+    def sync(self, level, statuses):
+        """
+        Atualiza buffers se posições ou status mudaram.
+        
+        Args:
+            level: Objeto Level
+            statuses: Lista de status visuais (mesma ordem de level.boxes);
+                      None = caixa oculta, não desenhada
+        """
+        hidden = tuple(status is None for status in statuses)
+        shadow_key = (id(level), level.static_version, level.box_hash, hidden)
+        key = (shadow_key, tuple(statuses))
+        
+        if key != self.key:
+            self._rebuild_boxes(level.boxes, statuses)
+            self.key = key
+        
+        if shadow_key != self.shadow_key:
+            shown = [box for box, status in zip(level.boxes, statuses) if status is not None]
+            data = build_shadow_vertices(shown)
+            if self.shadow_buffer is None:
+                self.shadow_buffer = VertexBuffer(
+                    data, layout=(('vertex', 3),), usage=GL_DYNAMIC_DRAW
+                )
+            else:
+                self.shadow_buffer.upload(data)
+            self.shadow_key = shadow_key
+    
+    def _rebuild_boxes(self, boxes, statuses):
+        """Reescreve o buffer das caixas agrupado por status"""
+        chunks = []
+        self.ranges = []
+        first = 0
+        
+        for status in STATUS_ORDER:
+            centers = [(x, y - 0.5, z) for (x, y, z), s in zip(boxes, statuses) if s == status]
+            if not centers:
+                continue
+            chunk = build_box_vertices(np.array(centers, dtype=np.float32))
+            chunks.append(chunk)
+            self.ranges.append((status, first, len(chunk)))
+            first += len(chunk)
+        
+        data = np.concatenate(chunks) if chunks else np.zeros((0, 6), dtype=np.float32)
+        if self.box_buffer is None:
+            self.box_buffer = VertexBuffer(
+                data, layout=(('vertex', 3), ('normal', 3)), usage=GL_DYNAMIC_DRAW
+            )
+        else:
+            self.box_buffer.upload(data)
+    
+    def draw(self):
+        """Desenha caixas (um intervalo por status) e sombras"""
+        if self.box_buffer is None:
+            return
+        
+        GLState.enable(GL_LIGHTING)
+        for status, first, count in self.ranges:
+            color, shininess = BOX_STATUS_MATERIALS[status]
+            Materials.apply_box_material(color, shininess)
+            self.box_buffer.draw(first, count)
+        
+        # Restaura material padrão
+        Materials.apply_wall_material()
+        
+        if self.shadow_buffer is not None and self.shadow_buffer.count:
+            GLState.disable(GL_LIGHTING)
+            GLState.enable(GL_BLEND)
+            GLState.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+            glColor4f(0.0, 0.0, 0.0, SHADOW_ALPHA)
+            
+            self.shadow_buffer.draw()
+            
+            GLState.disable(GL_BLEND)
+    
+    def release(self):
+        """Libera os buffers da GPU"""
+        for buffer in (self.box_buffer, self.shadow_buffer):
+            if buffer is not None:
+                buffer.delete()
+        self.box_buffer = None
+        self.shadow_buffer = None
+        self.ranges = []
+        self.key = None
+        self.shadow_key = None
@@ -0,0 +1,134 @@
+"""
+graphics/buffers.py
+===================
+Vertex Buffer Objects (VBO) com vértices intercalados.
+
+LAYOUT:
+------
+Cada vértice é uma linha de um array numpy float32 com os atributos
+em sequência, ex.: (('vertex', 3), ('normal', 3), ('color', 3)) =
+x, y, z, nx, ny, nz, r, g, b. Os ponteiros usam o stride da linha,
+então um único buffer alimenta todos os atributos.
+
+DESENHO:
+-------
+Usa client states do pipeline fixo (glVertexPointer/glNormalPointer/
+glColorPointer/glTexCoordPointer) + glDrawArrays: uma chamada desenha o buffer inteiro,
+no lugar de milhares de glVertex em modo imediato.
+"""
+
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+
+# Atributo -> client state do OpenGL
+_CLIENT_STATES = {
+    'vertex': GL_VERTEX_ARRAY,
+    'normal': GL_NORMAL_ARRAY,
+    'color': GL_COLOR_ARRAY,
+    'texcoord': GL_TEXTURE_COORD_ARRAY,
+}
+
+# Layout padrão: posição + normal + cor RGB
+DEFAULT_LAYOUT = (('vertex', 3), ('normal', 3), ('color', 3))
+
+
+class VertexBuffer:
+    """VBO com vértices intercalados desenhados em uma chamada"""
+    
+    def __init__(self, data, layout=DEFAULT_LAYOUT, mode=GL_QUADS, usage=GL_STATIC_DRAW):
+        """
+        Cria o buffer e envia os vértices para a GPU.
+        
+        Args:
+            data: Array (N, floats_por_vértice) com os vértices
+            layout: Sequência de (atributo, componentes)
+            mode: Primitiva do glDrawArrays (GL_QUADS, GL_TRIANGLES...)
+            usage: Dica de uso do buffer (GL_STATIC_DRAW, GL_DYNAMIC_DRAW)
+        """
+        self.layout = tuple(layout)
+        self.mode = mode
+        self.usage = usage
+        self.floats_per_vertex = sum(size for _, size in self.layout)
+        self.stride = self.floats_per_vertex * 4
+        self.count = 0
+        self.buffer_id = glGenBuffers(1)
+        self.upload(data)
+    
+    def upload(self, data):
+        """
+        Substitui o conteúdo do buffer.
+        
+        Args:
+            data: Array (N, floats_por_vértice) com os vértices
+        """
+        data = np.ascontiguousarray(data, dtype=np.float32).reshape(-1, self.floats_per_vertex)
+        self.count = len(data)
+        
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, self.usage)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+    
+    def _bind(self):
+        """Liga o buffer e configura os ponteiros de cada atributo"""
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
+        
+        offset = 0
+        for name, size in self.layout:
+            glEnableClientState(_CLIENT_STATES[name])
+            pointer = ctypes.c_void_p(offset)
+            if name == 'vertex':
+                glVertexPointer(size, GL_FLOAT, self.stride, pointer)
+            elif name == 'normal':
+                glNormalPointer(GL_FLOAT, self.stride, pointer)
+            elif name == 'texcoord':
+                glTexCoordPointer(size, GL_FLOAT, self.stride, pointer)
+            else:
+                glColorPointer(size, GL_FLOAT, self.stride, pointer)
+            offset += size * 4
+    
+    def _unbind(self):
+        """Desliga client states e o buffer"""
+        for name, _ in self.layout:
+            glDisableClientState(_CLIENT_STATES[name])
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+    
+    def draw(self, first=0, count=None):
+        """
+        Desenha um intervalo de vértices do buffer (padrão: todos).
+        
+        Args:
+            first: Primeiro vértice
+            count: Número de vértices (None = até o fim)
+        """
+        if count is None:
+            count = self.count - first
+        if count <= 0 or self.buffer_id is None:
+            return
+        
+        self._bind()
+        glDrawArrays(self.mode, first, count)
+        self._unbind()
+    
+    def draw_ranges(self, ranges):
+        """
+        Desenha vários intervalos com uma única configuração de ponteiros.
+        
+        Args:
+            ranges: Sequência de (primeiro vértice, número de vértices)
+        """
+        if not ranges or self.buffer_id is None:
+            return
+        
+        self._bind()
+        for first, count in ranges:
+            glDrawArrays(self.mode, first, count)
+        self._unbind()
+    
+    def delete(self):
+        """Libera o buffer da GPU"""
+        if self.buffer_id is not None:
+            glDeleteBuffers(1, [self.buffer_id])
+            self.buffer_id = None
+            self.count = 0
@@ -6,37 +6,43 @@ Implementa nuvens animadas leves e eficientes usando técnicas de computação g
 
 ARQUITETURA:
 -----------
-- Cloud: Classe individual representando uma nuvem com posição e movimento
-- CloudSystem: Gerenciador de todas as nuvens com textura compartilhada
+- CloudSystem: todas as nuvens como arrays numpy (posição inicial, altura,
+  tamanho, velocidade, offset de tempo) + textura compartilhada
 
 TÉCNICAS GRÁFICAS:
 -----------------
-1. Billboard Rendering: Quads 2D que sempre rotacionam para encarar a câmera
-   - Calcula ângulo entre câmera e nuvem usando atan2
-   - Aplica rotação no eixo Y para manter orientação frontal
-   
+1. Billboard Rendering: Quads 2D que sempre giram (eixo Y) para encarar a câmera
+   - Vetor "direita" de cada nuvem = perpendicular horizontal à direção
+     nuvem -> câmera, calculado para todas as nuvens de uma vez
+   - Cantos dos quads montados com numpy em um único array de vértices
+
 2. Textura Procedimental: Geração algorítmica sem arquivos externos
    - Gradiente radial baseado em distância euclidiana do centro
    - Ruído pseudo-aleatório usando funções trigonométricas
    - Alpha channel para transparência suave nas bordas
-   
+
 3. Sistema de Animação: Movimento orgânico baseado em funções senoidais
    - Movimento principal no eixo X (sin)
    - Deriva lateral no eixo Z (cos)
    - Time offset para dessincronizar cada nuvem
-   
+
 4. Distribuição Espacial: Anel uniforme ao redor do jogador
    - 360° de cobertura usando coordenadas polares
    - Raio variável para profundidade visual
-   
+
 5. Alpha Blending: Transparência com mistura de cores
    - glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
    - Desabilita depth write para evitar oclusão entre nuvens
 
 OTIMIZAÇÕES:
 -----------
-- Textura única compartilhada por todas as nuvens
-- Geometria simples (1 quad por nuvem)
+- Textura única compartilhada por todas as nuvens e por todos os
+  CloudSystem (contagem de referências): gerada com numpy e enviada à
+  GPU uma vez, não a cada troca de nível
+- Geometria simples (1 quad por nuvem), todas as nuvens em um VBO
+  dinâmico desenhado com um glDrawArrays: o custo em Python não cresce
+  com o número de nuvens
+- Movimento de todas as nuvens em uma passada numpy
 - Sem sombras dinâmicas (mantém performance)
 """
 
@@ -44,51 +50,56 @@ from OpenGL.GL import *
 from OpenGL.GLU import *
 import random
 import math
+import numpy as np
+from .buffers import VertexBuffer
+from .state import GLState
+
+
+# Lado da textura procedimental (pixels)
+CLOUD_TEXTURE_SIZE = 128
 
+# Cantos do quad da nuvem em unidades de tamanho (direita, cima) + UV
+_QUAD_RIGHT = np.array([-1.0, 1.0, 1.0, -1.0])
+_QUAD_UP = np.array([-0.5, -0.5, 0.5, 0.5])
+_QUAD_UV = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float32)
 
-class Cloud:
-    """Representa uma nuvem individual no céu"""
+
+def build_cloud_texture(size=CLOUD_TEXTURE_SIZE):
+    """
+    Gera os pixels RGBA da textura de nuvem em uma passada vetorizada.
     
-    def __init__(self, x, y, z, size, speed):
-        """
-        Inicializa uma nuvem
-        
-        Args:
-            x, y, z: Posição inicial
-            size: Tamanho da nuvem (escala)
-            speed: Velocidade de movimento
-        """
-        self.initial_x = x
-        self.initial_z = z
-        self.x = x
-        self.y = y
-        self.z = z
-        self.size = size
-        self.speed = speed
-        self.time_offset = random.uniform(0, 100)  # Offset de tempo aleatório
+    Gradiente radial com ruído pseudo-aleatório e alpha caindo nas bordas.
     
-    def update(self, dt, wind_speed=1.0, total_time=0.0):
-        """
-        Atualiza posição da nuvem (movimento do vento)
-        
-        Args:
-            dt: Delta time (tempo desde último frame)
-            wind_speed: Multiplicador de velocidade do vento
-            total_time: Tempo total desde início
-        """
-        # Movimento em órbita circular lenta + deslocamento linear
-        t = (total_time + self.time_offset) * self.speed * wind_speed * 0.1
-        
-        # Movimento em X (vento principal)
-        self.x = self.initial_x + math.sin(t) * 10
-        
-        # Movimento em Z (deriva lateral)
-        self.z = self.initial_z + math.cos(t) * 5
+    Args:
+        size: Lado da textura em pixels
+    
+    Returns:
+        np.ndarray: Array (size, size, 4) uint8, linha = y
+    """
+    y, x = np.mgrid[0:size, 0:size].astype(np.float64)
+    
+    # Coordenadas normalizadas (-1 a 1) e distância do centro
+    nx = (x / size) * 2 - 1
+    ny = (y / size) * 2 - 1
+    dist = np.sqrt(nx * nx + ny * ny)
+    
+    # Ruído pseudo-aleatório
+    noise = np.sin(x * 0.1) * np.cos(y * 0.1) * 0.2
+    
+    # Alpha baseado na distância (fade nas bordas); cor branca
+    alpha = np.clip(1.0 - dist + noise, 0.0, 1.0)
+    pixels = np.full((size, size, 4), 255, dtype=np.uint8)
+    pixels[:, :, 3] = (alpha * 255).astype(np.uint8)
+    return pixels
 
 
 class CloudSystem:
     """Sistema de gerenciamento de nuvens"""
     
+    # Textura compartilhada por todas as instâncias (contagem de referências)
+    _shared_texture = None
+    _texture_refs = 0
+    
     def __init__(self, num_clouds=12, wind_speed=0.5):
         """
         Inicializa o sistema de nuvens
@@ -97,12 +108,12 @@ class CloudSystem:
             num_clouds: Quantidade de nuvens no céu
             wind_speed: Velocidade base do vento
         """
-        self.clouds = []
         self.wind_speed = wind_speed
         self.texture_id = None
         self.total_time = 0.0  # Tempo acumulado para animação
         
         # Gera nuvens distribuídas em círculo (360°)
+        clouds = []
         for i in range(num_clouds):
             # Distribuição em anel ao redor do jogador
             angle = (i / num_clouds) * 2 * math.pi
@@ -114,42 +125,62 @@ class CloudSystem:
             
             size = random.uniform(4, 8)
             speed = random.uniform(0.5, 1.2)
+            time_offset = random.uniform(0, 100)  # Dessincroniza as nuvens
             
-            self.clouds.append(Cloud(x, y, z, size, speed))
+            clouds.append((x, y, z, size, speed, time_offset))
+        
+        data = np.array(clouds, dtype=np.float64).reshape(-1, 6)
+        self.initial_x = data[:, 0]
+        self.initial_z = data[:, 2]
+        self.x = self.initial_x.copy()
+        self.y = data[:, 1]
+        self.z = self.initial_z.copy()
+        self.size = data[:, 3]
+        self.speed = data[:, 4]
+        self.time_offset = data[:, 5]
+        
+        # Vértices de todas as nuvens (reescritos a cada render)
+        self.buffer = None
         
-        # Cria textura procedimental
-        self._create_cloud_texture()
+        # Textura procedimental compartilhada (gerada uma vez)
+        self.texture_id = CloudSystem._acquire_texture()
     
-    def _create_cloud_texture(self):
+    @staticmethod
+    def _acquire_texture():
         """
-        Cria uma textura procedimental para as nuvens
-        Usa gradiente radial com ruído para aparência orgânica
+        Retorna a textura compartilhada, criando-a na primeira referência.
+        
+        Returns:
+            int: ID da textura OpenGL
+        """
+        if CloudSystem._shared_texture is None:
+            CloudSystem._shared_texture = CloudSystem._create_cloud_texture()
+        CloudSystem._texture_refs += 1
+        return CloudSystem._shared_texture
+    
+    @staticmethod
+    def _release_texture():
+        """Solta uma referência; apaga a textura quando não sobra nenhuma"""
+        CloudSystem._texture_refs -= 1
+        if CloudSystem._texture_refs <= 0 and CloudSystem._shared_texture is not None:
+            glDeleteTextures([CloudSystem._shared_texture])
+            GLState.forget_texture(CloudSystem._shared_texture)
+            CloudSystem._shared_texture = None
+            CloudSystem._texture_refs = 0
+    
+    @staticmethod
+    def _create_cloud_texture():
+        """
+        Cria a textura procedimental das nuvens e envia para a GPU.
+        
+        Returns:
+            int: ID da textura OpenGL
         """
-        size = 128
-        texture_data = []
-        
-        for y in range(size):
-            for x in range(size):
-                # Coordenadas normalizadas (-1 a 1)
-                nx = (x / size) * 2 - 1
-                ny = (y / size) * 2 - 1
-                
-                # Distância do centro (gradiente radial)
-                dist = math.sqrt(nx*nx + ny*ny)
-                
-                # Adiciona ruído pseudo-aleatório
-                noise = math.sin(x * 0.1) * math.cos(y * 0.1) * 0.2
-                
-                # Alpha baseado na distância (fade nas bordas)
-                alpha = max(0.0, min(1.0, 1.0 - dist + noise))
-                alpha = int(alpha * 255)
-                
-                # Cor branca com alpha variável
-                texture_data.extend([255, 255, 255, alpha])
+        pixels = build_cloud_texture(CLOUD_TEXTURE_SIZE)
         
         # Cria textura OpenGL
-        self.texture_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        texture_id = glGenTextures(1)
+        GLState.bind_texture(texture_id)
         
         # Parâmetros da textura
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -159,9 +190,10 @@ class CloudSystem:
         
         # Upload da textura para GPU
         glTexImage2D(
-            GL_TEXTURE_2D, 0, GL_RGBA, size, size, 0,
-            GL_RGBA, GL_UNSIGNED_BYTE, bytes(texture_data)
+            GL_TEXTURE_2D, 0, GL_RGBA, CLOUD_TEXTURE_SIZE, CLOUD_TEXTURE_SIZE, 0,
+            GL_RGBA, GL_UNSIGNED_BYTE, pixels
         )
+        return texture_id
     
     def update(self, dt):
         """
@@ -171,8 +203,51 @@ class CloudSystem:
             dt: Delta time
         """
         self.total_time += dt
-        for cloud in self.clouds:
-            cloud.update(dt, self.wind_speed, self.total_time)
+        
+        # Movimento em órbita circular lenta (todas as nuvens de uma vez)
+        t = (self.total_time + self.time_offset) * self.speed * self.wind_speed * 0.1
+        
+        # Movimento em X (vento principal) e em Z (deriva lateral)
+        self.x = self.initial_x + np.sin(t) * 10
+        self.z = self.initial_z + np.cos(t) * 5
+    
+    def build_vertices(self, camera_pos):
+        """
+        Monta os quads de todas as nuvens virados para a câmera.
+        
+        Args:
+            camera_pos: Posição da câmera (x, y, z)
+        
+        Returns:
+            np.ndarray: Array (4 * N, 8) com posição, normal e UV
+        """
+        # Direção horizontal nuvem -> câmera; "direita" é a perpendicular
+        dx = camera_pos[0] - self.x
+        dz = camera_pos[2] - self.z
+        dist = np.hypot(dx, dz)
+        safe = np.where(dist > 0, dist, 1.0)
+        right_x = np.where(dist > 0, dz / safe, 1.0)
+        right_z = np.where(dist > 0, -dx / safe, 0.0)
+        
+        # Normal voltada para a câmera (a normal (0, 0, 1) girada pelo
+        # glRotatef do billboard antigo, mantendo a mesma iluminação)
+        normal_x = -right_z
+        normal_z = right_x
+        
+        # Cantos: centro + direita * tamanho * u + cima * tamanho * v
+        right = self.size[:, None] * _QUAD_RIGHT[None, :]
+        up = self.size[:, None] * _QUAD_UP[None, :]
+        
+        count = len(self.size)
+        data = np.empty((count, 4, 8), dtype=np.float32)
+        data[:, :, 0] = self.x[:, None] + right * right_x[:, None]
+        data[:, :, 1] = self.y[:, None] + up
+        data[:, :, 2] = self.z[:, None] + right * right_z[:, None]
+        data[:, :, 3] = normal_x[:, None]
+        data[:, :, 4] = 0.0
+        data[:, :, 5] = normal_z[:, None]
+        data[:, :, 6:8] = _QUAD_UV[None, :, :]
+        return data.reshape(-1, 8)
     
     def render(self, camera_pos):
         """
@@ -182,56 +257,39 @@ class CloudSystem:
             camera_pos: Posição da câmera (para billboard)
         """
         # Habilita blending para transparência
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        GLState.enable(GL_BLEND)
+        GLState.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
         # Desabilita depth write (nuvens não devem bloquear outras nuvens)
         glDepthMask(GL_FALSE)
         
         # Habilita textura
-        glEnable(GL_TEXTURE_2D)
-        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        GLState.enable(GL_TEXTURE_2D)
+        GLState.bind_texture(self.texture_id)
         
         # Material das nuvens (branco brilhante)
         glColor4f(1.0, 1.0, 1.0, 0.8)
         
-        for cloud in self.clouds:
-            glPushMatrix()
-            
-            # Posição da nuvem (já atualizada com movimento)
-            pos_x = cloud.x
-            pos_y = cloud.y
-            pos_z = cloud.z
-            
-            glTranslatef(pos_x, pos_y, pos_z)
-            
-            # Billboard: calcula vetor da câmera para a nuvem
-            dx = camera_pos[0] - pos_x
-            dz = camera_pos[2] - pos_z
-            angle = math.degrees(math.atan2(dx, dz))
-            
-            # Rotaciona para encarar a câmera
-            glRotatef(angle, 0, 1, 0)
-            
-            # Escala
-            s = cloud.size
-            
-            # Desenha quad (plano retangular)
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex3f(-s, -s*0.5, 0)
-            glTexCoord2f(1, 0); glVertex3f( s, -s*0.5, 0)
-            glTexCoord2f(1, 1); glVertex3f( s,  s*0.5, 0)
-            glTexCoord2f(0, 1); glVertex3f(-s,  s*0.5, 0)
-            glEnd()
-            
-            glPopMatrix()
+        # Todas as nuvens em uma chamada
+        data = self.build_vertices(camera_pos)
+        if self.buffer is None:
+            self.buffer = VertexBuffer(
+                data, layout=(('vertex', 3), ('normal', 3), ('texcoord', 2)), usage=GL_DYNAMIC_DRAW
+            )
+        else:
+            self.buffer.upload(data)
+        self.buffer.draw()
         
         # Restaura estados OpenGL
-        glDisable(GL_TEXTURE_2D)
+        GLState.disable(GL_TEXTURE_2D)
         glDepthMask(GL_TRUE)
-        glDisable(GL_BLEND)
+        GLState.disable(GL_BLEND)
     
     def cleanup(self):
         """Libera recursos da GPU"""
-        if self.texture_id:
-            glDeleteTextures([self.texture_id])
+        if self.texture_id is not None:
+            CloudSystem._release_texture()
+            self.texture_id = None
+        if self.buffer is not None:
+            self.buffer.delete()
+            self.buffer = None
@@ -0,0 +1,167 @@
+"""
+graphics/culling.py
+===================
+Frustum culling da câmera em primeira pessoa.
+
+FRUSTUM:
+-------
+Montado a partir dos mesmos parâmetros usados por Renderer.set_perspective
+(FOV, aspecto, near/far) e Renderer.setup_camera (posição, pitch, yaw),
+sem ler matrizes de volta do OpenGL. Os 6 planos são extraídos da matriz
+projeção * view (método de Gribb-Hartmann), com normais apontando para
+dentro do volume visível.
+
+TESTES:
+------
+- intersects_aabb: teste do vértice positivo (conservador: caixas que
+  cruzam um canto do frustum podem passar, nunca são descartadas à toa)
+- intersects_sphere: distância do centro a cada plano
+"""
+
+import math
+import numpy as np
+from config import FOV, NEAR_PLANE, FAR_PLANE, PLAYER_EYE_HEIGHT
+
+
+def _rotation(angle_deg, axis):
+    """Matriz 4x4 equivalente a glRotatef(angle, eixo cardinal)"""
+    c = math.cos(math.radians(angle_deg))
+    s = math.sin(math.radians(angle_deg))
+    m = np.identity(4)
+    if axis == 0:
+        m[1, 1], m[1, 2], m[2, 1], m[2, 2] = c, -s, s, c
+    else:
+        m[0, 0], m[0, 2], m[2, 0], m[2, 2] = c, s, -s, c
+    return m
+
+
+def _perspective(fov, aspect, near, far):
+    """Matriz 4x4 equivalente a gluPerspective"""
+    f = 1.0 / math.tan(math.radians(fov) / 2.0)
+    m = np.zeros((4, 4))
+    m[0, 0] = f / aspect
+    m[1, 1] = f
+    m[2, 2] = (far + near) / (near - far)
+    m[2, 3] = 2.0 * far * near / (near - far)
+    m[3, 2] = -1.0
+    return m
+
+
+class Frustum:
+    """Volume visível da câmera como 6 planos (a, b, c, d)"""
+    
+    def __init__(self, planes):
+        """
+        Args:
+            planes: Array (6, 4); ponto p é visível se a*x + b*y + c*z + d >= 0
+                    para todos os planos
+        """
+        self.planes = planes
+        self.normals = planes[:, :3]
+        self.offsets = planes[:, 3]
+        self._positive = self.normals >= 0
+    
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Extrai os planos de uma matriz projeção * view.
+        
+        Args:
+            matrix: Array 4x4 (convenção de vetor coluna)
+        
+        Returns:
+            Frustum
+        """
+        rows = np.asarray(matrix, dtype=np.float64)
+        planes = np.array([
+            rows[3] + rows[0],  # Esquerda
+            rows[3] - rows[0],  # Direita
+            rows[3] + rows[1],  # Baixo
+            rows[3] - rows[1],  # Cima
+            rows[3] + rows[2],  # Near
+            rows[3] - rows[2],  # Far
+        ])
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+        return cls(planes)
+    
+    @classmethod
+    def from_camera(cls, x, z, pitch, yaw, aspect,
+                    fov=FOV, near=NEAR_PLANE, far=FAR_PLANE, eye_height=PLAYER_EYE_HEIGHT):
+        """
+        Frustum da câmera em primeira pessoa (mesmas transformações de
+        Renderer.setup_camera e Renderer.set_perspective).
+        
+        Args:
+            x, z: Posição da câmera no plano
+            pitch, yaw: Rotação da câmera (graus)
+            aspect: Largura / altura da janela
+        
+        Returns:
+            Frustum
+        """
+        translation = np.identity(4)
+        translation[0, 3] = -x
+        translation[1, 3] = -eye_height
+        translation[2, 3] = -z
+        
+        view = _rotation(pitch, 0) @ _rotation(yaw, 1) @ translation
+        return cls.from_matrix(_perspective(fov, aspect, near, far) @ view)
+    
+    def intersects_aabb(self, low, high):
+        """
+        Verifica se uma caixa alinhada aos eixos pode estar visível.
+        
+        Args:
+            low: Canto mínimo (x, y, z)
+            high: Canto máximo (x, y, z)
+        
+        Returns:
+            bool: False apenas se a caixa está fora de algum plano
+        """
+        # Vértice da caixa mais à frente na direção de cada normal
+        positive = np.where(self._positive, high, low)
+        distances = np.einsum('ij,ij->i', self.normals, positive) + self.offsets
+        return bool((distances >= 0).all())
+    
+    def intersects_sphere(self, center, radius):
+        """
+        Verifica se uma esfera pode estar visível.
+        
+        Args:
+            center: Centro (x, y, z)
+            radius: Raio
+        
+        Returns:
+            bool: False apenas se a esfera está fora de algum plano
+        """
+        distances = self.normals @ np.asarray(center, dtype=np.float64) + self.offsets
+        return bool((distances >= -radius).all())
+    
+    def visible_aabbs(self, lows, highs):
+        """
+        Versão vetorizada de intersects_aabb para várias caixas.
+        
+        Args:
+            lows: Array (N, 3) de cantos mínimos
+            highs: Array (N, 3) de cantos máximos
+        
+        Returns:
+            np.ndarray: Array (N,) de bool
+        """
+        positive = np.where(self._positive[None, :, :], highs[:, None, :], lows[:, None, :])
+        distances = np.einsum('pj,npj->np', self.normals, positive) + self.offsets
+        return (distances >= 0).all(axis=1)
+    
+    def visible_spheres(self, centers, radius):
+        """
+        Versão vetorizada de intersects_sphere para várias esferas.
+        
+        Args:
+            centers: Array (N, 3) de centros
+            radius: Raio comum
+        
+        Returns:
+            np.ndarray: Array (N,) de bool
+        """
+        distances = np.asarray(centers, dtype=np.float64) @ self.normals.T + self.offsets
+        return (distances >= -radius).all(axis=1)
@@ -0,0 +1,300 @@
+"""
+graphics/grass.py
+=================
+Campo de grama do nível em chunks de um VBO, com LOD por distância.
+
+POR QUE:
+-------
+A grama era uma Display List fixa de GRASS_AREA x GRASS_AREA centrada na
+origem, gerada com random.uniform e push/translate/rotate/pop por folha:
+não acompanhava o nível (que chega a 31 x 31 células) e era desenhada
+inteira mesmo fora da tela.
+
+GERAÇÃO:
+-------
+- A grama cobre o retângulo das paredes do nível, menos as células de
+  parede (folhas dentro de paredes nunca aparecem)
+- Cada chunk de CHUNK_SIZE x CHUNK_SIZE células (os mesmos da malha das
+  paredes e do occlusion culling) é gerado com numpy, vetorizado, com
+  semente própria: o mesmo nível sempre tem a mesma grama
+- Folha = quad vertical de frente e de costas (o back-face culling fica
+  ligado), cor por vértice
+
+DESENHO:
+-------
+- Chunks fora do frustum ou do conjunto visível do grid são pulados
+- As folhas de cada chunk estão em ordem aleatória, então os primeiros
+  N vértices são uma amostra uniforme do chunk: o LOD desenha só um
+  prefixo do intervalo, com a fração de GRASS_LOD para a distância até a
+  câmera (chunks além da última distância não são desenhados)
+- Todos os intervalos vão em uma única configuração de ponteiros
+"""
+
+import math
+import numpy as np
+from OpenGL.GL import *
+from config import (CHUNK_SIZE, GRASS_DENSITY, GRASS_MIN_HEIGHT, GRASS_MAX_HEIGHT,
+                    GRASS_BLADE_WIDTH, GRASS_LOD)
+from .buffers import VertexBuffer
+from .state import GLState
+
+
+# Semente base da grama (combinada com a posição do chunk)
+GRASS_SEED = 42
+
+# Altura do chão onde as folhas nascem
+GROUND_Y = -1.0
+
+# Vértices por folha (quad de frente + quad de costas)
+VERTICES_PER_BLADE = 8
+
+# Layout: posição + cor (a grama é desenhada sem iluminação)
+GRASS_LAYOUT = (('vertex', 3), ('color', 3))
+
+
+def build_blade_vertices(x, z, angle, height, color_var):
+    """
+    Vértices de N folhas de grama.
+    
+    Args:
+        x, z: Arrays (N,) com a base das folhas
+        angle: Rotação de cada folha em torno de Y (radianos)
+        height: Altura de cada folha
+        color_var: Variação de cor de cada folha (-0.3 a 0.3)
+    
+    Returns:
+        np.ndarray: Array (8 * N, 6) float32: x, y, z, r, g, b
+    """
+    n = len(x)
+    
+    # Eixo X local rotacionado (mesmo efeito de glRotatef(angle, 0, 1, 0))
+    dx = np.cos(angle) * GRASS_BLADE_WIDTH
+    dz = -np.sin(angle) * GRASS_BLADE_WIDTH
+    top = GROUND_Y + height
+    bottom = np.full(n, GROUND_Y)
+    
+    left_bottom = np.column_stack((x - dx, bottom, z - dz))
+    right_bottom = np.column_stack((x + dx, bottom, z + dz))
+    right_top = np.column_stack((x + dx, top, z + dz))
+    left_top = np.column_stack((x - dx, top, z - dz))
+    
+    # Frente e costas (ordem invertida) de cada folha
+    corners = np.stack((
+        left_bottom, right_bottom, right_top, left_top,
+        left_bottom, left_top, right_top, right_bottom,
+    ), axis=1)
+    
+    colors = np.column_stack((
+        0.1 + color_var * 0.1,
+        0.6 + color_var * 0.3,
+        0.1 + color_var * 0.05,
+    ))
+    colors = np.repeat(colors[:, None, :], VERTICES_PER_BLADE, axis=1)
+    
+    return np.concatenate((corners, colors), axis=2).reshape(-1, 6).astype(np.float32)
+
+
+def build_chunk_blades(chunk, bounds, wall_grid, chunk_size=CHUNK_SIZE):
+    """
+    Gera as folhas de um chunk, em ordem aleatória.
+    
+    Args:
+        chunk: Chave (cx, cz) do chunk
+        bounds: (x mínimo, x máximo, z mínimo, z máximo) em células
+        wall_grid: Array bool [x - x mínimo, z - z mínimo], True = parede
+        chunk_size: Lado do chunk em células
+    
+    Returns:
+        np.ndarray: Array (8 * folhas, 6) com os vértices
+    """
+    cx, cz = chunk
+    x0 = max(cx * chunk_size, bounds[0])
+    x1 = min(cx * chunk_size + chunk_size - 1, bounds[1])
+    z0 = max(cz * chunk_size, bounds[2])
+    z1 = min(cz * chunk_size + chunk_size - 1, bounds[3])
+    
+    rng = np.random.default_rng((GRASS_SEED, cx & 0xffff, cz & 0xffff))
+    count = int(round((x1 - x0 + 1) * (z1 - z0 + 1) * GRASS_DENSITY))
+    x = rng.uniform(x0 - 0.5, x1 + 0.5, count)
+    z = rng.uniform(z0 - 0.5, z1 + 0.5, count)
+    angle = rng.uniform(0.0, 2.0 * math.pi, count)
+    height = rng.uniform(GRASS_MIN_HEIGHT, GRASS_MAX_HEIGHT, count)
+    color_var = rng.uniform(-0.3, 0.3, count)
+    
+    # Descarta folhas em células de parede
+    cells_x = np.clip(np.floor(x + 0.5).astype(int), x0, x1) - bounds[0]
+    cells_z = np.clip(np.floor(z + 0.5).astype(int), z0, z1) - bounds[2]
+    keep = ~wall_grid[cells_x, cells_z]
+    
+    return build_blade_vertices(x[keep], z[keep], angle[keep], height[keep], color_var[keep])
+
+
+class GrassField:
+    """Grama do nível em chunks, reconstruída só quando o nível muda"""
+    
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        """
+        Inicializa o campo vazio.
+        
+        Args:
+            chunk_size: Lado dos chunks (mesmo da malha e do occlusion culling)
+        """
+        self.chunk_size = chunk_size
+        self.buffer = None
+        self.key = None  # (id do Level, static_version)
+        self.bounds = None  # (x mínimo, x máximo, z mínimo, z máximo) em células
+        
+        # Chunks: chave, intervalo no buffer, retângulo (xz) e AABB
+        self.chunk_keys = []
+        self.chunk_ranges = []
+        self.chunk_rects = np.zeros((0, 4))
+        self.chunk_lows = np.zeros((0, 3))
+        self.chunk_highs = np.zeros((0, 3))
+        
+        # Contadores do último frame (profiling)
+        self.drawn_chunks = 0
+        self.drawn_blades = 0
+    
+    def sync(self, level):
+        """
+        Garante que a grama corresponde ao nível atual.
+        
+        Args:
+            level: Objeto Level
+        """
+        key = (id(level), level.static_version)
+        if key == self.key:
+            return
+        
+        self.release()
+        self.key = key
+        if not level.walls:
+            return
+        
+        cells = np.array([(x, z) for x, _, z in level.walls], dtype=int)
+        bounds = (int(cells[:, 0].min()), int(cells[:, 0].max()),
+                  int(cells[:, 1].min()), int(cells[:, 1].max()))
+        wall_grid = np.zeros((bounds[1] - bounds[0] + 1, bounds[3] - bounds[2] + 1), dtype=bool)
+        wall_grid[cells[:, 0] - bounds[0], cells[:, 1] - bounds[2]] = True
+        self.bounds = bounds
+        size = self.chunk_size
+        
+        blocks = []
+        rects = []
+        first = 0
+        for cx in range(bounds[0] // size, bounds[1] // size + 1):
+            for cz in range(bounds[2] // size, bounds[3] // size + 1):
+                data = build_chunk_blades((cx, cz), bounds, wall_grid, size)
+                if not len(data):
+                    continue
+                blocks.append(data)
+                self.chunk_keys.append((cx, cz))
+                self.chunk_ranges.append((first, len(data)))
+                rects.append((data[:, 0].min(), data[:, 2].min(),
+                              data[:, 0].max(), data[:, 2].max()))
+                first += len(data)
+        
+        if not blocks:
+            return
+        
+        self.buffer = VertexBuffer(np.concatenate(blocks), layout=GRASS_LAYOUT)
+        self.chunk_rects = np.array(rects, dtype=np.float64)
+        self.chunk_lows = np.column_stack((
+            self.chunk_rects[:, 0], np.full(len(rects), GROUND_Y), self.chunk_rects[:, 1]))
+        self.chunk_highs = np.column_stack((
+            self.chunk_rects[:, 2], np.full(len(rects), GROUND_Y + GRASS_MAX_HEIGHT),
+            self.chunk_rects[:, 3]))
+    
+    def lod_fractions(self, camera_pos):
+        """
+        Fração das folhas de cada chunk a desenhar, pela distância (no
+        plano xz) da câmera ao ponto mais próximo do chunk.
+        
+        Args:
+            camera_pos: Posição (x, y, z) da câmera
+        
+        Returns:
+            np.ndarray: Frações (0 = chunk não é desenhado)
+        """
+        x, _, z = camera_pos
+        rects = self.chunk_rects
+        dx = np.maximum(np.maximum(rects[:, 0] - x, x - rects[:, 2]), 0.0)
+        dz = np.maximum(np.maximum(rects[:, 1] - z, z - rects[:, 3]), 0.0)
+        distance = np.hypot(dx, dz)
+        
+        fractions = np.zeros(len(rects))
+        for max_distance, fraction in reversed(GRASS_LOD):
+            fractions[distance <= max_distance] = fraction
+        return fractions
+    
+    def visible_ranges(self, camera_pos, frustum=None, visible_chunks=None):
+        """
+        Intervalos (prefixos com LOD) dos chunks a desenhar.
+        
+        Args:
+            camera_pos: Posição (x, y, z) da câmera
+            frustum: Frustum da câmera (None = sem frustum culling)
+            visible_chunks: Chunks (cx, cz) potencialmente visíveis
+                            (None = sem occlusion culling)
+        
+        Returns:
+            list: (primeiro vértice, número de vértices)
+        """
+        if not self.chunk_ranges:
+            self.drawn_chunks = self.drawn_blades = 0
+            return []
+        
+        fractions = self.lod_fractions(camera_pos)
+        if frustum is None:
+            in_frustum = [True] * len(self.chunk_ranges)
+        else:
+            in_frustum = frustum.visible_aabbs(self.chunk_lows, self.chunk_highs)
+        
+        ranges = []
+        for key, (first, count), fraction, inside in zip(
+                self.chunk_keys, self.chunk_ranges, fractions, in_frustum):
+            if not inside or fraction <= 0.0:
+                continue
+            if visible_chunks is not None and key not in visible_chunks:
+                continue
+            blades = int(count // VERTICES_PER_BLADE * fraction)
+            if blades:
+                ranges.append((first, blades * VERTICES_PER_BLADE))
+        
+        self.drawn_chunks = len(ranges)
+        self.drawn_blades = sum(count for _, count in ranges) // VERTICES_PER_BLADE
+        return ranges
+    
+    def draw(self, camera_pos, frustum=None, visible_chunks=None):
+        """
+        Desenha a grama dos chunks visíveis.
+        
+        Args:
+            camera_pos: Posição (x, y, z) da câmera
+            frustum: Frustum da câmera (None = sem frustum culling)
+            visible_chunks: Chunks potencialmente visíveis (None = todos)
+        """
+        if self.buffer is None:
+            return
+        
+        ranges = self.visible_ranges(camera_pos, frustum, visible_chunks)
+        if not ranges:
+            return
+        
+        GLState.disable(GL_LIGHTING)
+        self.buffer.draw_ranges(ranges)
+    
+    def release(self):
+        """Libera o buffer da GPU"""
+        if self.buffer is not None:
+            self.buffer.delete()
+            self.buffer = None
+        self.key = None
+        self.bounds = None
+        self.chunk_keys = []
+        self.chunk_ranges = []
+        self.chunk_rects = np.zeros((0, 4))
+        self.chunk_lows = np.zeros((0, 3))
+        self.chunk_highs = np.zeros((0, 3))
+        self.drawn_chunks = 0
+        self.drawn_blades = 0
@@ -0,0 +1,340 @@
+"""
+graphics/level_mesh.py
+======================
+Malha estática das paredes do nível em um único VBO.
+
+POR QUE:
+-------
+Paredes nunca se movem. Desenhá-las uma a uma em modo imediato custa,
+por parede e por frame, 4 chamadas de material + push/translate/scale/pop
++ 24 glVertex. A malha é montada uma vez por nível (numpy, vetorizado)
+e desenhada com uma chamada.
+
+MATERIAL:
+--------
+- A variação procedural do concreto (Materials.wall_variation) vira cor
+  por vértice, aplicada no difuso via GL_COLOR_MATERIAL; é avaliada nos
+  vértices de cada face, no ramo afim do centro da face
+- Ambiente, especular e brilho vêm de Materials.apply_wall_material()
+  (a variação deles no modo imediato era < 0.5% e foi descartada)
+- Normais do topo/base têm comprimento 0.5: a mesma iluminação que as
+  paredes tinham em modo imediato (cubo com glScalef(1, 2, 1), sem
+  GL_NORMALIZE)
+
+FACES OCULTAS E GREEDY MESHING:
+------------------------------
+- Faces entre paredes vizinhas e a base (sob o chão) não são geradas
+- Faces coplanares contíguas são fundidas em retângulos maiores, desde
+  que estejam no mesmo ramo afim da cor (a interpolação de Gouraud de
+  uma função afim é exata, então a cor não muda ao fundir)
+
+CHUNKS E CULLING:
+----------------
+- As paredes são divididas em chunks de CHUNK_SIZE x CHUNK_SIZE células;
+  cada chunk ocupa um intervalo contíguo do VBO e tem uma AABB
+- draw(frustum) testa as AABBs contra o frustum da câmera e desenha só
+  os intervalos visíveis (intervalos vizinhos viram um glDrawArrays)
+- draw(frustum, visible_chunks) também pula chunks fora do conjunto
+  potencialmente visível do grid (graphics/occlusion.py)
+- drawn_chunks/culled_chunks/occluded_chunks guardam os números do
+  último frame
+
+CICLO DE VIDA:
+-------------
+sync(level) reconstrói a malha quando o nível muda (Level.static_version)
+e libera o buffer anterior; release() libera tudo (Renderer.cleanup).
+"""
+
+import numpy as np
+from OpenGL.GL import *
+from config import CHUNK_SIZE
+from .buffers import VertexBuffer
+from .materials import Materials
+from .state import GLState
+
+
+# Faces do cubo da parede: (eixo da normal, sinal, normal, cantos)
+# Cantos na mesma ordem de Primitives.draw_unit_cube (-1 = mínimo, 1 = máximo)
+# A base (y = -1) fica sob o chão e nunca é gerada
+_WALL_FACES = (
+    (2, 1, (0, 0, 1), ((-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1))),          # Frente
+    (2, -1, (0, 0, -1), ((-1, -1, -1), (-1, 1, -1), (1, 1, -1), (1, -1, -1))),    # Trás
+    (0, -1, (-1, 0, 0), ((-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1))),    # Esquerda
+    (0, 1, (1, 0, 0), ((1, -1, -1), (1, 1, -1), (1, 1, 1), (1, -1, 1))),          # Direita
+    (1, 1, (0, 0.5, 0), ((-1, 1, -1), (-1, 1, 1), (1, 1, 1), (1, 1, -1))),        # Topo
+)
+
+# Meia-extensão da parede (1 x 2 x 1, centrada na posição)
+WALL_HALF_EXTENTS = (0.5, 1.0, 0.5)
+
+# Eixo da normal -> eixos (u, v) do plano da face usados no greedy meshing
+_PLANE_AXES = {0: (1, 2), 1: (0, 2), 2: (1, 0)}
+
+
+def _color_branch(x, z):
+    """
+    Ramo afim da variação procedural que contém o ponto (x, z).
+    
+    wall_variation = (|x| + |z|) * 0.1 mod 0.3 - 0.15 é afim dentro de
+    cada quadrante e entre duas "dobras" do módulo. Faces do mesmo ramo
+    podem ser fundidas sem mudar a cor interpolada.
+    
+    Returns:
+        tuple: (sinal de x, sinal de z, número de dobras do módulo)
+    """
+    raw = abs(x * 0.1) + abs(z * 0.1)
+    folds = int(round((raw - Materials.wall_variation(x, z) - 0.15) / 0.3))
+    return (1 if x >= 0 else -1, 1 if z >= 0 else -1, folds)
+
+
+def _branch_color(branch, x, z):
+    """Cor difusa (r, g, b) do ramo afim avaliado em (x, z)"""
+    sign_x, sign_z, folds = branch
+    variation = (sign_x * x + sign_z * z) * 0.1 - 0.3 * folds - 0.15
+    base = 0.6 + variation * 0.1
+    return (base, base, base + variation * 0.02)
+
+
+def _greedy_rectangles(cells):
+    """
+    Funde células de um plano em retângulos (greedy meshing).
+    
+    Args:
+        cells: Dict (u, v) -> chave; só células de mesma chave se fundem
+    
+    Returns:
+        list: Retângulos (u0, v0, u1, v1, chave), extremos inclusivos
+    """
+    remaining = dict(cells)
+    rectangles = []
+    
+    for (u0, v0) in sorted(cells, key=lambda c: (c[1], c[0])):
+        key = remaining.pop((u0, v0), None)
+        if key is None:
+            continue
+        
+        # Cresce na direção u
+        u1 = u0
+        while remaining.get((u1 + 1, v0)) == key:
+            u1 += 1
+            del remaining[(u1, v0)]
+        
+        # Cresce na direção v enquanto a linha inteira estiver disponível
+        v1 = v0
+        while all(remaining.get((u, v1 + 1)) == key for u in range(u0, u1 + 1)):
+            v1 += 1
+            for u in range(u0, u1 + 1):
+                del remaining[(u, v1)]
+        
+        rectangles.append((u0, v0, u1, v1, key))
+    
+    return rectangles
+
+
+def build_wall_vertices(walls, solid=None):
+    """
+    Monta os vértices intercalados das paredes com faces ocultas
+    removidas e faces coplanares fundidas.
+    
+    - Faces laterais entre duas paredes vizinhas são descartadas
+    - A base (encostada no chão) é descartada
+    - Faces visíveis coplanares e contíguas viram um único quad
+      (limitado ao mesmo ramo afim da cor procedural)
+    
+    Args:
+        walls: Lista de posições (x, y, z) das paredes a montar
+        solid: Conjunto de todas as paredes do nível, usado no teste de
+               vizinhança (padrão: as próprias `walls`)
+    
+    Returns:
+        np.ndarray: Array (vértices, 9) com posição, normal e cor
+    """
+    wall_set = set(solid) if solid is not None else set(walls)
+    quads = []
+    
+    for axis, sign, normal, corners in _WALL_FACES:
+        u_axis, v_axis = _PLANE_AXES[axis]
+        
+        planes = {}
+        for wall in set(walls):
+            neighbor = list(wall)
+            neighbor[axis] += sign
+            if tuple(neighbor) in wall_set:
+                continue  # Face encostada em outra parede
+            
+            # Centro da face define o ramo de cor
+            center = [float(c) for c in wall]
+            center[axis] += sign * WALL_HALF_EXTENTS[axis]
+            branch = _color_branch(center[0], center[2])
+            
+            plane = planes.setdefault(wall[axis], {})
+            plane[(wall[u_axis], wall[v_axis])] = branch
+        
+        for plane_coord, cells in planes.items():
+            for u0, v0, u1, v1, branch in _greedy_rectangles(cells):
+                low = [0.0, 0.0, 0.0]
+                high = [0.0, 0.0, 0.0]
+                low[axis] = high[axis] = plane_coord + sign * WALL_HALF_EXTENTS[axis]
+                low[u_axis] = u0 - WALL_HALF_EXTENTS[u_axis]
+                high[u_axis] = u1 + WALL_HALF_EXTENTS[u_axis]
+                low[v_axis] = v0 - WALL_HALF_EXTENTS[v_axis]
+                high[v_axis] = v1 + WALL_HALF_EXTENTS[v_axis]
+                
+                for corner in corners:
+                    vertex = [high[a] if corner[a] > 0 else low[a] for a in (0, 1, 2)]
+                    quads.append(vertex + list(normal) +
+                                 list(_branch_color(branch, vertex[0], vertex[2])))
+    
+    if not quads:
+        return np.zeros((0, 9), dtype=np.float32)
+    return np.array(quads, dtype=np.float32)
+
+
+def split_into_chunks(walls, chunk_size=CHUNK_SIZE):
+    """
+    Agrupa paredes em chunks quadrados do grid.
+    
+    Args:
+        walls: Lista de posições (x, y, z)
+        chunk_size: Lado do chunk em células
+    
+    Returns:
+        dict: (cx, cz) -> lista de paredes, em ordem de chunk
+    """
+    chunks = {}
+    for wall in walls:
+        key = (wall[0] // chunk_size, wall[2] // chunk_size)
+        chunks.setdefault(key, []).append(wall)
+    return dict(sorted(chunks.items()))
+
+
+class StaticLevelMesh:
+    """Malha das paredes de um nível, reconstruída só quando o nível muda"""
+    
+    def __init__(self):
+        """Inicializa malha vazia"""
+        self.buffer = None
+        self.key = None  # (id do Level, static_version)
+        
+        # Chunks: intervalo no buffer + AABB
+        self.chunk_keys = []
+        self.chunk_ranges = []
+        self.chunk_lows = np.zeros((0, 3))
+        self.chunk_highs = np.zeros((0, 3))
+        
+        # Contadores do último frame (profiling)
+        self.drawn_chunks = 0
+        self.culled_chunks = 0
+        self.occluded_chunks = 0
+    
+    def sync(self, level):
+        """
+        Garante que a malha corresponde ao nível atual.
+        
+        Args:
+            level: Objeto Level
+        """
+        key = (id(level), level.static_version)
+        if key == self.key:
+            return
+        
+        self.release()
+        
+        blocks = []
+        lows = []
+        highs = []
+        first = 0
+        
+        for chunk_key, chunk_walls in split_into_chunks(level.walls).items():
+            data = build_wall_vertices(chunk_walls, level.wall_set)
+            if not len(data):
+                continue
+            blocks.append(data)
+            self.chunk_keys.append(chunk_key)
+            self.chunk_ranges.append((first, len(data)))
+            lows.append(data[:, 0:3].min(axis=0))
+            highs.append(data[:, 0:3].max(axis=0))
+            first += len(data)
+        
+        data = np.concatenate(blocks) if blocks else np.zeros((0, 9), dtype=np.float32)
+        self.buffer = VertexBuffer(data)
+        self.chunk_lows = np.array(lows, dtype=np.float64).reshape(-1, 3)
+        self.chunk_highs = np.array(highs, dtype=np.float64).reshape(-1, 3)
+        self.key = key
+    
+    def visible_ranges(self, frustum=None, visible_chunks=None):
+        """
+        Intervalos do buffer dos chunks visíveis (vizinhos são unidos).
+        
+        Args:
+            frustum: Frustum da câmera (None = todos os chunks)
+            visible_chunks: Conjunto de chunks (cx, cz) potencialmente
+                            visíveis (None = sem occlusion culling)
+        
+        Returns:
+            list: (primeiro vértice, número de vértices)
+        """
+        if visible_chunks is None:
+            unoccluded = [True] * len(self.chunk_ranges)
+        else:
+            unoccluded = [key in visible_chunks for key in self.chunk_keys]
+        
+        if frustum is None or not self.chunk_ranges:
+            in_frustum = [True] * len(self.chunk_ranges)
+        else:
+            in_frustum = frustum.visible_aabbs(self.chunk_lows, self.chunk_highs)
+        
+        ranges = []
+        drawn = occluded = 0
+        for (first, count), open_, inside in zip(self.chunk_ranges, unoccluded, in_frustum):
+            if not open_:
+                occluded += 1
+                continue
+            if not inside:
+                continue
+            drawn += 1
+            if ranges and ranges[-1][0] + ranges[-1][1] == first:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + count)
+            else:
+                ranges.append((first, count))
+        
+        self.drawn_chunks = drawn
+        self.occluded_chunks = occluded
+        self.culled_chunks = len(self.chunk_ranges) - drawn - occluded
+        return ranges
+    
+    def draw(self, frustum=None, visible_chunks=None):
+        """
+        Desenha as paredes dos chunks visíveis.
+        
+        Args:
+            frustum: Frustum da câmera (None = desenha tudo)
+            visible_chunks: Chunks potencialmente visíveis (None = todos)
+        """
+        if self.buffer is None:
+            return
+        
+        ranges = self.visible_ranges(frustum, visible_chunks)
+        if not ranges:
+            return
+        
+        GLState.enable(GL_LIGHTING)
+        Materials.apply_wall_material()
+        glColorMaterial(GL_FRONT_AND_BACK, GL_DIFFUSE)
+        GLState.enable(GL_COLOR_MATERIAL)
+        self.buffer.draw_ranges(ranges)
+        GLState.disable(GL_COLOR_MATERIAL)
+        
+        # GL_COLOR_MATERIAL deixou o difuso com a cor do último vértice
+        GLState.invalidate_material()
+    
+    def release(self):
+        """Libera o buffer da GPU"""
+        if self.buffer is not None:
+            self.buffer.delete()
+            self.buffer = None
+        self.key = None
+        self.chunk_keys = []
+        self.chunk_ranges = []
+        self.chunk_lows = np.zeros((0, 3))
+        self.chunk_highs = np.zeros((0, 3))
@@ -3,14 +3,33 @@ graphics/materials.py
 =====================
 Definições de materiais e sistema de iluminação profissional.
 Implementa materiais PBR-like para paredes, chão, caixas e objetivos.
+
+Cada material tem uma chave registrada em GLState: reaplicar o material
+que já está ativo não emite nenhuma chamada OpenGL.
 """
 
 from OpenGL.GL import *
+from .state import GLState
 
 
 class Materials:
     """Gerenciador de materiais do jogo"""
     
+    @staticmethod
+    def wall_variation(x, z):
+        """
+        Variação procedural do concreto na posição (x, z).
+        Aceita floats ou arrays numpy (avaliação vetorizada).
+        
+        Args:
+            x: Posição X
+            z: Posição Z
+            
+        Returns:
+            Variação entre -0.15 e 0.15
+        """
+        return (abs(x * 0.1) + abs(z * 0.1)) % 0.3 - 0.15
+    
     @staticmethod
     def apply_wall_material_varied(x, z):
         """
@@ -21,7 +40,10 @@ class Materials:
             x (float): Posição X da parede
             z (float): Posição Z da parede
         """
-        variation = (abs(x * 0.1) + abs(z * 0.1)) % 0.3 - 0.15
+        if not GLState.use_material(('wall_varied', x, z)):
+            return
+        
+        variation = Materials.wall_variation(x, z)
         base_color = 0.6 + variation * 0.1
         
         # Cores com variação sutil
@@ -37,6 +59,9 @@ class Materials:
     @staticmethod
     def apply_wall_material():
         """Material padrão para paredes (concreto)"""
+        if not GLState.use_material('wall'):
+            return
+        
         glMaterialfv(GL_FRONT_AND_BACK, GL_AMBIENT, (0.15, 0.15, 0.16, 1.0))
         glMaterialfv(GL_FRONT_AND_BACK, GL_DIFFUSE, (0.6, 0.6, 0.62, 1.0))
         glMaterialfv(GL_FRONT_AND_BACK, GL_SPECULAR, (0.1, 0.1, 0.1, 1.0))
@@ -45,6 +70,9 @@ class Materials:
     @staticmethod
     def apply_floor_material():
         """Material para o chão (grama realista)"""
+        if not GLState.use_material('floor'):
+            return
+        
         glMaterialfv(GL_FRONT_AND_BACK, GL_AMBIENT, (0.1, 0.4, 0.1, 1.0))
         glMaterialfv(GL_FRONT_AND_BACK, GL_DIFFUSE, (0.2, 0.8, 0.2, 1.0))
         glMaterialfv(GL_FRONT_AND_BACK, GL_SPECULAR, (0.1, 0.3, 0.1, 1.0))
@@ -59,6 +87,9 @@ class Materials:
             color (tuple): Cor RGBA da caixa
             shininess (float): Brilho especular
         """
+        if not GLState.use_material(('box', tuple(color), shininess)):
+            return
+        
         # Ambient mais escuro para melhor contraste
         ambient = [c * 0.5 for c in color[:3]] + [1.0]
         
@@ -80,14 +111,14 @@ class Lighting:
         - Rim Light (Luz de Contorno): Adiciona profundidade
         """
         # Habilita iluminação
-        glEnable(GL_LIGHTING)
+        GLState.enable(GL_LIGHTING)
         
         # Configuração global de iluminação
         glLightModelfv(GL_LIGHT_MODEL_AMBIENT, (0.25, 0.25, 0.30, 1.0))
         glLightModeli(GL_LIGHT_MODEL_TWO_SIDE, GL_TRUE)
         
         # === LUZ PRINCIPAL (Sol) - LIGHT0 ===
-        glEnable(GL_LIGHT0)
+        GLState.enable(GL_LIGHT0)
         glLightfv(GL_LIGHT0, GL_POSITION, (15.0, 20.0, 10.0, 1.0))
         glLightfv(GL_LIGHT0, GL_AMBIENT, (0.2, 0.2, 0.22, 1.0))
         glLightfv(GL_LIGHT0, GL_DIFFUSE, (0.9, 0.9, 0.85, 1.0))  # Amarelo suave
@@ -99,14 +130,14 @@ class Lighting:
         glLightf(GL_LIGHT0, GL_QUADRATIC_ATTENUATION, 0.001)
         
         # === LUZ DE PREENCHIMENTO - LIGHT1 ===
-        glEnable(GL_LIGHT1)
+        GLState.enable(GL_LIGHT1)
         glLightfv(GL_LIGHT1, GL_POSITION, (-10.0, 12.0, -8.0, 1.0))
         glLightfv(GL_LIGHT1, GL_AMBIENT, (0.15, 0.15, 0.18, 1.0))
         glLightfv(GL_LIGHT1, GL_DIFFUSE, (0.4, 0.45, 0.55, 1.0))  # Azul suave
         glLightfv(GL_LIGHT1, GL_SPECULAR, (0.2, 0.2, 0.3, 1.0))
         
         # === LUZ DE CONTORNO - LIGHT2 ===
-        glEnable(GL_LIGHT2)
+        GLState.enable(GL_LIGHT2)
         glLightfv(GL_LIGHT2, GL_POSITION, (0.0, 8.0, -15.0, 1.0))
         glLightfv(GL_LIGHT2, GL_AMBIENT, (0.1, 0.1, 0.12, 1.0))
         glLightfv(GL_LIGHT2, GL_DIFFUSE, (0.3, 0.35, 0.4, 1.0))
@@ -0,0 +1,174 @@
+"""
+graphics/occlusion.py
+=====================
+Occlusion culling no grid de paredes (labirintos).
+
+POR QUE FUNCIONA EM 2D:
+----------------------
+Paredes têm 2 unidades de altura (y de -1 a 1) e o olho do jogador fica
+em PLAYER_EYE_HEIGHT (0.8): nada atrás de uma parede é visível por cima
+dela. Caixas (topo em y = 0) não bloqueiam a visão. A visibilidade se
+reduz então a um problema 2D sobre o grid de paredes.
+
+ALGORITMO:
+---------
+- Shadowcasting recursivo (8 octantes) a partir do centro da célula do
+  jogador e das células livres vizinhas (o jogador pode estar em qualquer
+  ponto da célula)
+- O conjunto visível é dilatado em 1 célula para cobrir raios rasantes
+- Resultado conservador: pode incluir células ocultas, nunca exclui
+  células visíveis
+
+CACHE:
+-----
+O conjunto visível (células e chunks) é calculado só quando o jogador
+muda de célula e fica em cache por célula até o nível mudar
+(Level.static_version).
+"""
+
+from config import CHUNK_SIZE
+
+
+# Transformações dos 8 octantes (xx, xy, yx, yy)
+_OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+# Vizinhança de 8 células (inclui a própria)
+_NEIGHBORHOOD = tuple((dx, dz) for dx in (-1, 0, 1) for dz in (-1, 0, 1))
+
+
+class GridOcclusion:
+    """Conjuntos potencialmente visíveis por célula do jogador"""
+    
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        """
+        Inicializa sem nível.
+        
+        Args:
+            chunk_size: Lado dos chunks (mesmo da malha estática)
+        """
+        self.chunk_size = chunk_size
+        self.key = None
+        self.walls = set()
+        self.radius = 0
+        self._cache = {}  # (x, z) -> (células visíveis, chunks visíveis)
+    
+    def sync(self, level):
+        """
+        Descarta o cache se o nível mudou.
+        
+        Args:
+            level: Objeto Level
+        """
+        key = (id(level), level.static_version)
+        if key == self.key:
+            return
+        
+        self.key = key
+        self.walls = {(x, z) for x, _, z in level.wall_set}
+        self._cache = {}
+        
+        # Raio suficiente para cruzar todo o nível
+        if self.walls:
+            xs = [x for x, _ in self.walls]
+            zs = [z for _, z in self.walls]
+            self.radius = max(max(xs) - min(xs), max(zs) - min(zs)) + 2
+        else:
+            self.radius = 0
+    
+    def visible(self, cell):
+        """
+        Células e chunks potencialmente visíveis a partir de uma célula.
+        
+        Args:
+            cell: Célula do jogador (x, z)
+        
+        Returns:
+            tuple: (frozenset de células (x, z), frozenset de chunks (cx, cz)),
+                   ou (None, None) se o nível não tem paredes (nada oculta)
+        """
+        if not self.walls:
+            return None, None
+        
+        result = self._cache.get(cell)
+        if result is None:
+            cells = self._compute_cells(cell)
+            chunks = frozenset(
+                (x // self.chunk_size, z // self.chunk_size) for x, z in cells
+            )
+            result = (cells, chunks)
+            self._cache[cell] = result
+        return result
+    
+    def _compute_cells(self, cell):
+        """Shadowcasting a partir da célula e vizinhas livres + dilatação"""
+        lit = set()
+        cx, cz = cell
+        for dx, dz in _NEIGHBORHOOD:
+            origin = (cx + dx, cz + dz)
+            if origin in self.walls and origin != cell:
+                continue
+            lit.add(origin)
+            for octant in _OCTANTS:
+                self._cast_light(origin, 1, 1.0, 0.0, octant, lit)
+        
+        # Dilatação: cobre raios rasantes de pontos fora do centro
+        dilated = set(lit)
+        for x, z in lit:
+            for dx, dz in _NEIGHBORHOOD:
+                dilated.add((x + dx, z + dz))
+        return frozenset(dilated)
+    
+    def _cast_light(self, origin, row, start, end, octant, lit):
+        """
+        Ilumina um octante a partir de `row` entre as inclinações start/end.
+        
+        Args:
+            origin: Célula de origem (x, z)
+            row: Distância da linha atual
+            start, end: Inclinações que limitam a luz (start > end)
+            octant: Transformação (xx, xy, yx, yy) do octante
+            lit: Conjunto que acumula as células visíveis
+        """
+        if start < end:
+            return
+        
+        ox, oz = origin
+        xx, xy, yx, yy = octant
+        walls = self.walls
+        new_start = start
+        
+        for j in range(row, self.radius + 1):
+            dx = -j - 1
+            dy = -j
+            blocked = False
+            
+            while dx <= 0:
+                dx += 1
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+                
+                current = (ox + dx * xx + dy * xy, oz + dx * yx + dy * yy)
+                lit.add(current)
+                is_wall = current in walls
+                
+                if blocked:
+                    if is_wall:
+                        new_start = right_slope
+                        continue
+                    blocked = False
+                    start = new_start
+                elif is_wall and j < self.radius:
+                    # Início de uma sombra: continua o feixe acima dela
+                    blocked = True
+                    self._cast_light(origin, j + 1, start, left_slope, octant, lit)
+                    new_start = right_slope
+            
+            if blocked:
+                break
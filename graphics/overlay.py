@@ -0,0 +1,264 @@
+"""
+graphics/overlay.py
+===================
+Camada 2D (HUD, menus, crosshair) desenhada em uma passada por frame.
+
+POR QUE:
+-------
+Cada tela da UI (e cada string de draw_text) empilhava projeção e
+modelview, chamava gluOrtho2D e ligava/desligava iluminação e depth test
+por elemento: dezenas de idas e voltas na pilha de matrizes por frame.
+As telas também usavam WINDOW_WIDTH/WINDOW_HEIGHT fixos e ficavam
+erradas depois de um VIDEORESIZE.
+
+FILA:
+----
+Durante o frame, a UI só enfileira comandos:
+- rect(): retângulo de cor sólida ou gradiente vertical
+- points(): pontos coloridos (ex.: estrelas)
+- text(): string do atlas de glifos (graphics/text.py)
+- image(): retângulo texturizado (ex.: HUD em cache num RenderTarget)
+
+flush() configura a projeção ortográfica uma vez, com o tamanho atual
+da janela (resize, chamado por Renderer.set_perspective), desenha os
+comandos na ordem em que foram enfileirados e volta ao estado da cena
+3D. Retângulos, pontos e imagens de todos os comandos vão para buffers
+enviados uma vez por frame; comandos seguidos do mesmo tipo viram uma
+única chamada de desenho.
+"""
+
+import numpy as np
+from OpenGL.GL import *
+from config import WINDOW_WIDTH, WINDOW_HEIGHT
+from .buffers import VertexBuffer
+from .text import Text
+from .state import GLState
+
+
+# Layout dos vértices 2D: x, y, r, g, b, a
+OVERLAY_LAYOUT = (('vertex', 2), ('color', 4))
+
+# Layout das imagens: x, y, u, v, r, g, b, a
+IMAGE_LAYOUT = (('vertex', 2), ('texcoord', 2), ('color', 4))
+
+# Blend padrão (alpha comum)
+ALPHA_BLEND = (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+
+def _rgba(color):
+    """Cor RGB ou RGBA como tupla RGBA"""
+    return tuple(color) + (1.0,) * (4 - len(color))
+
+
+class Overlay:
+    """Fila de desenho 2D com uma projeção ortográfica por frame"""
+    
+    # Tamanho atual da janela (pixels)
+    width = WINDOW_WIDTH
+    height = WINDOW_HEIGHT
+    
+    # Comandos do frame: ('rects', início, fim), ('points', início, fim, tamanho),
+    # ('images', início, fim, textura, blend) ou ('text', x, y, texto, tamanho)
+    _commands = []
+    _rect_vertices = []
+    _point_arrays = []      # Arrays (N, 6) de points(), juntados no flush
+    _point_count = 0
+    _image_vertices = []
+    
+    # Buffers dinâmicos reaproveitados entre frames
+    _rect_buffer = None
+    _point_buffer = None
+    _image_buffer = None
+    
+    @staticmethod
+    def resize(width, height):
+        """
+        Atualiza o tamanho da tela usado pela projeção e pela UI.
+        
+        Args:
+            width, height: Dimensões da janela
+        """
+        Overlay.width = width
+        Overlay.height = height
+    
+    @staticmethod
+    def rect(x0, y0, x1, y1, color, top_color=None):
+        """
+        Enfileira um retângulo.
+        
+        Args:
+            x0, y0, x1, y1: Cantos em pixels (origem embaixo à esquerda)
+            color: Cor RGB ou RGBA (embaixo, se houver gradiente)
+            top_color: Cor da borda de cima (gradiente vertical) ou None
+        """
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        bottom = _rgba(color)
+        top = _rgba(top_color) if top_color is not None else bottom
+        
+        # Sempre anti-horário (GL_CULL_FACE fica ligado)
+        first = len(Overlay._rect_vertices)
+        Overlay._rect_vertices.extend((
+            (x0, y0) + bottom, (x1, y0) + bottom,
+            (x1, y1) + top, (x0, y1) + top,
+        ))
+        Overlay._extend('rects', first, len(Overlay._rect_vertices))
+    
+    @staticmethod
+    def points(positions, colors, size=1.0):
+        """
+        Enfileira pontos coloridos.
+        
+        Args:
+            positions: Array (N, 2) em pixels
+            colors: Array (N, 3) ou (N, 4)
+            size: Tamanho do ponto em pixels
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        colors = np.asarray(colors, dtype=np.float32).reshape(len(positions), -1)
+        if colors.shape[1] == 3:
+            colors = np.hstack((colors, np.ones((len(colors), 1), dtype=np.float32)))
+        
+        first = Overlay._point_count
+        Overlay._point_arrays.append(np.hstack((positions, colors)))
+        Overlay._point_count += len(positions)
+        Overlay._extend('points', first, Overlay._point_count, size)
+    
+    @staticmethod
+    def image(texture_id, x0, y0, x1, y1, uv=(0.0, 0.0, 1.0, 1.0), blend=ALPHA_BLEND):
+        """
+        Enfileira um retângulo texturizado.
+        
+        Args:
+            texture_id: Textura (GL_TEXTURE_2D)
+            x0, y0, x1, y1: Cantos em pixels
+            uv: (u0, v0, u1, v1) da região da textura
+            blend: Fatores para GLState.blend_func (ex.: PREMULTIPLIED_COMPOSITE
+                   para texturas de um RenderTarget) ou None para imagem
+                   opaca (sem blend)
+        """
+        u0, v0, u1, v1 = uv
+        white = (1.0, 1.0, 1.0, 1.0)
+        first = len(Overlay._image_vertices)
+        Overlay._image_vertices.extend((
+            (x0, y0, u0, v0) + white, (x1, y0, u1, v0) + white,
+            (x1, y1, u1, v1) + white, (x0, y1, u0, v1) + white,
+        ))
+        Overlay._extend('images', first, len(Overlay._image_vertices),
+                        texture_id, blend and tuple(blend))
+    
+    @staticmethod
+    def text(x, y, text, size=18):
+        """
+        Enfileira uma string com sombra.
+        
+        Args:
+            x, y: Posição da linha de base em pixels
+            text: String
+            size: Tamanho da fonte
+        """
+        Overlay._commands.append(('text', x, y, text, size))
+    
+    @staticmethod
+    def _extend(kind, first, end, *extra):
+        """Junta o intervalo ao comando anterior se for do mesmo tipo"""
+        commands = Overlay._commands
+        if commands and commands[-1][0] == kind and commands[-1][3:] == extra:
+            commands[-1] = (kind, commands[-1][1], end) + extra
+        else:
+            commands.append((kind, first, end) + extra)
+    
+    @staticmethod
+    def _upload(buffer, vertices, mode, layout=OVERLAY_LAYOUT):
+        """Envia os vértices do frame para o buffer dinâmico (criado sob demanda)"""
+        if not len(vertices):
+            return buffer
+        if buffer is None:
+            return VertexBuffer(vertices, layout=layout, mode=mode,
+                                usage=GL_DYNAMIC_DRAW)
+        buffer.upload(vertices)
+        return buffer
+    
+    @staticmethod
+    def flush():
+        """Desenha tudo que foi enfileirado no frame e esvazia a fila"""
+        commands = Overlay._commands
+        if not commands:
+            return
+        
+        Overlay._rect_buffer = Overlay._upload(
+            Overlay._rect_buffer, Overlay._rect_vertices, GL_QUADS)
+        Overlay._point_buffer = Overlay._upload(
+            Overlay._point_buffer,
+            np.concatenate(Overlay._point_arrays) if Overlay._point_arrays else [],
+            GL_POINTS)
+        Overlay._image_buffer = Overlay._upload(
+            Overlay._image_buffer, Overlay._image_vertices, GL_QUADS, IMAGE_LAYOUT)
+        
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, Overlay.width, 0, Overlay.height, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        
+        GLState.disable(GL_LIGHTING)
+        GLState.disable(GL_DEPTH_TEST)
+        GLState.enable(GL_BLEND)
+        
+        for command in commands:
+            kind = command[0]
+            if kind == 'text':
+                Text.draw(*command[1:])
+            elif kind == 'images':
+                if command[4] is None:
+                    GLState.disable(GL_BLEND)
+                else:
+                    GLState.enable(GL_BLEND)
+                    GLState.blend_func(*command[4])
+                GLState.enable(GL_TEXTURE_2D)
+                GLState.bind_texture(command[3])
+                Overlay._image_buffer.draw(command[1], command[2] - command[1])
+            elif kind == 'rects':
+                GLState.enable(GL_BLEND)
+                GLState.blend_func(*ALPHA_BLEND)
+                GLState.disable(GL_TEXTURE_2D)
+                Overlay._rect_buffer.draw(command[1], command[2] - command[1])
+            else:
+                GLState.enable(GL_BLEND)
+                GLState.blend_func(*ALPHA_BLEND)
+                GLState.disable(GL_TEXTURE_2D)
+                glPointSize(command[3])
+                Overlay._point_buffer.draw(command[1], command[2] - command[1])
+        
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        
+        # Volta ao estado da cena 3D
+        GLState.disable(GL_TEXTURE_2D)
+        GLState.disable(GL_BLEND)
+        GLState.enable(GL_DEPTH_TEST)
+        GLState.enable(GL_LIGHTING)
+        
+        Overlay._commands = []
+        Overlay._rect_vertices = []
+        Overlay._point_arrays = []
+        Overlay._point_count = 0
+        Overlay._image_vertices = []
+    
+    @staticmethod
+    def release():
+        """Libera os buffers da GPU (Renderer.cleanup)"""
+        for name in ('_rect_buffer', '_point_buffer', '_image_buffer'):
+            buffer = getattr(Overlay, name)
+            if buffer is not None:
+                buffer.delete()
+                setattr(Overlay, name, None)
+        Overlay._commands = []
+        Overlay._rect_vertices = []
+        Overlay._point_arrays = []
+        Overlay._point_count = 0
+        Overlay._image_vertices = []
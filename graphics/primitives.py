@@ -2,21 +2,66 @@
 graphics/primitives.py
 ======================
 Formas geométricas primitivas e otimizadas para renderização.
-Inclui cubos, grama 3D com Display Lists, e outras formas básicas.
+Inclui cubos, chão, marcador de objetivo e outras formas básicas.
+A grama fica em graphics/grass.py (chunks do nível, com LOD).
+
+Formas procedurais fixas (cubo, marcador de objetivo) são geradas uma
+vez em Display Lists: desenhar custa uma glCallList, sem trigonometria
+nem glVertex por frame.
+
+ESTADO:
+------
+Cada primitiva declara o estado de que precisa via GLState (ex.: luz
+desligada) e não o restaura: desenhar N marcadores emite as trocas de
+estado uma vez. Quem desenha em lote (Renderer) restaura a iluminação ao
+fim da passada.
 """
 
-import random
-import math
+import numpy as np
 from OpenGL.GL import *
 from config import *
+from .state import GLState
+
+
+# Cantos do cubo unitário (mesmas faces e ordem de draw_unit_cube)
+_UNIT_CUBE_CORNERS = np.array([
+    (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),          # Frente
+    (-1, -1, -1), (-1, 1, -1), (1, 1, -1), (1, -1, -1),      # Trás
+    (-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1),      # Esquerda
+    (1, -1, -1), (1, 1, -1), (1, 1, 1), (1, -1, 1),          # Direita
+    (-1, 1, -1), (-1, 1, 1), (1, 1, 1), (1, 1, -1),          # Topo
+    (-1, -1, -1), (1, -1, -1), (1, -1, 1), (-1, -1, 1),      # Base
+], dtype=np.float32) * 0.5
+
+# Chão base: lado mínimo (centrado na origem), altura da superfície e
+# margem além das células do nível (meia célula + largura das folhas)
+FLOOR_SIZE = 40.0
+FLOOR_Y = -0.99
+FLOOR_MARGIN = 1.0
+
+# Círculo do marcador de objetivo: centro + borda a cada 12 graus (fechada)
+_MARKER_RADIUS = 0.35
+_MARKER_ANGLES = np.radians(np.arange(0, 361, 12))
+_MARKER_FAN = np.vstack((
+    [(0.0, 0.0, 0.0)],
+    np.column_stack((np.cos(_MARKER_ANGLES) * _MARKER_RADIUS,
+                     np.zeros(len(_MARKER_ANGLES)),
+                     np.sin(_MARKER_ANGLES) * _MARKER_RADIUS)),
+))
+
+# X do marcador (dois segmentos, um pouco acima do círculo)
+_MARKER_CROSS = (
+    (-0.25, 0.01, -0.25), (0.25, 0.01, 0.25),
+    (0.25, 0.01, -0.25), (-0.25, 0.01, 0.25),
+)
 
 
 class Primitives:
     """Gerenciador de formas geométricas primitivas"""
     
     # Display Lists para otimização
-    _grass_display_list = None
     _cube_display_list = None
+    _marker_display_list = None
     
     @staticmethod
     def draw_unit_cube():
@@ -69,195 +114,107 @@ class Primitives:
         glEnd()
     
     @staticmethod
-    def create_grass_display_list():
-        """
-        Cria Display List otimizada para grama 3D.
-        Performance boost de ~90% comparado a renderização por frame.
+    def build_cube_vertices(centers, size):
         """
-        if Primitives._grass_display_list is not None:
-            return Primitives._grass_display_list
+        Vértices (GL_QUADS) de vários cubos, para desenhar em uma chamada.
         
-        random.seed(42)  # Seed fixo para consistência
-        
-        # Cria nova display list
-        Primitives._grass_display_list = glGenLists(1)
-        glNewList(Primitives._grass_display_list, GL_COMPILE)
-        
-        # Gera toda a geometria da grama
-        total_blades = GRASS_AREA * GRASS_AREA * GRASS_DENSITY
-        
-        for i in range(total_blades):
-            # Posição aleatória
-            gx = random.uniform(-GRASS_AREA/2, GRASS_AREA/2)
-            gz = random.uniform(-GRASS_AREA/2, GRASS_AREA/2)
-            
-            # Propriedades aleatórias
-            height = random.uniform(GRASS_MIN_HEIGHT, GRASS_MAX_HEIGHT)
-            rotation = random.uniform(0, 360)
-            color_var = random.uniform(-0.3, 0.3)
-            
-            # Desenha folha diretamente na display list
-            glPushMatrix()
-            glTranslatef(gx, -1.0, gz)
-            glRotatef(rotation, 0, 1, 0)
-            
-            # Cor verde com variação
-            r = 0.1 + color_var * 0.1
-            g = 0.6 + color_var * 0.3
-            b = 0.1 + color_var * 0.05
-            glColor3f(r, g, b)
-            
-            # Quad vertical (folha)
-            glBegin(GL_QUADS)
-            w = GRASS_BLADE_WIDTH
-            
-            # Frente
-            glVertex3f(-w, 0, 0)
-            glVertex3f(w, 0, 0)
-            glVertex3f(w, height, 0)
-            glVertex3f(-w, height, 0)
-            
-            # Trás (visível de ambos os lados)
-            glVertex3f(-w, 0, 0)
-            glVertex3f(-w, height, 0)
-            glVertex3f(w, height, 0)
-            glVertex3f(w, 0, 0)
-            
-            glEnd()
-            glPopMatrix()
+        Args:
+            centers: Array (N, 3) com os centros
+            size: Aresta dos cubos
         
-        glEndList()
-        return Primitives._grass_display_list
+        Returns:
+            np.ndarray: Array (24 * N, 3) float32
+        """
+        centers = np.asarray(centers, dtype=np.float32).reshape(-1, 1, 3)
+        return (centers + _UNIT_CUBE_CORNERS[None, :, :] * size).reshape(-1, 3)
     
     @staticmethod
-    def draw_grass():
-        """Renderiza grama usando Display List otimizada"""
-        if Primitives._grass_display_list is None:
-            Primitives.create_grass_display_list()
+    def draw_floor(bounds=None):
+        """
+        Desenha o chão base (a grama é desenhada pelo Renderer).
+        
+        Args:
+            bounds: (x mínimo, x máximo, z mínimo, z máximo) das células do
+                    nível, ou None; o chão cobre o quadrado de FLOOR_SIZE
+                    na origem e, se dado, o retângulo dessas células
+        """
+        x0 = z0 = -FLOOR_SIZE / 2
+        x1 = z1 = FLOOR_SIZE / 2
+        if bounds is not None:
+            x0 = min(x0, bounds[0] - FLOOR_MARGIN)
+            x1 = max(x1, bounds[1] + FLOOR_MARGIN)
+            z0 = min(z0, bounds[2] - FLOOR_MARGIN)
+            z1 = max(z1, bounds[3] + FLOOR_MARGIN)
         
-        if Primitives._grass_display_list is not None:
-            glCallList(Primitives._grass_display_list)
-    
-    @staticmethod
-    def draw_floor():
-        """Desenha chão base com grama"""
         # Chão base verde
-        glDisable(GL_LIGHTING)
+        GLState.disable(GL_LIGHTING)
         glColor3f(0.15, 0.5, 0.15)
         
-        glPushMatrix()
-        glTranslatef(0.0, -1.0, 0.0)
-        glScalef(40.0, 0.02, 40.0)
-        
-        hs = 0.5
         glBegin(GL_QUADS)
-        glVertex3f(-hs, hs, -hs)
-        glVertex3f(-hs, hs, hs)
-        glVertex3f(hs, hs, hs)
-        glVertex3f(hs, hs, -hs)
+        glVertex3f(x0, FLOOR_Y, z0)
+        glVertex3f(x0, FLOOR_Y, z1)
+        glVertex3f(x1, FLOOR_Y, z1)
+        glVertex3f(x1, FLOOR_Y, z0)
         glEnd()
         
-        glPopMatrix()
-        
-        # Grama 3D otimizada
-        Primitives.draw_grass()
-        
-        glEnable(GL_LIGHTING)
+        GLState.enable(GL_LIGHTING)
     
     @staticmethod
-    def draw_target_marker(x, y, z):
+    def create_target_marker_display_list():
         """
-        Desenha marcador de objetivo (círculo + X).
-        
-        Args:
-            x, y, z: Posição do objetivo
+        Cria Display List do marcador de objetivo (círculo + X) na origem.
+        Os vértices do círculo são calculados uma vez (_MARKER_FAN).
         """
-        glPushMatrix()
-        glTranslatef(x, y - 0.95, z)
-        glDisable(GL_LIGHTING)
+        if Primitives._marker_display_list is not None:
+            return Primitives._marker_display_list
+        
+        Primitives._marker_display_list = glGenLists(1)
+        glNewList(Primitives._marker_display_list, GL_COMPILE)
         
         # Círculo azul
         glColor3f(0.1, 0.7, 1.0)
         glBegin(GL_TRIANGLE_FAN)
-        glVertex3f(0, 0, 0)
-        radius = 0.35
-        
-        for i in range(0, 361, 12):
-            angle = math.radians(i)
-            glVertex3f(math.cos(angle) * radius, 0, math.sin(angle) * radius)
+        for vertex in _MARKER_FAN:
+            glVertex3f(*vertex)
         glEnd()
         
         # X vermelho
         glColor3f(1.0, 0.0, 0.0)
         glLineWidth(6.0)
         glBegin(GL_LINES)
-        glVertex3f(-0.25, 0.01, -0.25)
-        glVertex3f(0.25, 0.01, 0.25)
-        glVertex3f(0.25, 0.01, -0.25)
-        glVertex3f(-0.25, 0.01, 0.25)
+        for vertex in _MARKER_CROSS:
+            glVertex3f(*vertex)
         glEnd()
         glLineWidth(1.0)
         
-        glEnable(GL_LIGHTING)
-        glPopMatrix()
+        glEndList()
+        return Primitives._marker_display_list
     
     @staticmethod
-    def draw_shadow(x, y, z, size=0.4, alpha=0.3):
+    def draw_target_marker(x, y, z):
         """
-        Desenha sombra projetada no chão.
+        Desenha marcador de objetivo (círculo + X) pela Display List.
         
         Args:
-            x, y, z: Posição da sombra
-            size: Tamanho da sombra
-            alpha: Transparência (0-1)
-        """
-        glPushMatrix()
-        glTranslatef(x, -0.99, z)
-        glDisable(GL_LIGHTING)
-        
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glColor4f(0.0, 0.0, 0.0, alpha)
-        
-        glBegin(GL_QUADS)
-        glVertex3f(-size, 0, -size)
-        glVertex3f(size, 0, -size)
-        glVertex3f(size, 0, size)
-        glVertex3f(-size, 0, size)
-        glEnd()
-        
-        glDisable(GL_BLEND)
-        glEnable(GL_LIGHTING)
-        glPopMatrix()
-    
-    @staticmethod
-    def draw_particle(x, y, z, size=0.1, color=(1.0, 1.0, 0.0)):
+            x, y, z: Posição do objetivo
         """
-        Desenha uma partícula de efeito visual.
+        if Primitives._marker_display_list is None:
+            Primitives.create_target_marker_display_list()
         
-        Args:
-            x, y, z: Posição da partícula
-            size: Tamanho da partícula
-            color: Cor RGB
-        """
         glPushMatrix()
-        glTranslatef(x, y, z)
-        glDisable(GL_LIGHTING)
-        
-        glColor3f(*color)
-        glScalef(size, size, size)
-        Primitives.draw_unit_cube()
-        
-        glEnable(GL_LIGHTING)
+        glTranslatef(x, y - 0.95, z)
+        GLState.disable(GL_LIGHTING)
+        GLState.disable(GL_BLEND)
+        glCallList(Primitives._marker_display_list)
         glPopMatrix()
     
     @staticmethod
     def cleanup():
         """Libera recursos de Display Lists"""
-        if Primitives._grass_display_list is not None:
-            glDeleteLists(Primitives._grass_display_list, 1)
-            Primitives._grass_display_list = None
-        
         if Primitives._cube_display_list is not None:
             glDeleteLists(Primitives._cube_display_list, 1)
             Primitives._cube_display_list = None
+        
+        if Primitives._marker_display_list is not None:
+            glDeleteLists(Primitives._marker_display_list, 1)
+            Primitives._marker_display_list = None
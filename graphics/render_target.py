@@ -0,0 +1,134 @@
+"""
+graphics/render_target.py
+=========================
+Textura RGBA com framebuffer (FBO) para desenhar fora da tela.
+
+USO:
+---
+    target.resize(largura, altura)
+    if target.begin(x, y):      # (x, y) = canto da área da tela coberta
+        ... desenha em pixels da tela, como na passada 2D ...
+        target.end()
+
+O conteúdo fica em target.texture_id com alpha pré-multiplicado
+(PREMULTIPLIED_BLEND ao desenhar dentro, PREMULTIPLIED_COMPOSITE ao
+compor na tela): sobrepor a textura dá o mesmo resultado que desenhar
+direto.
+
+Sem suporte a framebuffer objects (OpenGL < 3.0 sem a extensão),
+begin() retorna False e quem chamou desenha direto na tela.
+"""
+
+from OpenGL.GL import *
+from .state import GLState
+
+
+# Blend ao desenhar dentro do alvo: cor com alpha, alpha acumulado
+PREMULTIPLIED_BLEND = (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+
+# Blend ao compor a textura do alvo sobre a tela
+PREMULTIPLIED_COMPOSITE = (GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+
+
+class RenderTarget:
+    """Framebuffer com uma textura de cor RGBA"""
+    
+    def __init__(self):
+        """Cria o alvo vazio (alocado em resize)"""
+        self.width = 0
+        self.height = 0
+        self.texture_id = None
+        self.framebuffer_id = None
+        self.supported = bool(glGenFramebuffers)
+        self._previous = None
+        self._viewport = None
+        self._clear_color = None
+    
+    def resize(self, width, height):
+        """
+        (Re)aloca a textura e o framebuffer se o tamanho mudou.
+        
+        Args:
+            width, height: Tamanho em pixels
+        """
+        if not self.supported or (width, height) == (self.width, self.height):
+            return
+        self.release()
+        if width <= 0 or height <= 0:
+            return
+        
+        self.texture_id = glGenTextures(1)
+        GLState.bind_texture(self.texture_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, None)
+        
+        self.framebuffer_id = glGenFramebuffers(1)
+        previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer_id)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
+                               GL_TEXTURE_2D, self.texture_id, 0)
+        complete = glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE
+        glBindFramebuffer(GL_FRAMEBUFFER, int(previous))
+        
+        if not complete:
+            self.release()
+            self.supported = False
+            return
+        self.width = width
+        self.height = height
+    
+    def begin(self, x=0, y=0):
+        """
+        Passa a desenhar no alvo (limpo, transparente) com projeção
+        ortográfica em pixels da tela.
+        
+        Args:
+            x, y: Canto inferior esquerdo da área da tela que o alvo cobre
+        
+        Returns:
+            bool: False se o alvo não pode ser usado
+        """
+        if self.framebuffer_id is None:
+            return False
+        
+        self._previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        self._viewport = glGetIntegerv(GL_VIEWPORT)
+        self._clear_color = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer_id)
+        glViewport(0, 0, self.width, self.height)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(x, x + self.width, y, y + self.height, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        return True
+    
+    def end(self):
+        """Volta a desenhar onde se desenhava antes de begin (a tela)"""
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        
+        glBindFramebuffer(GL_FRAMEBUFFER, int(self._previous))
+        glViewport(*self._viewport)
+        glClearColor(*self._clear_color)
+    
+    def release(self):
+        """Libera textura e framebuffer da GPU"""
+        if self.framebuffer_id is not None:
+            glDeleteFramebuffers(1, [self.framebuffer_id])
+            self.framebuffer_id = None
+        if self.texture_id is not None:
+            glDeleteTextures([self.texture_id])
+            GLState.forget_texture(self.texture_id)
+            self.texture_id = None
+        self.width = 0
+        self.height = 0
@@ -11,12 +11,13 @@ PIPELINE DE RENDERIZAÇÃO:
 3. Sistema de Iluminação (luz direcional + ambient)
 4. Renderização de Geometria 3D:
    - Chão com grid
-   - Paredes (cubos texturizados)
-   - Caixas (com cores dinâmicas baseadas no estado)
+   - Grama em chunks com LOD por distância (graphics/grass.py)
+   - Paredes (malha estática em VBO, graphics/level_mesh.py)
+   - Caixas (lote por status em VBO dinâmico, graphics/box_batch.py)
    - Objetivos (marcadores X no chão)
    - Sombras (projeção simples)
-5. Efeitos de Partículas (sistema de feedback visual)
-6. HUD 2D (overlay em ortho2D)
+5. Efeitos de Partículas (pool numpy, todas em um array de vértices)
+6. HUD 2D (fila de graphics/overlay.py, uma passada ortográfica por frame)
 
 TÉCNICAS GRÁFICAS:
 -----------------
@@ -26,45 +27,95 @@ TÉCNICAS GRÁFICAS:
 - Blending para transparências
 - Materiais com propriedades especular/diffuse/ambient
 - Sistema de cores procedurais para feedback visual
+- Cache de estado OpenGL (graphics/state.py): enable/disable, textura,
+  blend e material só são emitidos quando mudam
+- Frustum culling por chunks (graphics/culling.py); contadores de
+  desenhados/descartados em Renderer.render_stats
+- Occlusion culling no grid de paredes (graphics/occlusion.py): chunks,
+  marcadores e caixas fora do conjunto visível da célula do jogador
+  não são desenhados
 
 ESTADOS VISUAIS DAS CAIXAS:
 --------------------------
 - normal: Marrom (caixa comum)
 - on_target: Dourado (no objetivo correto)
 - pushable: Verde (pode ser empurrada)
-- blocked: Vermelho (bloqueada)
+- blocked: Vermelho (bloqueada ou em deadlock)
 """
 
-import math
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from config import *
 from .materials import Materials, Lighting
 from .primitives import Primitives
+from .buffers import VertexBuffer
+from .level_mesh import StaticLevelMesh
+from .box_batch import BoxBatch
+from .culling import Frustum
+from .occlusion import GridOcclusion
+from .grass import GrassField
 from .ui import UI
-from .clouds import CloudSystem
+from .text import Text
+from .overlay import Overlay
+from .backdrop import Backdrop
+from .state import GLState
 
 
 class Renderer:
     """Gerenciador de renderização 3D"""
     
+    # Malha estática das paredes (VBO reconstruído só ao trocar de nível)
+    _level_mesh = StaticLevelMesh()
+    
+    # Grama do nível em chunks (VBO reconstruído só ao trocar de nível)
+    _grass = GrassField()
+    
+    # Caixas e sombras em lote (buffers reescritos só quando algo muda)
+    _box_batch = BoxBatch()
+    
+    # Cubos de todas as partículas vivas (reescrito a cada frame)
+    _particle_buffer = None
+    
+    # Fundo 3D do menu/vitória capturado em textura (graphics/backdrop.py)
+    _backdrop = Backdrop()
+    
+    # Frustum da câmera do frame atual (atualizado em setup_camera)
+    _aspect = WINDOW_WIDTH / float(WINDOW_HEIGHT)
+    frustum = None
+    
+    # Conjuntos visíveis da célula do jogador (atualizados em update_visibility)
+    _occlusion = GridOcclusion()
+    visible_cells = None
+    visible_chunks = None
+    
+    # Contadores de culling do último frame (profiling)
+    render_stats = {
+        'chunks_drawn': 0, 'chunks_culled': 0, 'chunks_occluded': 0,
+        'markers_drawn': 0, 'markers_culled': 0, 'markers_occluded': 0,
+        'boxes_occluded': 0, 'particles_drawn': 0,
+        'grass_chunks_drawn': 0, 'grass_blades_drawn': 0,
+    }
+    
     @staticmethod
     def init_opengl():
         """Inicializa OpenGL com todas as configurações"""
+        # Contexto novo: estado conhecido pelo cache não vale mais
+        GLState.reset()
+        
         # Depth test e culling
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_CULL_FACE)
+        GLState.enable(GL_DEPTH_TEST)
+        GLState.enable(GL_CULL_FACE)
         glCullFace(GL_BACK)
         
         # Suavização
-        glEnable(GL_LINE_SMOOTH)
-        glEnable(GL_POINT_SMOOTH)
+        GLState.enable(GL_LINE_SMOOTH)
+        GLState.enable(GL_POINT_SMOOTH)
         glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
         glHint(GL_POINT_SMOOTH_HINT, GL_NICEST)
         
         # Blending
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        GLState.enable(GL_BLEND)
+        GLState.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
         # Sistema de iluminação profissional
         Lighting.setup()
@@ -74,6 +125,9 @@ class Renderer:
         
         # Cor de fundo (céu)
         glClearColor(*SKY_COLOR)
+        
+        # Atlas de glifos da UI (rasterizados uma vez)
+        Text.preload()
     
     @staticmethod
     def set_perspective(width, height):
@@ -83,77 +137,136 @@ class Renderer:
         Args:
             width, height: Dimensões da janela
         """
+        Renderer._aspect = width / float(height)
+        Overlay.resize(width, height)
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
-        gluPerspective(FOV, width / float(height), NEAR_PLANE, FAR_PLANE)
+        gluPerspective(FOV, Renderer._aspect, NEAR_PLANE, FAR_PLANE)
         glMatrixMode(GL_MODELVIEW)
     
     @staticmethod
-    def setup_camera(player):
+    def setup_camera(player, alpha=1.0):
         """
-        Configura câmera em primeira pessoa.
+        Configura câmera em primeira pessoa e o frustum usado no culling.
         
         Args:
             player: Objeto Player com posição e rotação
+            alpha: Fração entre o passo anterior e o atual (interpolação)
+        
+        Returns:
+            tuple: Posição (x, y, z) usada pela câmera
         """
+        x, y, z, pitch, yaw = player.get_view(alpha)
         glLoadIdentity()
         
         # Rotação da câmera
-        glRotatef(player.camera_pitch, 1, 0, 0)
-        glRotatef(player.camera_yaw, 0, 1, 0)
+        glRotatef(pitch, 1, 0, 0)
+        glRotatef(yaw, 0, 1, 0)
         
         # Posição da câmera (inverte pois é a câmera que move)
-        glTranslatef(-player.x, -PLAYER_EYE_HEIGHT, -player.z)
+        glTranslatef(-x, -PLAYER_EYE_HEIGHT, -z)
+        
+        Renderer.frustum = Frustum.from_camera(x, z, pitch, yaw, Renderer._aspect)
+        return (x, y, z)
     
     @staticmethod
-    def draw_wall(x, y, z):
+    def update_visibility(level, player):
         """
-        Desenha uma parede.
+        Atualiza as células e chunks potencialmente visíveis da célula do
+        jogador (em cache por célula; só recalcula ao trocar de célula).
         
         Args:
-            x, y, z: Posição da parede
+            level: Objeto Level
+            player: Objeto Player
         """
-        Materials.apply_wall_material_varied(x, z)
-        glPushMatrix()
-        glTranslatef(x, y + 0.0, z)
-        glScalef(1.0, 2.0, 1.0)
-        Primitives.draw_unit_cube()
-        glPopMatrix()
+        gx, _, gz = player.get_grid_position()
+        Renderer._occlusion.sync(level)
+        Renderer.visible_cells, Renderer.visible_chunks = Renderer._occlusion.visible((gx, gz))
     
     @staticmethod
-    def draw_box(x, y, z, status='normal'):
+    def draw_walls(level):
         """
-        Desenha uma caixa com cor baseada no status.
+        Desenha todas as paredes do nível pela malha estática.
         
         Args:
-            x, y, z: Posição da caixa
-            status: 'normal', 'on_target', 'pushable', 'blocked'
+            level: Objeto Level
         """
-        glPushMatrix()
-        glTranslatef(x, y - 0.5, z)
-        glScalef(1.0, 1.0, 1.0)
-        
-        # Define cor baseada no status
-        if status == 'on_target':
-            color = (1.0, 0.84, 0.0, 1.0)  # Dourado
-            shininess = 64.0
-        elif status == 'pushable':
-            color = (0.2, 0.9, 0.2, 1.0)  # Verde
-            shininess = 32.0
-        elif status == 'blocked':
-            color = (0.9, 0.2, 0.2, 1.0)  # Vermelho
-            shininess = 32.0
-        else:  # normal
-            color = (0.72, 0.48, 0.16, 1.0)  # Marrom
-            shininess = 32.0
-        
-        Materials.apply_box_material(color, shininess)
-        Primitives.draw_unit_cube()
+        mesh = Renderer._level_mesh
+        mesh.sync(level)
+        mesh.draw(Renderer.frustum, Renderer.visible_chunks)
         
-        # Restaura material padrão
-        Materials.apply_wall_material()
+        Renderer.render_stats['chunks_drawn'] = mesh.drawn_chunks
+        Renderer.render_stats['chunks_culled'] = mesh.culled_chunks
+        Renderer.render_stats['chunks_occluded'] = mesh.occluded_chunks
+    
+    @staticmethod
+    def draw_ground(level, camera_pos):
+        """
+        Desenha o chão (cobrindo o nível) e a grama dos chunks visíveis,
+        com LOD por distância.
         
-        glPopMatrix()
+        Args:
+            level: Objeto Level
+            camera_pos: Posição (x, y, z) da câmera
+        """
+        grass = Renderer._grass
+        grass.sync(level)
+        Primitives.draw_floor(grass.bounds)
+        grass.draw(camera_pos, Renderer.frustum, Renderer.visible_chunks)
+        GLState.enable(GL_LIGHTING)
+        
+        Renderer.render_stats['grass_chunks_drawn'] = grass.drawn_chunks
+        Renderer.render_stats['grass_blades_drawn'] = grass.drawn_blades
+    
+    @staticmethod
+    def draw_objectives(level):
+        """
+        Desenha os marcadores de objetivo visíveis (occlusion + frustum).
+        
+        Args:
+            level: Objeto Level
+        """
+        objectives = level.objectives
+        cells = Renderer.visible_cells
+        if cells is not None:
+            objectives = [obj for obj in objectives if (obj[0], obj[2]) in cells]
+        occluded = len(level.objectives) - len(objectives)
+        
+        if Renderer.frustum is not None and objectives:
+            visible = Renderer.frustum.visible_spheres(objectives, 0.5)
+        else:
+            visible = [True] * len(objectives)
+        
+        drawn = 0
+        for (x, y, z), show in zip(objectives, visible):
+            if show:
+                Primitives.draw_target_marker(x, y, z)
+                drawn += 1
+        GLState.enable(GL_LIGHTING)
+        
+        Renderer.render_stats['markers_drawn'] = drawn
+        Renderer.render_stats['markers_culled'] = len(objectives) - drawn
+        Renderer.render_stats['markers_occluded'] = occluded
+    
+    @staticmethod
+    def draw_boxes(level, statuses):
+        """
+        Desenha as caixas e sombras visíveis do nível em lote.
+        
+        Args:
+            level: Objeto Level
+            statuses: Status visual de cada caixa (ordem de level.boxes)
+        """
+        cells = Renderer.visible_cells
+        if cells is not None:
+            statuses = [
+                status if (x, z) in cells else None
+                for (x, _, z), status in zip(level.boxes, statuses)
+            ]
+        Renderer.render_stats['boxes_occluded'] = statuses.count(None)
+        
+        Renderer._box_batch.sync(level, statuses)
+        Renderer._box_batch.draw()
     
     @staticmethod
     def get_box_status(box_pos, objectives, player, level):
@@ -163,10 +276,10 @@ class Renderer:
         
         Args:
             box_pos: Posição da caixa (tupla (x, y, z))
-            objectives: Lista de objetivos
+            objectives: Conjunto (ou lista) de objetivos
             player: Objeto Player
             level: Objeto Level
-            
+        
         Returns:
             str: Status da caixa ('normal', 'on_target', 'pushable', 'blocked')
         """
@@ -174,6 +287,10 @@ class Renderer:
         if box_pos in objectives:
             return 'on_target'
         
+        # Caixa em deadlock: nunca mais chega a um objetivo
+        if level.is_box_deadlocked(box_pos):
+            return 'blocked'
+        
         # Obtém posição do jogador no grid
         from game.physics import Physics
         px = Physics.grid_round(player.x)
@@ -205,34 +322,35 @@ class Renderer:
     @staticmethod
     def draw_particles(particles, current_time):
         """
-        Desenha partículas de efeito.
+        Desenha todas as partículas vivas como cubos de um único array de
+        vértices (uma chamada de desenho por frame).
         
         Args:
-            particles: Lista de (x, y, z, start_time)
+            particles: Pool de partículas (game.particles.ParticlePool)
             current_time: Tempo atual
         """
-        glDisable(GL_LIGHTING)
-        
-        for (x, y, z, start_t) in particles:
-            elapsed = current_time - start_t
-            
-            if elapsed < PARTICLE_LIFETIME:
-                # Animação de partículas em espiral
-                for i in range(PARTICLE_COUNT):
-                    angle = (i / PARTICLE_COUNT) * 2 * math.pi
-                    offset = elapsed * 2.0
-                    
-                    px = x + math.cos(angle + elapsed * 3) * offset
-                    pz = z + math.sin(angle + elapsed * 3) * offset
-                    py = y - 0.2 + math.sin(elapsed * 5) * 0.3 + 0.3
-                    
-                    # Cor amarela brilhante
-                    Primitives.draw_particle(px, py, pz, 0.1, (1.0, 1.0, 0.0))
-        
-        glEnable(GL_LIGHTING)
+        positions = particles.positions(current_time, PARTICLE_LIFETIME)
+        Renderer.render_stats['particles_drawn'] = len(positions)
+        if not len(positions):
+            return
+        
+        data = Primitives.build_cube_vertices(positions, 0.1)
+        if Renderer._particle_buffer is None:
+            Renderer._particle_buffer = VertexBuffer(
+                data, layout=(('vertex', 3),), usage=GL_DYNAMIC_DRAW
+            )
+        else:
+            Renderer._particle_buffer.upload(data)
+        
+        # Cor amarela brilhante, sem iluminação
+        GLState.disable(GL_LIGHTING)
+        glColor3f(1.0, 1.0, 0.0)
+        Renderer._particle_buffer.draw()
+        GLState.enable(GL_LIGHTING)
     
     @staticmethod
-    def render_game_scene(level, player, current_time, sound_manager=None):
+    def render_game_scene(level, player, current_time, sound_manager=None, clouds=None,
+                          alpha=1.0):
         """
         Renderiza cena principal do jogo.
         
@@ -241,32 +359,40 @@ class Renderer:
             player: Objeto Player
             current_time: Tempo atual
             sound_manager: Gerenciador de som
+            clouds: Sistema de nuvens (CloudSystem) ou None
+            alpha: Interpolação entre passos da simulação (0 a 1)
         """
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         
+        # O nível muda durante o jogo: o fundo capturado não vale mais
+        Renderer._backdrop.invalidate()
+        
         # Configura câmera
-        Renderer.setup_camera(player)
+        camera_pos = Renderer.setup_camera(player, alpha)
+        Renderer.update_visibility(level, player)
         
         # Desenha nuvens (no fundo, antes de tudo)
-        if hasattr(level, 'clouds') and level.clouds:
-            level.clouds.render((player.x, player.y, player.z))
+        if clouds:
+            clouds.render(camera_pos)
         
-        # Desenha chão
-        Primitives.draw_floor()
+        # Desenha chão e grama
+        Renderer.draw_ground(level, camera_pos)
         
-        # Desenha paredes
-        for (x, y, z) in level.walls:
-            Renderer.draw_wall(x, y, z)
+        # Desenha paredes (chunks visíveis da malha estática)
+        Renderer.draw_walls(level)
         
         # Desenha objetivos
-        for (x, y, z) in level.objectives:
-            Primitives.draw_target_marker(x, y, z)
-        
-        # Desenha caixas com sombras
-        for (x, y, z) in level.boxes:
-            status = Renderer.get_box_status((x, y, z), level.objectives, player, level)
-            Renderer.draw_box(x, y, z, status)
-            Primitives.draw_shadow(x, y, z)
+        Renderer.draw_objectives(level)
+        
+        # Desenha caixas com sombras (em lote, agrupadas por status);
+        # caixas ocultas nem têm o status calculado
+        cells = Renderer.visible_cells
+        statuses = [
+            Renderer.get_box_status(box, level.objective_set, player, level)
+            if cells is None or (box[0], box[2]) in cells else None
+            for box in level.boxes
+        ]
+        Renderer.draw_boxes(level, statuses)
         
         # Desenha partículas
         Renderer.draw_particles(level.particles, current_time)
@@ -275,6 +401,7 @@ class Renderer:
         stats = level.get_progress_stats()
         UI.draw_hud(level.current_level_index, stats, sound_manager)
         UI.draw_crosshair()
+        Overlay.flush()
     
     @staticmethod
     def render_menu_background():
@@ -287,10 +414,10 @@ class Renderer:
         glRotatef(30, 0, 1, 0)
         glTranslatef(-2, -1, -8)
         
-        glEnable(GL_LIGHTING)
+        GLState.enable(GL_LIGHTING)
         
         # Chão de demonstração
-        glDisable(GL_LIGHTING)
+        GLState.disable(GL_LIGHTING)
         glColor3f(0.2, 0.7, 0.2)
         glPushMatrix()
         glTranslatef(0, -1, 0)
@@ -305,7 +432,7 @@ class Renderer:
         glEnd()
         glPopMatrix()
         
-        glEnable(GL_LIGHTING)
+        GLState.enable(GL_LIGHTING)
         
         # Parede de demonstração
         Materials.apply_wall_material_varied(1, 1)
@@ -328,51 +455,87 @@ class Renderer:
     @staticmethod
     def render_menu(sound_manager=None):
         """
-        Renderiza menu principal completo
+        Renderiza menu principal completo.
+        A cena de demonstração é desenhada uma vez e reutilizada como
+        textura nos frames seguintes.
         
         Args:
             sound_manager: Gerenciador de som
         """
-        Renderer.render_menu_background()
+        key = ('menu', Overlay.width, Overlay.height)
+        if Renderer._backdrop.valid(key):
+            Renderer._backdrop.draw()
+        else:
+            Renderer.render_menu_background()
+            Renderer._backdrop.capture(key, Overlay.width, Overlay.height)
         UI.draw_menu(sound_manager)
+        Overlay.flush()
     
     @staticmethod
     def render_victory(level, player, current_time):
         """
         Renderiza tela de vitória de nível.
+        A cena é desenhada a cada frame só enquanto há partículas; depois
+        é capturada uma vez e reutilizada como textura.
+        
+        Args:
+            level: Objeto Level
+            player: Objeto Player
+            current_time: Tempo atual
+        """
+        key = ('victory', level.current_level_index, Overlay.width, Overlay.height)
+        if not level.particles and Renderer._backdrop.valid(key):
+            Renderer._backdrop.draw()
+        else:
+            Renderer.render_victory_background(level, player, current_time)
+            if not level.particles:
+                Renderer._backdrop.capture(key, Overlay.width, Overlay.height)
+        
+        # Overlay de vitória
+        UI.draw_victory_screen(level.move_count)
+        Overlay.flush()
+    
+    @staticmethod
+    def render_victory_background(level, player, current_time):
+        """
+        Renderiza a cena 3D atrás da tela de vitória.
         
         Args:
             level: Objeto Level
             player: Objeto Player
             current_time: Tempo atual
         """
-        # Renderiza cena de fundo
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        Renderer.setup_camera(player)
+        camera_pos = Renderer.setup_camera(player)
+        Renderer.update_visibility(level, player)
         
-        Primitives.draw_floor()
+        Renderer.draw_ground(level, camera_pos)
         
-        for (x, y, z) in level.walls:
-            Renderer.draw_wall(x, y, z)
+        Renderer.draw_walls(level)
         
-        for (x, y, z) in level.objectives:
-            Primitives.draw_target_marker(x, y, z)
+        Renderer.draw_objectives(level)
         
-        for (x, y, z) in level.boxes:
-            Renderer.draw_box(x, y, z, 'on_target')
-            Primitives.draw_shadow(x, y, z)
+        Renderer.draw_boxes(level, ['on_target'] * len(level.boxes))
         
         Renderer.draw_particles(level.particles, current_time)
-        
-        # Overlay de vitória
-        UI.draw_victory_screen(level.move_count)
     
     @staticmethod
     def render_final_victory():
         """Renderiza tela de vitória final"""
         UI.draw_final_victory_screen()
+        Overlay.flush()
     
     @staticmethod
     def cleanup():
         """Limpa recursos de renderização"""
+        Renderer._level_mesh.release()
+        Renderer._grass.release()
+        Renderer._box_batch.release()
+        if Renderer._particle_buffer is not None:
+            Renderer._particle_buffer.delete()
+            Renderer._particle_buffer = None
+        UI.release()
+        Renderer._backdrop.release()
+        Overlay.release()
+        Text.release()
         Primitives.cleanup()
@@ -0,0 +1,178 @@
+"""
+graphics/state.py
+=================
+Cache do estado do OpenGL para evitar mudanças redundantes.
+
+POR QUE:
+-------
+Cada chamada do PyOpenGL custa alguns microssegundos só de overhead do
+Python. Marcadores, partículas, sombras e a UI ligavam/desligavam
+GL_LIGHTING, GL_BLEND e GL_DEPTH_TEST a cada objeto, mesmo quando o
+estado já era o desejado.
+
+O QUE É RASTREADO:
+-----------------
+- Flags de glEnable/glDisable
+- Textura ligada em GL_TEXTURE_2D
+- Função de blend (glBlendFunc/glBlendFuncSeparate)
+- Material atual (chave definida por Materials)
+
+Chamadas que não mudariam nada são puladas. Tudo que altera o estado por
+fora do cache deve avisá-lo (ex.: GL_COLOR_MATERIAL sobrescreve o difuso
+do material -> invalidate_material).
+
+CONTADORES:
+----------
+issued/skipped contam chamadas emitidas/puladas no frame atual;
+end_frame() fecha o frame, guarda os números em frame_stats e acumula
+os totais (usados nas estatísticas do replay).
+"""
+
+from OpenGL.GL import *
+
+
+class GLState:
+    """Espelho do estado do OpenGL; só emite chamadas que mudam algo"""
+    
+    _flags = {}          # cap -> bool
+    _texture = None      # Textura ligada em GL_TEXTURE_2D
+    _blend_func = None   # (src, dst) ou (src, dst, src_alpha, dst_alpha)
+    _material = None     # Chave do material aplicado
+    
+    # Contadores do frame atual
+    issued = 0
+    skipped = 0
+    
+    # Último frame fechado e totais acumulados
+    frame_stats = {'issued': 0, 'skipped': 0}
+    frames = 0
+    total_issued = 0
+    total_skipped = 0
+    
+    @staticmethod
+    def reset():
+        """Esquece todo o estado conhecido (novo contexto OpenGL)"""
+        GLState._flags = {}
+        GLState._texture = None
+        GLState._blend_func = None
+        GLState._material = None
+    
+    @staticmethod
+    def _count(changed):
+        """Conta uma chamada emitida ou pulada"""
+        if changed:
+            GLState.issued += 1
+        else:
+            GLState.skipped += 1
+        return changed
+    
+    @staticmethod
+    def enable(cap):
+        """
+        glEnable(cap), se ainda não estiver ligado.
+        
+        Args:
+            cap: Capacidade do OpenGL (GL_LIGHTING, GL_BLEND...)
+        """
+        if GLState._count(GLState._flags.get(cap) is not True):
+            glEnable(cap)
+            GLState._flags[cap] = True
+    
+    @staticmethod
+    def disable(cap):
+        """
+        glDisable(cap), se ainda não estiver desligado.
+        
+        Args:
+            cap: Capacidade do OpenGL
+        """
+        if GLState._count(GLState._flags.get(cap) is not False):
+            glDisable(cap)
+            GLState._flags[cap] = False
+    
+    @staticmethod
+    def bind_texture(texture_id):
+        """
+        glBindTexture(GL_TEXTURE_2D, texture_id), se mudou.
+        
+        Args:
+            texture_id: Nome da textura (0 = nenhuma)
+        """
+        if GLState._count(GLState._texture != texture_id):
+            glBindTexture(GL_TEXTURE_2D, texture_id)
+            GLState._texture = texture_id
+    
+    @staticmethod
+    def forget_texture(texture_id):
+        """
+        Avisa que uma textura foi apagada (glDeleteTextures desliga a
+        textura se ela estava ligada).
+        
+        Args:
+            texture_id: Nome da textura apagada
+        """
+        if GLState._texture == texture_id:
+            GLState._texture = 0
+    
+    @staticmethod
+    def blend_func(src, dst, src_alpha=None, dst_alpha=None):
+        """
+        glBlendFunc(src, dst), se mudou. Com fatores de alpha, usa
+        glBlendFuncSeparate (ex.: desenho em textura com alpha correto).
+        
+        Args:
+            src: Fator de origem
+            dst: Fator de destino
+            src_alpha: Fator de origem do alpha (None = mesmo de src)
+            dst_alpha: Fator de destino do alpha (None = mesmo de dst)
+        """
+        if src_alpha is None and dst_alpha is None:
+            key = (src, dst)
+        else:
+            key = (src, dst,
+                   src if src_alpha is None else src_alpha,
+                   dst if dst_alpha is None else dst_alpha)
+        if GLState._count(GLState._blend_func != key):
+            if len(key) == 2:
+                glBlendFunc(src, dst)
+            else:
+                glBlendFuncSeparate(*key)
+            GLState._blend_func = key
+    
+    @staticmethod
+    def use_material(key):
+        """
+        Registra o material que vai ser aplicado.
+        
+        Args:
+            key: Chave que identifica o material (e seus parâmetros)
+        
+        Returns:
+            bool: True se o material mudou e as chamadas devem ser feitas
+        """
+        if GLState._count(GLState._material != key):
+            GLState._material = key
+            return True
+        return False
+    
+    @staticmethod
+    def invalidate_material():
+        """Material alterado por fora do cache (ex.: GL_COLOR_MATERIAL)"""
+        GLState._material = None
+    
+    @staticmethod
+    def end_frame():
+        """
+        Fecha o frame: guarda os contadores em frame_stats e acumula os
+        totais.
+        
+        Returns:
+            dict: {'issued': n, 'skipped': n} do frame
+        """
+        GLState.frame_stats = {'issued': GLState.issued, 'skipped': GLState.skipped}
+        GLState.frames += 1
+        GLState.total_issued += GLState.issued
+        GLState.total_skipped += GLState.skipped
+        GLState.issued = 0
+        GLState.skipped = 0
+        return GLState.frame_stats
@@ -0,0 +1,364 @@
+"""
+graphics/text.py
+================
+Texto da UI com atlas de glifos em textura.
+
+POR QUE:
+-------
+UI.draw_text chamava glutBitmapCharacter uma vez por caractere e desenhava
+cada string duas vezes (sombra + texto): o HUD custava centenas de
+chamadas GLUT por frame. As fontes bitmap do GLUT também não têm os
+símbolos usados nos menus (★, ╔═╗, ⏎...).
+
+ATLAS:
+-----
+- Cada tamanho de fonte tem um GlyphAtlas: os glifos são rasterizados com
+  pygame.font uma vez e empacotados em linhas de uma textura RGBA
+- Cada glifo vem da primeira fonte da cadeia UI_FONTS (config.py) que o
+  possui; a fonte padrão do pygame é o último recurso
+- Glifo que nenhuma fonte tem (ex.: emoji) é pulado, como no GLUT
+- Caracteres novos são adicionados ao atlas na primeira vez que aparecem
+  (o atlas é refeito e sua versão muda)
+
+STRINGS:
+-------
+Sombra e texto de uma string viram um único array de quads texturizados
+com cor por vértice, desenhado com um glDrawArrays. Os buffers ficam em
+cache LRU por (texto, tamanho, versão do atlas): strings que não mudam
+não são remontadas.
+"""
+
+import os
+from collections import OrderedDict
+import numpy as np
+import pygame
+from OpenGL.GL import *
+from config import UI_FONTS
+from .buffers import VertexBuffer
+from .state import GLState
+
+
+# Caracteres rasterizados na criação do atlas
+BASE_CHARSET = (
+    ''.join(chr(c) for c in range(32, 127)) +
+    ''.join(chr(c) for c in range(160, 256)) +
+    '★╔═╗║╚╝█⏎⎋•→←↑↓'
+)
+
+# Tamanhos usados pela UI (atlas criados em preload)
+PRELOAD_SIZES = (14, 16, 18, 20, 24, 36)
+
+# Largura da textura do atlas (pixels)
+ATLAS_WIDTH = 512
+
+# A fonte padrão do pygame é reduzida (~0.69x); compensa para manter o
+# tamanho pedido
+DEFAULT_FONT_SCALE = 1.45
+
+# Strings em cache (buffers na GPU)
+STRING_CACHE_SIZE = 128
+
+# Cores da sombra e do texto (RGBA) e deslocamento da sombra (pixels)
+SHADOW_COLOR = (0.0, 0.0, 0.0, 1.0)
+TEXT_COLOR = (1.0, 1.0, 1.0, 1.0)
+SHADOW_OFFSET = (1, -1)
+
+# Blend padrão do texto (a passada 2D desenha direto na tela)
+TEXT_BLEND = (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+# Code point que nenhuma fonte tem: seu raster é o glifo "não encontrado"
+_MISSING_PROBE = '￿'
+
+
+def _load_fonts(size):
+    """
+    Carrega a cadeia de fontes de um tamanho.
+    
+    Args:
+        size: Tamanho em pixels
+    
+    Returns:
+        list: Objetos pygame.font.Font, em ordem de prioridade
+    """
+    if not pygame.font.get_init():
+        pygame.font.init()
+    
+    fonts = []
+    for name in UI_FONTS:
+        path = name if os.path.isfile(name) else pygame.font.match_font(name)
+        if path:
+            try:
+                fonts.append(pygame.font.Font(path, size))
+            except (OSError, pygame.error):
+                continue
+    fonts.append(pygame.font.Font(None, int(round(size * DEFAULT_FONT_SCALE))))
+    return fonts
+
+
+def _raster(font, char):
+    """Bytes RGBA do glifo renderizado (usado para comparar glifos)"""
+    return pygame.image.tostring(font.render(char, True, (255, 255, 255)), 'RGBA')
+
+
+def _has_glyph(font, char, missing):
+    """
+    Verifica se a fonte tem um glifo próprio para o caractere.
+    
+    Args:
+        font: pygame.font.Font
+        char: Caractere
+        missing: Raster do glifo "não encontrado" da fonte
+    
+    Returns:
+        bool: False se a fonte não tem o glifo ou desenharia o substituto
+    """
+    metrics = font.metrics(char)
+    if not metrics or metrics[0] is None or font.size(char)[0] <= 0:
+        return False  # Sem glifo ou sem largura (ex.: hífen condicional)
+    return char == ' ' or _raster(font, char) != missing
+
+
+class GlyphAtlas:
+    """Glifos de um tamanho de fonte empacotados em uma textura"""
+    
+    def __init__(self, size, charset=BASE_CHARSET):
+        """
+        Rasteriza o atlas e envia para a GPU.
+        
+        Args:
+            size: Tamanho da fonte em pixels
+            charset: Caracteres iniciais
+        """
+        self.size = size
+        self.fonts = _load_fonts(size)
+        self.chars = set(charset)
+        self.glyphs = {}  # char -> (u0, v0, u1, v1, largura, altura, linha de base) ou None
+        self.texture_id = None
+        self.version = 0
+        self._rebuild()
+    
+    def ensure(self, text):
+        """
+        Garante que todos os caracteres do texto estão no atlas.
+        
+        Args:
+            text: String a desenhar
+        """
+        missing = set(text) - self.chars
+        if missing:
+            self.chars |= missing
+            self._rebuild()
+    
+    def _rebuild(self):
+        """Rasteriza todos os caracteres e reenvia a textura"""
+        white = (255, 255, 255)
+        surfaces = {}
+        baselines = {}
+        missing = [_raster(font, _MISSING_PROBE) for font in self.fonts]
+        
+        for char in sorted(self.chars):
+            font = next((f for f, probe in zip(self.fonts, missing)
+                         if _has_glyph(f, char, probe)), None)
+            if font is None:
+                continue  # Nenhuma fonte tem o glifo: é pulado
+            surfaces[char] = font.render(char, True, white)
+            
+            # Linha de base a partir do topo do glifo renderizado: glifos
+            # mais altos que a fonte (ex.: É) ganham linhas extras em cima
+            baselines[char] = max(font.get_ascent(), font.metrics(char)[0][3])
+        
+        # Empacota em linhas (1 pixel de margem entre glifos)
+        positions = {}
+        x = y = row_height = 0
+        for char, surface in surfaces.items():
+            w, h = surface.get_size()
+            if x + w + 1 > ATLAS_WIDTH:
+                x = 0
+                y += row_height + 1
+                row_height = 0
+            positions[char] = (x, y)
+            x += w + 1
+            row_height = max(row_height, h)
+        
+        height = 1
+        while height < y + row_height:
+            height *= 2
+        
+        atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+        atlas.fill((255, 255, 255, 0))
+        self.glyphs = {char: None for char in self.chars}
+        for char, surface in surfaces.items():
+            gx, gy = positions[char]
+            atlas.blit(surface, (gx, gy))
+            w, h = surface.get_size()
+            
+            # Textura enviada de cabeça para baixo (origem do GL embaixo)
+            self.glyphs[char] = (
+                gx / ATLAS_WIDTH, 1.0 - (gy + h) / height,
+                (gx + w) / ATLAS_WIDTH, 1.0 - gy / height,
+                w, h, baselines[char]
+            )
+        
+        if self.texture_id is None:
+            self.texture_id = glGenTextures(1)
+        GLState.bind_texture(self.texture_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(
+            GL_TEXTURE_2D, 0, GL_RGBA, ATLAS_WIDTH, height, 0,
+            GL_RGBA, GL_UNSIGNED_BYTE, pygame.image.tostring(atlas, 'RGBA', True)
+        )
+        self.version += 1
+    
+    def build_vertices(self, text, shadow=True):
+        """
+        Monta os quads de uma string (sombra + texto) na origem.
+        
+        Args:
+            text: String
+            shadow: Inclui a sombra deslocada
+        
+        Returns:
+            np.ndarray: Array (vértices, 8): x, y, u, v, r, g, b, a
+        """
+        self.ensure(text)
+        
+        quads = []
+        x = 0
+        for char in text:
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                continue
+            u0, v0, u1, v1, w, h, baseline = glyph
+            quads.append((x, baseline - h, x + w, baseline, u0, v0, u1, v1))
+            x += w
+        
+        passes = [(SHADOW_OFFSET, SHADOW_COLOR)] if shadow else []
+        passes.append(((0, 0), TEXT_COLOR))
+        
+        vertices = []
+        for (dx, dy), color in passes:
+            for x0, y0, x1, y1, u0, v0, u1, v1 in quads:
+                x0, x1, y0, y1 = x0 + dx, x1 + dx, y0 + dy, y1 + dy
+                vertices.append((x0, y0, u0, v0) + color)
+                vertices.append((x1, y0, u1, v0) + color)
+                vertices.append((x1, y1, u1, v1) + color)
+                vertices.append((x0, y1, u0, v1) + color)
+        
+        return np.array(vertices, dtype=np.float32).reshape(-1, 8)
+    
+    def release(self):
+        """Libera a textura da GPU"""
+        if self.texture_id is not None:
+            glDeleteTextures([self.texture_id])
+            GLState.forget_texture(self.texture_id)
+            self.texture_id = None
+
+
+class Text:
+    """Desenho de strings pelos atlas de glifos (um por tamanho)"""
+    
+    _atlases = {}                 # tamanho -> GlyphAtlas
+    _strings = OrderedDict()      # (texto, tamanho, versão) -> VertexBuffer
+    
+    @staticmethod
+    def atlas(size):
+        """
+        Atlas de um tamanho de fonte (criado na primeira vez).
+        
+        Args:
+            size: Tamanho da fonte em pixels
+        
+        Returns:
+            GlyphAtlas
+        """
+        atlas = Text._atlases.get(size)
+        if atlas is None:
+            atlas = GlyphAtlas(size)
+            Text._atlases[size] = atlas
+        return atlas
+    
+    @staticmethod
+    def preload(sizes=PRELOAD_SIZES):
+        """Cria os atlas dos tamanhos usados pela UI (na inicialização)"""
+        for size in sizes:
+            Text.atlas(size)
+    
+    @staticmethod
+    def _string_buffer(text, size):
+        """Buffer da string, montado só se não estiver em cache"""
+        atlas = Text.atlas(size)
+        atlas.ensure(text)
+        key = (text, size, atlas.version)
+        
+        buffer = Text._strings.get(key)
+        if buffer is not None:
+            Text._strings.move_to_end(key)
+            return buffer
+        
+        buffer = VertexBuffer(
+            atlas.build_vertices(text),
+            layout=(('vertex', 2), ('texcoord', 2), ('color', 4))
+        )
+        Text._strings[key] = buffer
+        if len(Text._strings) > STRING_CACHE_SIZE:
+            _, evicted = Text._strings.popitem(last=False)
+            evicted.delete()
+        return buffer
+    
+    @staticmethod
+    def bounds(text, size=18):
+        """
+        Retângulo ocupado por uma string (com sombra) desenhada na origem.
+        
+        Args:
+            text: String
+            size: Tamanho da fonte em pixels
+        
+        Returns:
+            tuple: (x0, y0, x1, y1) em pixels, ou None se nada é desenhado
+        """
+        vertices = Text.atlas(size).build_vertices(text)
+        if not len(vertices):
+            return None
+        x0, y0 = vertices[:, :2].min(axis=0)
+        x1, y1 = vertices[:, :2].max(axis=0)
+        return (int(x0), int(y0), int(x1), int(y1))
+    
+    @staticmethod
+    def draw(x, y, text, size=18, blend=TEXT_BLEND):
+        """
+        Desenha uma string com sombra em uma chamada.
+        Espera projeção ortográfica em pixels (origem embaixo à esquerda).
+        
+        Args:
+            x, y: Posição da linha de base em pixels
+            text: String
+            size: Tamanho da fonte em pixels
+            blend: Fatores para GLState.blend_func
+        """
+        buffer = Text._string_buffer(text, size)
+        if not buffer.count:
+            return
+        
+        GLState.disable(GL_LIGHTING)
+        GLState.disable(GL_DEPTH_TEST)
+        GLState.enable(GL_BLEND)
+        GLState.blend_func(*blend)
+        GLState.enable(GL_TEXTURE_2D)
+        GLState.bind_texture(Text._atlases[size].texture_id)
+        
+        glPushMatrix()
+        glTranslatef(x, y, 0)
+        buffer.draw()
+        glPopMatrix()
+    
+    @staticmethod
+    def release():
+        """Libera atlas e strings em cache (Renderer.cleanup)"""
+        for buffer in Text._strings.values():
+            buffer.delete()
+        Text._strings.clear()
+        for atlas in Text._atlases.values():
+            atlas.release()
+        Text._atlases.clear()
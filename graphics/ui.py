@@ -3,250 +3,284 @@ graphics/ui.py
 ==============
 Interface do usuário: HUD, menus, textos e crosshair.
 Renderização 2D sobre a cena 3D.
+
+Retângulos, pontos e textos são enfileirados em Overlay
+(graphics/overlay.py), que desenha tudo em uma passada ortográfica no fim
+do frame. Posições usam o tamanho atual da janela (Overlay.width/height),
+não WINDOW_WIDTH/WINDOW_HEIGHT.
+
+O HUD só muda com empurrões, troca de nível ou áudio: seus textos são
+desenhados em uma textura (RenderTarget) quando mudam, uma linha abaixo
+da outra; a cada frame, cada linha é um retângulo dessa textura, todos
+em uma única chamada de desenho.
 """
 
-import math
+import random
 import time
-from OpenGL.GL import *
-from OpenGL.GLU import *
-from OpenGL.GLUT import *
+import numpy as np
 from config import *
+from .overlay import Overlay
+from .text import Text
+from .render_target import RenderTarget, PREMULTIPLIED_BLEND, PREMULTIPLIED_COMPOSITE
+
+
+# Estrelas da tela de vitória final
+STAR_COUNT = 100
 
 
 class UI:
     """Gerenciador de interface do usuário"""
     
+    # Cache das linhas do HUD (chave = nível, estatísticas, áudio e tamanho da tela)
+    _hud_key = None
+    _hud_lines = []
+    
+    # Textura com o HUD pronto (criada no primeiro frame) e retângulos de
+    # cada linha (tela, uv); None = desenhar direto
+    _hud_target = None
+    _hud_quads = None
+    
+    # Estrelas da vitória final (por tamanho de tela) e fase do brilho
+    _stars = None
+    _stars_size = None
+    _star_phases = np.arange(STAR_COUNT) * 0.1
+    
     @staticmethod
     def draw_text(x, y, text, size=18):
         """
-        Desenha texto 2D na tela com sombra.
+        Enfileira texto 2D com sombra.
         
         Args:
             x, y: Posição na tela
             text: Texto a ser desenhado
             size: Tamanho da fonte
         """
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
-        
-        # Sombra (preto)
-        glColor3f(0.0, 0.0, 0.0)
-        glRasterPos2f(x + 1, y - 1)
-        font = GLUT_BITMAP_HELVETICA_18 if size >= 18 else GLUT_BITMAP_8_BY_13
-        for ch in text:
-            glutBitmapCharacter(font, ord(ch))
-        
-        # Texto (branco)
-        glColor3f(1.0, 1.0, 1.0)
-        glRasterPos2f(x, y)
-        for ch in text:
-            glutBitmapCharacter(font, ord(ch))
-        
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
+        Overlay.text(x, y, text, size)
     
     @staticmethod
     def draw_crosshair():
         """Desenha crosshair no centro da tela"""
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
-        
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        cx = WINDOW_WIDTH // 2
-        cy = WINDOW_HEIGHT // 2
+        cx = Overlay.width // 2
+        cy = Overlay.height // 2
         size = 12
         thickness = 2
-        
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glColor4f(1.0, 1.0, 1.0, 0.8)
+        color = (1.0, 1.0, 1.0, 0.8)
         
         # Linha horizontal
-        glBegin(GL_QUADS)
-        glVertex2f(cx - size, cy - thickness//2)
-        glVertex2f(cx + size, cy - thickness//2)
-        glVertex2f(cx + size, cy + thickness//2)
-        glVertex2f(cx - size, cy + thickness//2)
-        glEnd()
+        Overlay.rect(cx - size, cy - thickness//2, cx + size, cy + thickness//2, color)
         
         # Linha vertical
-        glBegin(GL_QUADS)
-        glVertex2f(cx - thickness//2, cy - size)
-        glVertex2f(cx + thickness//2, cy - size)
-        glVertex2f(cx + thickness//2, cy + size)
-        glVertex2f(cx - thickness//2, cy + size)
-        glEnd()
-        
-        glDisable(GL_BLEND)
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
+        Overlay.rect(cx - thickness//2, cy - size, cx + thickness//2, cy + size, color)
     
     @staticmethod
-    def draw_hud(level_index, stats, sound_manager=None):
+    def build_hud_lines(level_index, stats, sound_manager=None):
         """
-        Desenha HUD principal do jogo.
+        Monta as linhas de texto do HUD.
         
         Args:
             level_index: Índice do nível atual
             stats: Dict com estatísticas (boxes_on_target, total_boxes, move_count)
             sound_manager: Gerenciador de som para mostrar status
+        
+        Returns:
+            list: Tuplas (x, y, texto, tamanho)
         """
-        y = WINDOW_HEIGHT - 36
+        lines = []
+        y = Overlay.height - 36
         
         # Controles
-        UI.draw_text(20, y, 
+        lines.append((20, y,
             "WASD: mover | SHIFT: correr | Mouse: olhar | Espaço: empurrar | R: reset | ESC: sair",
-            16)
+            16))
         
         # Status do nível
         y -= 32
-        UI.draw_text(20, y,
+        lines.append((20, y,
             f"Level {level_index + 1} | Caixas: {stats['boxes_on_target']}/{stats['total_boxes']}",
-            18)
+            18))
         
         # Movimentos
         y -= 32
-        UI.draw_text(20, y, f"Movimentos: {stats['move_count']}", 18)
+        lines.append((20, y, f"Movimentos: {stats['move_count']}", 18))
         
         # Status de áudio (canto superior direito)
         if sound_manager:
-            audio_y = WINDOW_HEIGHT - 36
-            audio_x = WINDOW_WIDTH - 150
+            audio_y = Overlay.height - 36
+            audio_x = Overlay.width - 150
             
             # Status da música
             music_status = "🎵 ON" if sound_manager.music_enabled else "🔇 OFF"
-            UI.draw_text(audio_x, audio_y, f"M: {music_status}", 16)
+            lines.append((audio_x, audio_y, f"M: {music_status}", 16))
             
             # Status dos sons
             audio_y -= 28
             sfx_status = "🔊 ON" if sound_manager.sfx_enabled else "🔇 OFF"
-            UI.draw_text(audio_x, audio_y, f"N: {sfx_status}", 16)
+            lines.append((audio_x, audio_y, f"N: {sfx_status}", 16))
         
         # Dicas
         y -= 32
         if stats['boxes_on_target'] == 0:
-            UI.draw_text(20, y, 
-                "Dica: Empurre as caixas para os X vermelhos!", 16)
+            lines.append((20, y,
+                "Dica: Empurre as caixas para os X vermelhos!", 16))
         elif stats['boxes_on_target'] < stats['total_boxes']:
-            UI.draw_text(20, y, 
-                "Continue empurrando as caixas restantes!", 16)
+            lines.append((20, y,
+                "Continue empurrando as caixas restantes!", 16))
+        
+        return lines
     
     @staticmethod
-    def draw_victory_screen(move_count):
-        """Desenha tela de vitória de nível"""
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
+    def draw_hud(level_index, stats, sound_manager=None):
+        """
+        Desenha HUD principal do jogo.
+        As linhas só são remontadas (e redesenhadas na textura do HUD)
+        quando nível, estatísticas, estado do áudio ou tamanho da tela
+        mudam; nos outros frames o HUD é uma única imagem.
         
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
+        Args:
+            level_index: Índice do nível atual
+            stats: Dict com estatísticas (boxes_on_target, total_boxes, move_count)
+            sound_manager: Gerenciador de som para mostrar status
+        """
+        key = (
+            level_index,
+            stats['boxes_on_target'], stats['total_boxes'], stats['move_count'],
+            sound_manager.music_enabled if sound_manager else None,
+            sound_manager.sfx_enabled if sound_manager else None,
+            Overlay.width, Overlay.height
+        )
+        if key != UI._hud_key:
+            UI._hud_key = key
+            UI._hud_lines = UI.build_hud_lines(level_index, stats, sound_manager)
+            UI._hud_quads = UI.render_hud_target(UI._hud_lines)
+        
+        if UI._hud_quads is None:
+            # Sem framebuffer: textos direto na passada 2D
+            for (x, y, text, size) in UI._hud_lines:
+                UI.draw_text(x, y, text, size)
+            return
+        
+        texture_id = UI._hud_target.texture_id
+        for (x0, y0, x1, y1), uv in UI._hud_quads:
+            Overlay.image(texture_id, x0, y0, x1, y1, uv=uv,
+                          blend=PREMULTIPLIED_COMPOSITE)
+    
+    @staticmethod
+    def render_hud_target(lines):
+        """
+        Desenha as linhas do HUD na textura do HUD, empilhadas e
+        recortadas no retângulo que cada uma ocupa.
         
-        # Overlay verde semi-transparente
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glColor4f(0.0, 0.8, 0.0, 0.7)
+        Args:
+            lines: Tuplas (x, y, texto, tamanho) de build_hud_lines
         
-        glBegin(GL_QUADS)
-        glVertex2f(0, 0)
-        glVertex2f(WINDOW_WIDTH, 0)
-        glVertex2f(WINDOW_WIDTH, WINDOW_HEIGHT)
-        glVertex2f(0, WINDOW_HEIGHT)
-        glEnd()
+        Returns:
+            list: ((x0, y0, x1, y1) na tela, (u0, v0, u1, v1)) por linha,
+                  ou None se não há framebuffer (desenhar direto)
+        """
+        if UI._hud_target is None:
+            UI._hud_target = RenderTarget()
+        target = UI._hud_target
+        if not target.supported:
+            return None
+        
+        boxes = []
+        for (x, y, text, size) in lines:
+            box = Text.bounds(text, size)
+            if box is not None:
+                boxes.append(((x, y, text, size), box))
+        if not boxes:
+            return []
+        
+        # Cresce em passos de 64 pixels, para não realocar a cada mudança
+        width = max(bx1 - bx0 for _, (bx0, _, bx1, _) in boxes)
+        height = sum(by1 - by0 + 1 for _, (_, by0, _, by1) in boxes)
+        target.resize(max(target.width, -(-width // 64) * 64),
+                      max(target.height, -(-height // 64) * 64))
+        if not target.begin():
+            return None
+        
+        quads = []
+        row = 0
+        for (x, y, text, size), (bx0, by0, bx1, by1) in boxes:
+            Text.draw(-bx0, row - by0, text, size, blend=PREMULTIPLIED_BLEND)
+            quads.append((
+                (x + bx0, y + by0, x + bx1, y + by1),
+                (0.0, row / target.height,
+                 (bx1 - bx0) / target.width, (row + by1 - by0) / target.height)
+            ))
+            row += by1 - by0 + 1
+        target.end()
+        return quads
+    
+    @staticmethod
+    def release():
+        """Libera a textura do HUD (Renderer.cleanup)"""
+        if UI._hud_target is not None:
+            UI._hud_target.release()
+            UI._hud_target = None
+        UI._hud_key = None
+        UI._hud_quads = None
+    
+    @staticmethod
+    def draw_victory_screen(move_count):
+        """Desenha tela de vitória de nível"""
+        width, height = Overlay.width, Overlay.height
         
-        glDisable(GL_BLEND)
+        # Overlay verde semi-transparente
+        Overlay.rect(0, 0, width, height, (0.0, 0.8, 0.0, 0.7))
         
         # Texto
-        cx = WINDOW_WIDTH // 2
-        cy = WINDOW_HEIGHT // 2
+        cx = width // 2
+        cy = height // 2
         
         UI.draw_text(cx - 100, cy + 50, "PARABÉNS! LEVEL COMPLETO!", 24)
         UI.draw_text(cx - 80, cy, f"Movimentos: {move_count}", 18)
         UI.draw_text(cx - 180, cy - 50, 
             "Pressione ENTER para o Próximo Level / ESC para sair", 18)
+    
+    @staticmethod
+    def starfield(width, height):
+        """
+        Posições das estrelas da vitória final, geradas uma vez por
+        tamanho de tela (mesma sequência da semente 42 de antes).
         
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
+        Args:
+            width, height: Tamanho da tela
         
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
+        Returns:
+            np.ndarray: Array (STAR_COUNT, 2) em pixels
+        """
+        if UI._stars_size != (width, height):
+            rng = random.Random(42)
+            stars = []
+            for _ in range(STAR_COUNT):
+                x = rng.randint(50, width - 50)
+                y = rng.randint(50, height - 50)
+                stars.append((x, y))
+            UI._stars = np.array(stars, dtype=np.float32)
+            UI._stars_size = (width, height)
+        return UI._stars
     
     @staticmethod
     def draw_final_victory_screen():
         """Desenha tela de vitória final (todos os níveis completos)"""
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
-        
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        glOrtho(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        # Fundo com gradiente
-        glBegin(GL_QUADS)
-        glColor3f(0.1, 0.05, 0.2)  # Roxo escuro
-        glVertex2f(0, 0)
-        glVertex2f(WINDOW_WIDTH, 0)
-        glColor3f(0.2, 0.1, 0.4)  # Roxo claro
-        glVertex2f(WINDOW_WIDTH, WINDOW_HEIGHT)
-        glVertex2f(0, WINDOW_HEIGHT)
-        glEnd()
-        
-        # Estrelas cintilantes
-        import random
-        random.seed(42)
-        glPointSize(2.0)
-        glBegin(GL_POINTS)
-        for i in range(100):
-            x = random.randint(50, WINDOW_WIDTH - 50)
-            y = random.randint(50, WINDOW_HEIGHT - 50)
-            brightness = 0.5 + 0.5 * abs(math.sin(time.time() * 3 + i * 0.1))
-            glColor3f(brightness, brightness, brightness)
-            glVertex2f(x, y)
-        glEnd()
+        width, height = Overlay.width, Overlay.height
+        
+        # Fundo com gradiente (roxo escuro embaixo, roxo claro em cima)
+        Overlay.rect(0, 0, width, height, (0.1, 0.05, 0.2), top_color=(0.2, 0.1, 0.4))
+        
+        # Estrelas cintilantes (posições fixas, só o brilho muda)
+        stars = UI.starfield(width, height)
+        brightness = 0.5 + 0.5 * np.abs(np.sin(time.time() * 3 + UI._star_phases))
+        Overlay.points(stars, np.repeat(brightness[:, None], 3, axis=1), size=2.0)
         
         # Textos
-        cx = WINDOW_WIDTH // 2
-        cy = WINDOW_HEIGHT // 2
+        cx = width // 2
+        cy = height // 2
         
-        glColor3f(1.0, 0.8, 0.0)  # Dourado
-        UI.draw_text(cx - 80, WINDOW_HEIGHT - 100, "PARABÉNS!", 36)
+        UI.draw_text(cx - 80, height - 100, "PARABÉNS!", 36)
         
-        glColor3f(0.9, 0.9, 0.9)
-        UI.draw_text(cx - 180, WINDOW_HEIGHT - 150, 
+        UI.draw_text(cx - 180, height - 150, 
             "VOCÊ CONQUISTOU TODOS OS DESAFIOS!", 20)
         
         # Troféu ASCII
@@ -262,18 +296,9 @@ class UI:
             UI.draw_text(cx - 30, cy + (len(trophy_lines) - i) * 20, line, 14)
         
         # Instruções
-        glColor3f(0.8, 0.8, 0.8)
         UI.draw_text(cx - 150, 120, 
             "Pressione ENTER para voltar ao menu", 14)
         UI.draw_text(cx - 60, 100, "ou ESC para sair", 14)
-        
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
     
     @staticmethod
     def draw_menu(sound_manager=None):
@@ -283,33 +308,11 @@ class UI:
         Args:
             sound_manager: Gerenciador de som para mostrar status
         """
-        cx = WINDOW_WIDTH // 2
-        cy = WINDOW_HEIGHT // 2
+        cx = Overlay.width // 2
+        cy = Overlay.height // 2
         
         # Overlay escuro
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
-        
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, WINDOW_WIDTH, 0, WINDOW_HEIGHT)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glColor4f(0.0, 0.0, 0.0, 0.6)
-        
-        glBegin(GL_QUADS)
-        glVertex2f(0, cy + 180)
-        glVertex2f(WINDOW_WIDTH, cy + 180)
-        glVertex2f(WINDOW_WIDTH, cy - 150)
-        glVertex2f(0, cy - 150)
-        glEnd()
-        
-        glDisable(GL_BLEND)
+        Overlay.rect(0, cy - 150, Overlay.width, cy + 180, (0.0, 0.0, 0.0, 0.6))
         
         # Textos do menu
         UI.draw_text(cx - 160, cy + 120, "🎮 BOXPUSH 3D SOKOBAN 🎮", 24)
@@ -334,11 +337,3 @@ class UI:
             sfx_status = "🔊 ON" if sound_manager.sfx_enabled else "🔇 OFF"
             UI.draw_text(cx - 100, audio_y, 
                 f"Música: {music_status} | Sons: {sfx_status}", 16)
-        
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
@@ -7,7 +7,7 @@ Ponto de entrada principal do jogo.
 ARQUITETURA DO PROJETO:
 -----------------------
 - main.py: Loop principal, gerenciamento de estados e eventos
-- game/: Lógica do jogo (níveis, física, jogador)
+- game/: Lógica do jogo (níveis, física, jogador, simulação headless)
 - graphics/: Sistema de renderização 3D (OpenGL)
 - utils/: Utilitários (sistema de som procedural)
 - config.py: Constantes e configurações
@@ -30,23 +30,33 @@ Controles:
 - Mouse: Olhar ao redor
 - ESPAÇO: Empurrar caixa
 - R: Reiniciar nível
+- Z: Desfazer empurrão
+- Y: Refazer empurrão
 - M: Música ON/OFF
 - N: Sons ON/OFF
 - T: Teleporte de emergência
 - ESC: Sair/Menu
 - ENTER: Avançar nível/Iniciar
+
+GRAVAÇÃO E REPLAY:
+-----------------
+    python main.py --level 5 --record rota.bxr  # grava o input do nível 5
+    python main.py --replay rota.bxr            # reproduz e mede o FPS
 """
 
 import sys
+import time
+import argparse
 import pygame
 from pygame.locals import *
-from OpenGL.GLUT import glutInit
 
 # Importa módulos do jogo
 from config import *
 from graphics.renderer import Renderer
-from game.player import Player
-from game.level import Level
+from graphics.clouds import CloudSystem
+from graphics.state import GLState
+from game.sim import Simulation, InputCommand
+from game.replay import InputRecorder, InputReplay
 from game.levels_data import get_level_count
 from utils.sound import get_sound_manager
 
@@ -56,7 +66,6 @@ class GameState:
     
     def __init__(self):
         self.state = GAME_STATE_MENU
-        self.last_push_time = 0.0
         self.victory_time = 0.0
     
     def is_menu(self):
@@ -88,11 +97,17 @@ class GameState:
 class Game:
     """Classe principal do jogo"""
     
-    def __init__(self):
-        """Inicializa o jogo"""
+    def __init__(self, record_path=None, replay_path=None, start_level=None):
+        """
+        Inicializa o jogo.
+        
+        Args:
+            record_path: Arquivo onde gravar o input (None = não grava)
+            replay_path: Gravação a reproduzir no lugar do input real
+            start_level: Índice do nível inicial (None = começa no menu)
+        """
         # Inicializa Pygame
         pygame.init()
-        glutInit(sys.argv)
         
         # Inicializa sistema de som
         self.sound = get_sound_manager()
@@ -110,11 +125,26 @@ class Game:
         Renderer.init_opengl()
         Renderer.set_perspective(self.window_width, self.window_height)
         
-        # Objetos do jogo
-        self.player = Player()
-        self.level = Level()
+        # Objetos do jogo (simulação headless + atalhos)
+        self.sim = Simulation()
+        self.sim.add_listener(self.sound.play)
+        self.player = self.sim.player
+        self.level = self.sim.level
+        self.clouds = None
         self.game_state = GameState()
         
+        # Ações de tecla única do frame (viram campos do InputCommand)
+        self.pending_actions = set()
+        
+        # Gravação/replay do input
+        self.recorder = None
+        self.replay = InputReplay(replay_path) if replay_path else None
+        self.frame_times = []
+        
+        # Passo fixo: tempo acumulado e interpolação da renderização
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        
         # Clock para FPS
         self.clock = pygame.time.Clock()
         
@@ -124,6 +154,51 @@ class Game:
         
         # Inicia música do menu
         self.sound.play_music('menu', is_menu=True)
+        
+        if self.replay:
+            start_level = self.replay.level_index
+        if start_level is not None:
+            self.start_level(start_level)
+            if record_path:
+                self.recorder = InputRecorder(record_path, start_level)
+    
+    def load_level(self, level_index):
+        """
+        Carrega nível na simulação e recria o sistema de nuvens.
+        
+        Args:
+            level_index (int): Índice do nível (0-based)
+        """
+        self.sim.load_level(level_index)
+        
+        # Inicializa sistema de nuvens (distribuídas em 360°)
+        # A nova instância pega a textura compartilhada antes de a antiga
+        # soltar a dela, então a textura não é recriada
+        old_clouds = self.clouds
+        self.clouds = CloudSystem(num_clouds=CLOUD_COUNT, wind_speed=CLOUD_WIND_SPEED)
+        if old_clouds:
+            old_clouds.cleanup()  # Limpa nuvens antigas
+    
+    def grab_mouse(self):
+        """Captura e esconde o mouse no centro da janela"""
+        pygame.event.set_grab(True)
+        pygame.mouse.set_visible(False)
+        pygame.mouse.set_pos(
+            (self.window_width // 2, self.window_height // 2)
+        )
+    
+    def start_level(self, level_index):
+        """
+        Carrega um nível e entra no estado de jogo.
+        
+        Args:
+            level_index (int): Índice do nível (0-based)
+        """
+        self.load_level(level_index)
+        self.game_state.set_playing()
+        self.sound.play('level_start')
+        self.sound.play_music(level_index)  # Música da fase
+        self.grab_mouse()
     
     def handle_events(self):
         """Processa eventos do Pygame"""
@@ -137,17 +212,22 @@ class Game:
                     return False
                 
                 # R: Reset nível (apenas durante jogo)
+                # Desfaz o journal em vez de recarregar nível e nuvens
                 elif event.key == K_r and self.game_state.is_playing():
-                    self.level.reload_current_level()
-                    self.player.set_position(*self.level.spawn_position)
-                    self.player.reset_camera()
+                    self.pending_actions.add('restart')
                     # Reinicia música da fase atual
                     self.sound.play_music(self.level.current_level_index)
                 
+                # Z/Y: Desfazer/refazer empurrão
+                elif event.key == K_z and self.game_state.is_playing():
+                    self.pending_actions.add('undo')
+                
+                elif event.key == K_y and self.game_state.is_playing():
+                    self.pending_actions.add('redo')
+                
                 # T: Teleporte de emergência (caso fique preso na parede)
                 elif event.key == K_t and self.game_state.is_playing():
-                    self.player.set_position(*self.level.spawn_position)
-                    self.player.reset_camera()
+                    self.pending_actions.add('teleport')
                 
                 # M: Toggle música de fundo
                 elif event.key == K_m:
@@ -162,25 +242,13 @@ class Game:
                     self.sound.play('menu_select')
                     if self.game_state.is_menu():
                         # Inicia jogo
-                        self.level.load_level(0)
-                        self.player.set_position(*self.level.spawn_position)
-                        self.player.reset_camera()
-                        self.game_state.set_playing()
-                        self.sound.play('level_start')
-                        self.sound.play_music(0)  # Música da fase 1
-                        pygame.event.set_grab(True)
-                        pygame.mouse.set_visible(False)
-                        pygame.mouse.set_pos(
-                            (self.window_width // 2, self.window_height // 2)
-                        )
+                        self.start_level(0)
                     
                     elif self.game_state.is_victory():
                         # Próximo nível ou menu
                         next_index = self.level.get_next_level_index()
                         if next_index is not None:
-                            self.level.load_level(next_index)
-                            self.player.set_position(*self.level.spawn_position)
-                            self.player.reset_camera()
+                            self.load_level(next_index)
                             self.game_state.set_playing()
                             self.sound.play('level_start')
                             self.sound.play_music(next_index)  # Música da próxima fase
@@ -189,11 +257,7 @@ class Game:
                             self.sound.stop_music()
                             self.sound.play_music('menu', is_menu=True)  # Volta música do menu
                         
-                        pygame.event.set_grab(True)
-                        pygame.mouse.set_visible(False)
-                        pygame.mouse.set_pos(
-                            (self.window_width // 2, self.window_height // 2)
-                        )
+                        self.grab_mouse()
                     
                     elif self.game_state.is_final_victory():
                         # Volta ao menu
@@ -214,66 +278,105 @@ class Game:
         
         return True
     
-    def update_playing(self, dt, current_time):
-        """Atualiza lógica durante o jogo"""
-        # Mouse look
+    def read_input(self):
+        """
+        Lê mouse e teclado e monta o comando de input do frame.
+        
+        Returns:
+            InputCommand: Input atual do jogador
+        """
+        # Mouse look (recentraliza o cursor)
         mx, my = pygame.mouse.get_pos()
         dx = mx - (self.window_width // 2)
         dy = my - (self.window_height // 2)
-        self.player.update_camera_rotation(dx, dy)
         pygame.mouse.set_pos((self.window_width // 2, self.window_height // 2))
         
-        # Atualiza nuvens
-        if self.level.clouds:
-            self.level.clouds.update(dt)
-        
-        # Input de movimento
         keys = pygame.key.get_pressed()
         
-        input_forward = 0.0
-        input_strafe = 0.0
-        
-        if keys[K_w]:
-            input_forward += 1.0
-        if keys[K_s]:
-            input_forward -= 1.0
-        if keys[K_d]:
-            input_strafe += 1.0
-        if keys[K_a]:
-            input_strafe -= 1.0
-        
-        # Movimento
-        is_running = keys[K_LSHIFT] or keys[K_RSHIFT]
-        self.player.move(
-            input_forward, input_strafe, dt,
-            self.level.walls, self.level.boxes,
-            is_running, current_time
+        # Ações de tecla única acumuladas em handle_events
+        actions = {name: True for name in self.pending_actions}
+        self.pending_actions.clear()
+        
+        return InputCommand(
+            dx=dx,
+            dy=dy,
+            forward=bool(keys[K_w]),
+            back=bool(keys[K_s]),
+            left=bool(keys[K_a]),
+            right=bool(keys[K_d]),
+            run=bool(keys[K_LSHIFT] or keys[K_RSHIFT]),
+            push=bool(keys[K_SPACE]),
+            **actions
         )
+    
+    def update_playing(self, frame_time):
+        """
+        Atualiza lógica durante o jogo em passos fixos de SIM_DT.
         
-        # Empurrar caixa
-        if keys[K_SPACE]:
-            if (current_time - self.game_state.last_push_time) >= PUSH_COOLDOWN:
-                dir_x, dir_z = self.player.get_facing_direction()
-                
-                if self.level.push_box(
-                    self.player.x, self.player.z,
-                    dir_x, dir_z, current_time
-                ):
-                    self.game_state.last_push_time = current_time
-                    
-                    # Verifica vitória
-                    if self.level.check_victory():
-                        self.sound.play('victory')
-                        if self.level.is_last_level():
-                            self.game_state.set_final_victory()
-                        else:
-                            self.game_state.set_victory(current_time)
-                        
-                        pygame.event.set_grab(False)
-                        pygame.mouse.set_visible(True)
+        O tempo real do frame entra em um acumulador; a simulação avança
+        quantos passos inteiros couberem e a sobra vira o alpha de
+        interpolação da renderização.
+        
+        Args:
+            frame_time: Tempo real do frame (segundos)
+        """
+        # Atualiza nuvens (apenas visual, tempo real)
+        if self.clouds:
+            self.clouds.update(frame_time)
+        
+        self.accumulator += frame_time
+        steps = 0
+        
+        while self.accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+            self.accumulator -= SIM_DT
+            steps += 1
+            if not self.tick():
+                break
+        
+        # Máquina lenta demais: descarta o atraso em vez de acumulá-lo
+        if steps == MAX_SIM_STEPS:
+            self.accumulator = min(self.accumulator, SIM_DT)
+        
+        self.alpha = min(self.accumulator / SIM_DT, 1.0)
+    
+    def tick(self):
+        """
+        Executa um passo fixo da simulação.
+        
+        Returns:
+            bool: True se o jogo continua no estado de jogo
+        """
+        if self.replay:
+            # Replay: comando e dt vêm da gravação
+            frame = self.replay.next_frame()
+            if frame is None:
+                return False
+            command, dt = frame
+        else:
+            # Mouse e ações de tecla única entram no primeiro passo do frame
+            command = self.read_input()
+            dt = SIM_DT
+            if self.recorder:
+                self.recorder.record(command, dt)
+        
+        self.sim.step(command, dt)
+        
+        # Verifica vitória
+        if self.sim.victory:
+            if self.recorder:
+                self.recorder.close(self.sim)
+                self.recorder = None
+            
+            if self.level.is_last_level():
+                self.game_state.set_final_victory()
+            else:
+                self.game_state.set_victory(self.sim.time)
+            
+            pygame.event.set_grab(False)
+            pygame.mouse.set_visible(True)
+            return False
         
-        # Atualiza partículas
-        self.level.update_particles(current_time, PARTICLE_LIFETIME)
+        return True
     
     def render(self, current_time):
         """Renderiza frame atual"""
@@ -281,7 +384,8 @@ class Game:
             Renderer.render_menu(self.sound)
         
         elif self.game_state.is_playing():
-            Renderer.render_game_scene(self.level, self.player, current_time, self.sound)
+            Renderer.render_game_scene(self.level, self.player, current_time,
+                                       self.sound, self.clouds, self.alpha)
         
         elif self.game_state.is_victory():
             Renderer.render_victory(self.level, self.player, current_time)
@@ -290,34 +394,105 @@ class Game:
             Renderer.render_final_victory()
         
         pygame.display.flip()
+        GLState.end_frame()
     
     def run(self):
         """Loop principal do jogo"""
         running = True
         
         while running:
-            # Tempo
-            dt_ms = self.clock.tick(TARGET_FPS)
+            # Tempo (replay roda sem limite de FPS para medir desempenho)
+            # A simulação usa passo fixo; dt só alimenta o acumulador.
+            # Menu e vitória não precisam de TARGET_FPS: ficam em IDLE_FPS
+            frame_start = time.perf_counter()
+            if self.replay:
+                fps = 0
+            elif self.game_state.is_playing():
+                fps = TARGET_FPS
+            else:
+                fps = IDLE_FPS
+            dt_ms = self.clock.tick(fps)
             dt = min(dt_ms / 1000.0, MAX_FRAME_TIME)
-            current_time = pygame.time.get_ticks() / 1000.0
             
             # Eventos
             running = self.handle_events()
             
             # Atualização
             if self.game_state.is_playing():
-                self.update_playing(dt, current_time)
+                self.update_playing(dt)
+            else:
+                self.sim.advance(dt)
+            
+            # Renderização (relógio da simulação)
+            self.render(self.sim.time)
             
-            # Renderização
-            self.render(current_time)
+            if self.replay:
+                self.frame_times.append(time.perf_counter() - frame_start)
+                if self.replay.done() or not self.game_state.is_playing():
+                    running = False
+        
+        # Finaliza gravação/replay
+        if self.recorder:
+            self.recorder.close(self.sim)
+        if self.replay:
+            self.print_replay_stats()
         
         # Limpeza
+        if self.clouds:
+            self.clouds.cleanup()
         Renderer.cleanup()
         pygame.quit()
+    
+    def print_replay_stats(self):
+        """Mostra estatísticas de FPS e conferência do replay"""
+        times = sorted(self.frame_times)
+        if not times:
+            return
+        
+        total = sum(times)
+        p50 = times[len(times) // 2]
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+        
+        print("=" * 60)
+        print(f"📼 Replay: {len(times)} frames em {total:.2f} s")
+        print(f"   FPS médio: {len(times) / total:.1f}")
+        print(f"   Frame p50: {p50 * 1000:.2f} ms | p99: {p99 * 1000:.2f} ms | "
+              f"pior: {times[-1] * 1000:.2f} ms")
+        if GLState.frames:
+            print(f"   Estado GL por frame: {GLState.total_issued / GLState.frames:.1f} emitidas | "
+                  f"{GLState.total_skipped / GLState.frames:.1f} puladas")
+        status = "OK" if self.replay.verify(self.sim) else "DIVERGIU"
+        print(f"   Estado final: {status}")
+        print("=" * 60)
+
+
+def parse_args(argv):
+    """
+    Lê argumentos de linha de comando.
+    
+    Args:
+        argv: Lista de argumentos (sem o nome do programa)
+    
+    Returns:
+        argparse.Namespace: record, replay, level
+    """
+    parser = argparse.ArgumentParser(description="BoxPush 3D - Sokoban em 3D")
+    parser.add_argument('--record', metavar='ARQUIVO',
+                        help="grava o input do nível em um arquivo binário")
+    parser.add_argument('--replay', metavar='ARQUIVO',
+                        help="reproduz uma gravação e mostra o FPS")
+    parser.add_argument('--level', type=int, metavar='N',
+                        help="começa direto no nível N (1-based)")
+    return parser.parse_args(argv)
 
 
 def main():
     """Função principal"""
+    args = parse_args(sys.argv[1:])
+    start_level = args.level - 1 if args.level else None
+    if args.record and start_level is None:
+        start_level = 0
+    
     print("=" * 60)
     print("🎮 BOXPUSH 3D - Sokoban Game")
     print("=" * 60)
@@ -330,6 +505,7 @@ def main():
     print("  Mouse     - Olhar")
     print("  ESPAÇO    - Empurrar caixa")
     print("  R         - Reiniciar nível")
+    print("  Z / Y     - Desfazer / Refazer")
     print("  M         - Música ON/OFF")
     print("  N         - Sons ON/OFF")
     print("  ENTER     - Avançar/Iniciar")
@@ -338,7 +514,8 @@ def main():
     print()
     
     try:
-        game = Game()
+        game = Game(record_path=args.record, replay_path=args.replay,
+                    start_level=start_level)
         game.run()
     except Exception as e:
         print(f"❌ Erro: {e}")